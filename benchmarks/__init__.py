@@ -0,0 +1,3 @@
+"""
+Benchmarks for the game 'Abandoned Space Station'
+"""
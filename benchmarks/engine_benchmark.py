@@ -0,0 +1,377 @@
+"""
+Benchmark suite for the hot paths of the game engine.
+
+Times hazard placement, adjacency counts, scans, the victory check, grid
+display, coordinate parsing and branching with snapshots over a sweep of
+board sizes and hazard densities. The results are written as JSON and can
+be compared against a stored baseline, by default the one committed in
+benchmarks/engine_baseline.json:
+
+    python benchmarks/engine_benchmark.py --baseline
+    python benchmarks/engine_benchmark.py --baseline results.json --threshold 0.2
+
+The comparison exits with status 1 if any benchmark got slower than the
+baseline by more than the threshold. Timings depend on the machine, so
+create a baseline on the machine that runs the comparison, and refresh the
+committed one after intended changes:
+
+    python benchmarks/engine_benchmark.py --output benchmarks/engine_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.helpers import process_coordinates
+
+# Baseline compared against by --baseline without a path.
+BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "engine_baseline.json"
+)
+
+# Board sizes and hazard densities of the sweep.
+BOARD_SIZES = [(10, 10), (100, 100), (500, 500)]
+DENSITIES = [0.1, 0.2, 0.5]
+
+# A benchmark runs a number of operations on a board and returns the number
+# of operations and the time they took in seconds.
+Benchmark = Callable[[int, int, int, random.Random], Tuple[int, float]]
+
+# A result holds the case (name, board size, density) and the time per
+# operation in nanoseconds.
+Result = Dict[str, Any]
+
+
+def _new_game(
+    grid_width: int, grid_height: int, hazards: int, rng: random.Random
+) -> AbandonedSpaceStation:
+    """
+    Create a quiet game with a reproducible board.
+
+    Args:
+        grid_width: Width of the board
+        grid_height: Height of the board
+        hazards: Number of hazards
+        rng: Random generator providing the seed
+
+    Returns:
+        The game
+    """
+    return AbandonedSpaceStation(
+        grid_width, grid_height, hazards, seed=rng.getrandbits(32), verbose=False
+    )
+
+
+def bench_place_hazards(
+    grid_width: int, grid_height: int, hazards: int, rng: random.Random
+) -> Tuple[int, float]:
+    """
+    Time hazard placement through the constructor in compact mode, where
+    placing the hazards is all the constructor does.
+    """
+    seed = rng.getrandbits(32)
+    start = time.perf_counter()
+    AbandonedSpaceStation(grid_width, grid_height, hazards, seed=seed, compact=True)
+    return 1, time.perf_counter() - start
+
+
+def bench_count_adjacent_hazards(
+    grid_width: int, grid_height: int, hazards: int, rng: random.Random
+) -> Tuple[int, float]:
+    """
+    Time the adjacency count of every area of a board.
+    """
+    game = _new_game(grid_width, grid_height, hazards, rng)
+    count = game.count_adjacent_hazards
+    start = time.perf_counter()
+    for y in range(grid_height):
+        for x in range(grid_width):
+            count(x, y)
+    return grid_width * grid_height, time.perf_counter() - start
+
+
+def bench_scan_area(
+    grid_width: int, grid_height: int, hazards: int, rng: random.Random
+) -> Tuple[int, float]:
+    """
+    Time scanning every safe area of a board in random order.
+    """
+    game = _new_game(grid_width, grid_height, hazards, rng)
+    hazard_locations = game.hazard_locations
+    areas = [
+        (x, y)
+        for y in range(grid_height)
+        for x in range(grid_width)
+        if (x, y) not in hazard_locations
+    ]
+    rng.shuffle(areas)
+    scan = game.scan_area
+    start = time.perf_counter()
+    for x, y in areas:
+        scan(x, y)
+    return len(areas), time.perf_counter() - start
+
+
+def bench_check_victory_condition(
+    grid_width: int, grid_height: int, hazards: int, rng: random.Random
+) -> Tuple[int, float]:
+    """
+    Time repeated victory checks on a fresh board.
+    """
+    check = _new_game(grid_width, grid_height, hazards, rng).check_victory_condition
+    calls = 10_000
+    start = time.perf_counter()
+    for _ in range(calls):
+        check()
+    return calls, time.perf_counter() - start
+
+
+def bench_display_grid(
+    grid_width: int, grid_height: int, hazards: int, rng: random.Random
+) -> Tuple[int, float]:
+    """
+    Time printing the grid of a half scanned board into a buffer.
+    """
+    game = _new_game(grid_width, grid_height, hazards, rng)
+    for y in range(0, grid_height, 2):
+        for x in range(grid_width):
+            if (x, y) not in game.hazard_locations:
+                game.scan_area(x, y)
+    calls = max(1, 10_000 // (grid_width * grid_height))
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(calls):
+            game.display_grid()
+        elapsed = time.perf_counter() - start
+    return calls, elapsed
+
+
+def bench_process_coordinates(
+    grid_width: int, grid_height: int, _hazards: int, rng: random.Random
+) -> Tuple[int, float]:
+    """
+    Time parsing a mix of valid, out of range and malformed inputs.
+    """
+    inputs = [
+        f"{rng.randrange(grid_width + 2)} {rng.randrange(grid_height + 2)}"
+        for _ in range(900)
+    ]
+    inputs += ["q", "x y", "1 2 3", " 4   5 "] * 25
+    start = time.perf_counter()
+    for input_str in inputs:
+        process_coordinates(input_str, grid_width, grid_height)
+    return len(inputs), time.perf_counter() - start
+
+
+def bench_snapshot_restore(
+    grid_width: int, grid_height: int, hazards: int, rng: random.Random
+) -> Tuple[int, float]:
+    """
+    Time branching a half scanned board: take a snapshot, scan a few random
+    areas and restore the snapshot.
+    """
+    game = _new_game(grid_width, grid_height, hazards, rng)
+    for y in range(0, grid_height, 2):
+        for x in range(grid_width):
+            if (x, y) not in game.hazard_locations:
+                game.scan_area(x, y)
+    moves = [
+        [(rng.randrange(grid_width), rng.randrange(grid_height)) for _ in range(4)]
+        for _ in range(1000)
+    ]
+    scan, snapshot, restore = game.scan_area, game.snapshot, game.restore
+    start = time.perf_counter()
+    for branch in moves:
+        position = snapshot()
+        for x, y in branch:
+            scan(x, y)
+        restore(position)
+    return len(moves), time.perf_counter() - start
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "place_hazards": bench_place_hazards,
+    "count_adjacent_hazards": bench_count_adjacent_hazards,
+    "scan_area": bench_scan_area,
+    "check_victory_condition": bench_check_victory_condition,
+    "display_grid": bench_display_grid,
+    "process_coordinates": bench_process_coordinates,
+    "snapshot_restore": bench_snapshot_restore,
+}
+
+
+def run_suite(
+    board_sizes: Sequence[Tuple[int, int]] = tuple(BOARD_SIZES),
+    densities: Sequence[float] = tuple(DENSITIES),
+    repeat: int = 3,
+    seed: int = 0,
+) -> List[Result]:
+    """
+    Run every benchmark for every board size and hazard density.
+
+    Each case is run ``repeat`` times and the fastest run is kept, which is
+    the least disturbed by other processes.
+
+    Args:
+        board_sizes: Width and height of the boards
+        densities: Shares of hazards on the boards
+        repeat: Runs per case (default: 3)
+        seed: Seed for the boards and inputs (default: 0)
+
+    Returns:
+        One result per case with the time per operation in nanoseconds
+    """
+    results: List[Result] = []
+    for name, benchmark in BENCHMARKS.items():
+        for grid_width, grid_height in board_sizes:
+            for density in densities:
+                hazards = int(grid_width * grid_height * density)
+                rng = random.Random(seed)
+                best = min(
+                    ops_and_time[1] / ops_and_time[0]
+                    for ops_and_time in (
+                        benchmark(grid_width, grid_height, hazards, rng)
+                        for _ in range(repeat)
+                    )
+                )
+                results.append(
+                    {
+                        "name": name,
+                        "grid_width": grid_width,
+                        "grid_height": grid_height,
+                        "density": density,
+                        "ns_per_op": best * 1e9,
+                    }
+                )
+    return results
+
+
+def _case(result: Result) -> Tuple[Any, ...]:
+    """
+    Get the key identifying the case of a result.
+
+    Args:
+        result: A benchmark result
+
+    Returns:
+        Name, board size and density
+    """
+    return (
+        result["name"],
+        result["grid_width"],
+        result["grid_height"],
+        result["density"],
+    )
+
+
+def find_regressions(
+    results: List[Result],
+    baseline: List[Result],
+    threshold: float,
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: The current results
+        baseline: The stored results
+        threshold: Allowed slowdown as a share of the baseline time
+
+    Returns:
+        A description of every case that got slower than allowed
+    """
+    previous = {_case(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(_case(result))
+        if old is None:
+            continue
+        old_time = old["ns_per_op"]
+        new_time = result["ns_per_op"]
+        if new_time > old_time * (1 + threshold):
+            name, grid_width, grid_height, density = _case(result)
+            regressions.append(
+                f"{name} {grid_width}x{grid_height} density {density}: "
+                f"{old_time:.0f} ns -> {new_time:.0f} ns "
+                f"(+{(new_time / old_time - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the suite, print a table and compare with a baseline.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Exit status, 1 if a regression was found
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument(
+        "--baseline",
+        nargs="?",
+        const=BASELINE,
+        help="compare with this JSON file (default: the committed baseline)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown against the baseline (default: 0.2 = 20%%)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case")
+    parser.add_argument(
+        "--quick", action="store_true", help="only benchmark the smallest board"
+    )
+    args = parser.parse_args(argv)
+
+    board_sizes = BOARD_SIZES[:1] if args.quick else BOARD_SIZES
+    results = run_suite(board_sizes, DENSITIES, args.repeat)
+
+    print(f"{'benchmark':<24} {'board':>9} {'density':>8} {'ns/op':>12}")
+    for result in results:
+        board = f"{result['grid_width']}x{result['grid_height']}"
+        print(
+            f"{result['name']:<24} {board:>9} {result['density']:>8} "
+            f"{result['ns_per_op']:>12.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            print("\n".join(regressions))
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
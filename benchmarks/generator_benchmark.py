@@ -0,0 +1,86 @@
+"""
+Throughput benchmark for the no-guess board generator.
+
+Generates boards of increasing size with local repairs, in one process and
+in a pool of worker processes, and compares them with rejecting every
+unsolvable board. Reports the number of boards generated per second. Run
+with ``python benchmarks/generator_benchmark.py``.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.generator import generate_board, generate_boards
+
+# Width, height and hazard count of the benchmarked boards.
+BOARD_SIZES = [(9, 9, 10), (16, 16, 40), (30, 16, 99)]
+
+
+def _rejection_rate(
+    grid_width: int, grid_height: int, hazards: int, budget: float
+) -> float:
+    """
+    Measure boards per second when every unsolvable board is rejected.
+
+    Args:
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazards: Number of hazards
+        budget: Seconds to spend at most
+
+    Returns:
+        Boards per second
+    """
+    boards, seed = 0, 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < budget:
+        generate_board(grid_width, grid_height, hazards, seed=seed, max_repairs=0)
+        boards += 1
+        seed += 1
+    return boards / (time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run the benchmark and print boards per second for every board size.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="No-guess generator benchmark")
+    parser.add_argument("--boards", type=int, default=40, help="boards per size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--budget", type=float, default=5.0, help="seconds for the rejection loop"
+    )
+    args = parser.parse_args(argv)
+
+    rows: List[str] = []
+    for grid_width, grid_height, hazards in BOARD_SIZES:
+        rates = []
+        for workers in (1, args.workers):
+            start = time.perf_counter()
+            boards = generate_boards(
+                args.boards, grid_width, grid_height, hazards, seed=0, workers=workers
+            )
+            rates.append(len(boards) / (time.perf_counter() - start))
+        repairs = sum(board.repairs for board in boards) / len(boards)
+        rejection = _rejection_rate(grid_width, grid_height, hazards, args.budget)
+        rows.append(
+            f"{grid_width:>3}x{grid_height:<3} {hazards:>7} {repairs:>8.1f} "
+            f"{rejection:>10.1f} {rates[0]:>10.1f} {rates[1]:>10.1f}"
+        )
+    print(
+        "board   hazards  repairs   reject/s   repair/s  "
+        f"{args.workers} worker(s)/s"
+    )
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Crossover benchmark for the dense and the sparse hazard index.
+
+Builds compact games with both indexes over a sweep of hazard densities and
+reports the memory of the count index, the time to create the board and the
+time per scan at random positions. The sparse index wins on memory below
+the crossover density and the dense table above it; the automatic choice of
+the game is shown for comparison. Run with
+``python benchmarks/hazard_index_benchmark.py``.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+
+# Hazards per area of the sweep.
+DENSITIES = [0.0001, 0.001, 0.005, 0.01, 0.02, 0.05, 0.1]
+
+
+def measure(
+    grid_width: int, grid_height: int, hazards: int, index: str, scans: int
+) -> Tuple[float, float, float]:
+    """
+    Measure a game with one kind of hazard index.
+
+    Args:
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazards: Number of hazards
+        index: "dense" or "sparse"
+        scans: Number of scans at random positions
+
+    Returns:
+        Memory of the count index in bytes, creation time in milliseconds
+        and time per scan in microseconds
+    """
+
+    def create() -> AbandonedSpaceStation:
+        return AbandonedSpaceStation(
+            grid_width,
+            grid_height,
+            hazards,
+            seed=1,
+            compact=True,
+            verbose=False,
+            hazard_index=index,
+        )
+
+    # Tracing slows down every allocation, so the memory is measured on a
+    # board of its own.
+    tracemalloc.start()
+    game = create()
+    # The scanned bitset is the same for both indexes.
+    memory = tracemalloc.get_traced_memory()[0] - ((grid_width * grid_height + 7) >> 3)
+    tracemalloc.stop()
+    del game
+    start = time.perf_counter()
+    game = create()
+    created = time.perf_counter() - start
+
+    rng = random.Random(2)
+    positions = [
+        (rng.randrange(grid_width), rng.randrange(grid_height)) for _ in range(scans)
+    ]
+    start = time.perf_counter()
+    for x, y in positions:
+        # A new game after a hazard would dominate the measurement, so the
+        # game simply continues.
+        game.is_defeated = False
+        game.scan_area(x, y)
+    elapsed = time.perf_counter() - start
+    return memory, created * 1000, elapsed / scans * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run the benchmark and print the measurements for every density.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Hazard index benchmark")
+    parser.add_argument("--width", type=int, default=2048)
+    parser.add_argument("--height", type=int, default=2048)
+    parser.add_argument("--scans", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    area_count = args.width * args.height
+    # Fill the cached column masks of the dense table before measuring.
+    measure(args.width, args.height, 0, "dense", 1)
+    print(f"board {args.width}x{args.height} ({area_count} areas)")
+    print(
+        "density   hazards   dense MB  sparse MB  dense ms  sparse ms"
+        "  dense us/scan  sparse us/scan  auto"
+    )
+    crossover = None
+    for density in DENSITIES:
+        hazards = round(area_count * density)
+        dense = measure(args.width, args.height, hazards, "dense", args.scans)
+        sparse = measure(args.width, args.height, hazards, "sparse", args.scans)
+        automatic = AbandonedSpaceStation(
+            args.width, args.height, hazards, seed=1, compact=True
+        )
+        chosen = "sparse" if automatic.sparse_index else "dense"
+        if crossover is None and sparse[0] >= dense[0]:
+            crossover = density
+        print(
+            f"{density:<9g} {hazards:>8} {dense[0] / 1e6:>9.2f} "
+            f"{sparse[0] / 1e6:>10.2f} {dense[1]:>9.1f} {sparse[1]:>10.1f} "
+            f"{dense[2]:>14.2f} {sparse[2]:>15.2f}  {chosen}"
+        )
+    if crossover is None:
+        print("\nthe sparse index used less memory at every density")
+    else:
+        print(f"\nmemory crossover at or below a density of {crossover:g}")
+
+
+if __name__ == "__main__":
+    main()
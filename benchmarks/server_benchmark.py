@@ -0,0 +1,342 @@
+"""
+Load generator for the game server.
+
+Starts the server in a separate process, opens many concurrent sessions and
+plays random moves in all of them at once. Reports the round trip latency
+seen by the clients, the processing latency measured by the server and the
+server memory per idle session. Run with
+``python benchmarks/server_benchmark.py --sessions 10000 --moves 20``, or
+pass ``--port`` to load a server that is already running.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.instrumentation import LatencyHistogram
+from exam.source.server import GameServer
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Sessions opened at the same time while connecting.
+_CONNECT_BATCH = 500
+# Seconds to wait for the server process.
+_TIMEOUT = 60
+
+
+def _raise_file_limit() -> None:
+    """
+    Allow as many open connections as the system permits.
+    """
+    if resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _resident_kib() -> int:
+    """
+    Get the resident memory of the current process.
+
+    Returns:
+        Resident memory in KiB, 0 if it cannot be determined
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _run_server(size: Tuple[int, int, int], answers: Any, commands: Any) -> None:
+    """
+    Run the game server in a worker process.
+
+    Sends the port once the server listens. Answers "memory" commands with
+    the resident memory and stops on "stop", sending back the move latency
+    summary.
+
+    Args:
+        size: Width, height and hazard count of the boards
+        answers: Queue receiving the port and the answers
+        commands: Queue with the commands of the load generator
+    """
+    _raise_file_limit()
+    server = GameServer(*size)
+
+    async def run() -> None:
+        listener = await server.start("127.0.0.1", 0)
+        answers.put(listener.sockets[0].getsockname()[1])
+        loop = asyncio.get_running_loop()
+        while await loop.run_in_executor(None, commands.get) == "memory":
+            answers.put(_resident_kib())
+        listener.close()
+        answers.put(
+            {
+                "moves": server.moves,
+                "p50": server.latency.percentile(0.5),
+                "p99": server.latency.percentile(0.99),
+                "max": server.latency.maximum,
+            }
+        )
+
+    asyncio.run(run())
+
+
+class _ServerProcess:
+    """
+    A game server running in a worker process.
+    """
+
+    def __init__(self, size: Tuple[int, int, int]) -> None:
+        """
+        Start the server and wait until it listens.
+
+        Args:
+            size: Width, height and hazard count of the boards
+        """
+        self._answers: Any = multiprocessing.Queue()
+        self._commands: Any = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_run_server, args=(size, self._answers, self._commands)
+        )
+        self._process.start()
+        self.port: int = self._answers.get(timeout=_TIMEOUT)
+
+    def memory(self) -> int:
+        """
+        Get the resident memory of the server.
+
+        Returns:
+            Resident memory in KiB
+        """
+        self._commands.put("memory")
+        return int(self._answers.get(timeout=_TIMEOUT))
+
+    def stop(self) -> Dict[str, int]:
+        """
+        Stop the server.
+
+        Returns:
+            The number of moves and the move latency percentiles
+        """
+        self._commands.put("stop")
+        return dict(self._answers.get(timeout=_TIMEOUT))
+
+    def close(self) -> None:
+        """
+        Wait for the worker process to end.
+        """
+        self._process.join(timeout=_TIMEOUT)
+        if self._process.is_alive():
+            self._process.terminate()
+
+
+class _Session:
+    """
+    A client session playing random moves.
+    """
+
+    def __init__(self, host: str, port: int, rng: random.Random) -> None:
+        """
+        Initialize a session.
+
+        Args:
+            host: Address of the server
+            port: Port of the server
+            rng: Random generator for the moves
+        """
+        self.host = host
+        self.port = port
+        self.rng = rng
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.size = (0, 0)
+        self.known: Set[Tuple[int, int]] = set()
+
+    async def connect(self) -> None:
+        """
+        Open the connection and read the greeting.
+        """
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        await self._read_greeting()
+
+    async def _read_greeting(self) -> None:
+        """
+        Read the announcement of a new game.
+        """
+        assert self.reader is not None
+        parts = (await self.reader.readline()).split()
+        self.size = (int(parts[1]), int(parts[2]))
+        self.known.clear()
+
+    async def play(self, moves: int, latency: LatencyHistogram) -> None:
+        """
+        Play random moves and record their round trip latency.
+
+        Args:
+            moves: Number of moves
+            latency: Histogram of the round trip latencies
+        """
+        assert self.reader is not None and self.writer is not None
+        width, height = self.size
+        for _ in range(moves):
+            while True:
+                x, y = self.rng.randrange(width), self.rng.randrange(height)
+                if (x, y) not in self.known:
+                    break
+            start = time.perf_counter_ns()
+            self.writer.write(f"{x} {y}\n".encode())
+            answer = (await self.reader.readline()).split()
+            latency.record(time.perf_counter_ns() - start)
+            for cell in answer[1:]:
+                cx, cy, _ = cell.split(b",")
+                self.known.add((int(cx), int(cy)))
+            if answer[0] in (b"WIN", b"LOSE"):
+                self.writer.write(b"new\n")
+                await self._read_greeting()
+        self.writer.write(b"q\n")
+        await self.reader.readline()
+        self.writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self.writer.wait_closed()
+
+
+async def connect_sessions(
+    host: str, port: int, sessions: int, seed: int = 0
+) -> List[_Session]:
+    """
+    Open the sessions in batches, so the listen backlog is not exceeded.
+
+    Args:
+        host: Address of the server
+        port: Port of the server
+        sessions: Number of concurrent sessions
+        seed: Seed of the moves (default: 0)
+
+    Returns:
+        The connected sessions
+    """
+    rng = random.Random(seed)
+    clients = [
+        _Session(host, port, random.Random(rng.getrandbits(64)))
+        for _ in range(sessions)
+    ]
+    for first in range(0, sessions, _CONNECT_BATCH):
+        batch = clients[first : first + _CONNECT_BATCH]
+        await asyncio.gather(*(client.connect() for client in batch))
+    return clients
+
+
+async def play_sessions(
+    clients: List[_Session], moves: int
+) -> Tuple[LatencyHistogram, float]:
+    """
+    Play the moves in all sessions concurrently.
+
+    Args:
+        clients: The connected sessions
+        moves: Moves per session
+
+    Returns:
+        Round trip latencies and the time spent playing in seconds
+    """
+    latency = LatencyHistogram()
+    start = time.perf_counter()
+    await asyncio.gather(*(client.play(moves, latency) for client in clients))
+    return latency, time.perf_counter() - start
+
+
+def _run_client(
+    args: argparse.Namespace, port: int, server: Optional[_ServerProcess]
+) -> Tuple[LatencyHistogram, float, int]:
+    """
+    Connect all sessions, measure the idle server memory and play.
+
+    Args:
+        args: The parsed command line
+        port: Port of the server
+        server: The server process, None for an external server
+
+    Returns:
+        Round trip latencies, the time spent playing in seconds and the
+        resident server memory in KiB with all sessions idle
+    """
+
+    async def run() -> Tuple[LatencyHistogram, float, int]:
+        clients = await connect_sessions(args.host, port, args.sessions)
+        idle_kib = 0
+        if server is not None:
+            loop = asyncio.get_running_loop()
+            idle_kib = await loop.run_in_executor(None, server.memory)
+        latency, elapsed = await play_sessions(clients, args.moves)
+        return latency, elapsed, idle_kib
+
+    return asyncio.run(run())
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Run the load test and print the results.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        The results
+    """
+    parser = argparse.ArgumentParser(description="Game server load generator")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--moves", type=int, default=20)
+    parser.add_argument("--width", type=int, default=9)
+    parser.add_argument("--height", type=int, default=9)
+    parser.add_argument("--hazards", type=int, default=10)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=0, help="use a running server on this port"
+    )
+    args = parser.parse_args(argv)
+    _raise_file_limit()
+
+    results: Dict[str, Any] = {"sessions": args.sessions}
+    if args.port:
+        latency, elapsed, _ = _run_client(args, args.port, None)
+        moves = latency.count
+    else:
+        server = _ServerProcess((args.width, args.height, args.hazards))
+        try:
+            base_kib = server.memory()
+            latency, elapsed, idle_kib = _run_client(args, server.port, server)
+            stats = server.stop()
+        finally:
+            server.close()
+        moves = stats["moves"]
+        results["kib_per_idle_session"] = (idle_kib - base_kib) / args.sessions
+        results["server_p50_us"] = stats["p50"] / 1000
+        results["server_p99_us"] = stats["p99"] / 1000
+        results["server_max_us"] = stats["max"] / 1000
+    results["moves"] = moves
+    results["moves_per_second"] = moves / elapsed if elapsed else 0.0
+    results["round_trip_p50_us"] = latency.percentile(0.5) / 1000
+    results["round_trip_p99_us"] = latency.percentile(0.99) / 1000
+
+    for name, value in results.items():
+        if isinstance(value, float):
+            print(f"{name:<22} {value:>12.1f}")
+        else:
+            print(f"{name:<22} {value:>12}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
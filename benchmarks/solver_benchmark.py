@@ -0,0 +1,104 @@
+"""
+Throughput benchmark for the constraint solver.
+
+Plays solver games on boards of increasing size and reports the number of
+moves per second. Run with ``python benchmarks/solver_benchmark.py``.
+"""
+
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.solver import ConstraintSolver
+
+# Width, height and hazard count of the benchmarked boards (expert density).
+BOARD_SIZES = [
+    (9, 9, 10),
+    (16, 16, 40),
+    (30, 16, 99),
+    (100, 100, 2060),
+    (300, 300, 18540),
+]
+
+
+def _start_area(game: AbandonedSpaceStation) -> Tuple[int, int]:
+    """
+    Find an area without adjacent hazards to start from.
+
+    Args:
+        game: The game
+
+    Returns:
+        Coordinates of the start area
+    """
+    for y in range(game.grid_height):
+        for x in range(game.grid_width):
+            if (
+                game.count_adjacent_hazards(x, y) == 0
+                and (
+                    x,
+                    y,
+                )
+                not in game.hazard_locations
+            ):
+                return x, y
+    return 0, 0
+
+
+def run_game(
+    grid_width: int, grid_height: int, hazards: int, seed: int
+) -> Tuple[int, float]:
+    """
+    Play one game with the solver, guessing when it gets stuck.
+
+    Args:
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazards: Number of hazards
+        seed: Seed of the board and the guesses
+
+    Returns:
+        Number of moves and the time spent playing in seconds
+    """
+    rng = random.Random(seed)
+    game = AbandonedSpaceStation(
+        grid_width, grid_height, hazards, seed=seed, verbose=False
+    )
+    solver = ConstraintSolver(game)
+    start = time.perf_counter()
+    solver.update(game.reveal_area(*_start_area(game)))
+    moves = 1
+    while not (game.is_victorious or game.is_defeated):
+        if solver.step() is None:
+            solver.update(game.reveal_area(*solver.random_unknown_area(rng)))
+        moves += 1
+    return moves, time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Run the benchmark and print moves per second for every board size.
+    """
+    rows: List[str] = []
+    for grid_width, grid_height, hazards in BOARD_SIZES:
+        games = max(3, 10000 // (grid_width * grid_height))
+        total_moves, total_time = 0, 0.0
+        for seed in range(games):
+            moves, elapsed = run_game(grid_width, grid_height, hazards, seed)
+            total_moves += moves
+            total_time += elapsed
+        rows.append(
+            f"{grid_width:>4}x{grid_height:<4} {hazards:>6} {games:>6} "
+            f"{total_moves:>8} {total_moves / total_time:>12.0f}"
+        )
+    print("board       hazards  games    moves  moves/second")
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Startup benchmark for the game entry point.
+
+Compiles the package, then starts fresh interpreters that import the game
+entry point and reports the best wall time against a bare interpreter, the
+slowest imports from ``python -X importtime`` and whether a module that does
+not belong on the game path (coverage, unittest) was loaded. Exits with code
+1 if the cold start misses the target. Run with
+``python benchmarks/startup_benchmark.py``.
+"""
+
+import argparse
+import compileall
+import os
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+# The package and the directory containing it, so "exam" can be imported.
+PACKAGE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ROOT = os.path.dirname(PACKAGE)
+# Module imported by "python -m exam" before the game starts.
+ENTRY_POINT = "exam.__main__"
+# Modules that must not be loaded on the game path.
+FORBIDDEN_MODULES = ["coverage", "unittest"]
+
+
+def _run(args: List[str]) -> "subprocess.CompletedProcess[str]":
+    """
+    Run a fresh interpreter in the package root.
+
+    Args:
+        args: Interpreter arguments
+
+    Returns:
+        The finished process
+    """
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def wall_time(code: str, runs: int) -> float:
+    """
+    Measure the best wall time of a fresh interpreter running some code.
+
+    Args:
+        code: Code to run with ``python -c``
+        runs: Number of runs
+
+    Returns:
+        Best wall time in milliseconds
+    """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(["-c", code])
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Get the import times of a module and everything it imports.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Name, own time and cumulative time in microseconds of every import,
+        in the order reported by ``-X importtime``
+    """
+    report = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+    times = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        times.append((name.strip(), int(own), int(cumulative)))
+    return times
+
+
+def loaded_modules(module: str) -> List[str]:
+    """
+    Get all modules loaded after importing a module.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Names of the loaded modules
+    """
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    return _run(["-c", code]).stdout.split()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark and print the report.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Exit code: 0 if the target is met, 1 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Startup benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target", type=float, default=50.0, help="milliseconds")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--module", default=ENTRY_POINT)
+    args = parser.parse_args(argv)
+
+    # Measure with cached bytecode like a normal start, even if writing
+    # bytecode is disabled in this environment.
+    compileall.compile_dir(PACKAGE, quiet=1)
+    baseline = wall_time("pass", args.runs)
+    cold_start = wall_time(f"import {args.module}", args.runs)
+    times = import_times(args.module)
+    forbidden = [
+        name
+        for name in loaded_modules(args.module)
+        if name.split(".")[0] in FORBIDDEN_MODULES
+    ]
+
+    print(f"bare interpreter      {baseline:8.1f} ms")
+    print(f"cold start            {cold_start:8.1f} ms (target {args.target:.0f} ms)")
+    print(f"imports               {cold_start - baseline:8.1f} ms")
+    print("\nslowest imports (cumulative, -X importtime):")
+    for name, own, cumulative in sorted(times, key=lambda item: -item[2])[: args.top]:
+        print(f"  {name:<32} {cumulative / 1000:8.2f} ms  (self {own / 1000:.2f} ms)")
+    if forbidden:
+        print(f"\nloaded on the game path: {', '.join(forbidden)}")
+    return 0 if cold_start <= args.target and not forbidden else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
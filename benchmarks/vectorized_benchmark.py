@@ -0,0 +1,76 @@
+"""
+Throughput benchmark for the vectorized multi-board engine.
+
+Compares board creation and random-move simulation of the NumPy engine with
+the regular game and the headless simulation engine, in games per second.
+Requires NumPy. Run with ``python benchmarks/vectorized_benchmark.py``.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.simulation import run_simulations
+
+# Width, height and hazard count of the benchmarked boards.
+BOARD_SIZES = [(9, 9, 10), (16, 16, 40), (30, 16, 99)]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run the benchmark and print games per second for every board size.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Vectorized engine benchmark")
+    parser.add_argument("--games", type=int, default=100000)
+    args = parser.parse_args(argv)
+    try:
+        from exam.source.vectorized import (  # pylint: disable=import-outside-toplevel
+            BoardBatch,
+            simulate_random,
+        )
+    except ImportError:
+        print("NumPy is not installed.")
+        return
+
+    reference_games = max(1, args.games // 20)
+    print("board    hazards   create/s  vector create/s   play/s  vector play/s")
+    for grid_width, grid_height, hazards in BOARD_SIZES:
+        start = time.perf_counter()
+        for seed in range(reference_games):
+            AbandonedSpaceStation(grid_width, grid_height, hazards, seed=seed)
+        create = reference_games / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        BoardBatch(args.games, grid_width, grid_height, hazards, seed=0)
+        vector_create = args.games / (time.perf_counter() - start)
+
+        result = run_simulations(
+            reference_games,
+            grid_width,
+            grid_height,
+            hazards,
+            workers=1,
+            seed=0,
+            auto_reveal=False,
+        )
+        start = time.perf_counter()
+        simulate_random(args.games, grid_width, grid_height, hazards, seed=0)
+        vector_play = args.games / (time.perf_counter() - start)
+
+        print(
+            f"{grid_width:>3}x{grid_height:<3} {hazards:>9} {create:>10.0f} "
+            f"{vector_create:>16.0f} {result.games_per_second:>8.0f} "
+            f"{vector_play:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
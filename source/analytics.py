@@ -0,0 +1,316 @@
+"""
+Board analytics for the game 'Abandoned Space Station'.
+
+Grades boards by their 3BV, the minimum number of clicks needed to clear a
+board: every zero region is opened by one click and every numbered area
+that does not border a zero region needs a click of its own. The metrics of
+a board are computed in one linear pass over its count table with a
+union-find over the zero areas. Large corpora of seeded boards are analyzed
+as a stream, spread across worker processes, and written as JSONL or CSV.
+
+Usage: python source/analytics.py [--boards N] [--first-seed S]
+[--seeds FILE] [--width W] [--height H] [--hazards N] [--format FORMAT]
+[--output FILE] [--workers N] [--chunk-size N]
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from typing import Deque, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.solver import neighbor_table
+from exam.source.views import HAZARD_FLAG
+
+FORMATS = ("jsonl", "csv")
+
+# Maps every count table value to 1 for hazards and 0 otherwise.
+_HAZARDS = bytes(1 if value & HAZARD_FLAG else 0 for value in range(256))
+
+
+@dataclass
+class BoardMetrics:
+    """
+    Difficulty metrics of a board.
+    """
+
+    seed: Optional[int]
+    grid_width: int
+    grid_height: int
+    hazards: int
+    bbbv: int
+    zero_regions: int
+    isolated_numbers: int
+
+
+# Column names of the CSV output, in the order of the fields.
+FIELDS = tuple(field.name for field in fields(BoardMetrics))
+
+
+def _find(parent: List[int], index: int) -> int:
+    """
+    Find the root of an area in a union-find, halving the path on the way.
+
+    Args:
+        parent: Parent of every area, roots are their own parent
+        index: Flat index of the area
+
+    Returns:
+        Flat index of the root
+    """
+    while parent[index] != index:
+        parent[index] = index = parent[parent[index]]
+    return index
+
+
+def board_metrics(
+    game: AbandonedSpaceStation, seed: Optional[int] = None
+) -> BoardMetrics:
+    """
+    Compute the 3BV and region statistics of a board.
+
+    Only the zero areas are visited: each is joined with its zero neighbors
+    in a union-find, so every zero region is counted once, and its numbered
+    neighbors are marked on the way. Hazards and numbered areas are counted
+    over the whole table at once. What has been scanned does not matter.
+
+    Args:
+        game: The game, e.g. a new, generated or loaded game
+        seed: Seed of the board, copied into the result (default: the seed
+            of the game)
+
+    Returns:
+        The metrics of the board
+    """
+    counts = bytes(game.tables()[0])
+    neighbors = neighbor_table(game.grid_width, game.grid_height)
+    parent = list(range(len(counts)))
+    bordered = bytearray(len(counts))
+    zeros = counts.count(0)
+    hazards = counts.translate(_HAZARDS).count(1)
+    regions = zeros
+    index = counts.find(0)
+    while index != -1:
+        for neighbor in neighbors[index]:
+            adjacent = counts[neighbor]
+            if adjacent & HAZARD_FLAG:
+                continue
+            if adjacent:
+                bordered[neighbor] = 1
+            elif neighbor < index:
+                root, other = _find(parent, index), _find(parent, neighbor)
+                if root != other:
+                    parent[root] = other
+                    regions -= 1
+        index = counts.find(0, index + 1)
+    isolated = len(counts) - zeros - hazards - bordered.count(1)
+    return BoardMetrics(
+        game.seed if seed is None else seed,
+        game.grid_width,
+        game.grid_height,
+        hazards,
+        regions + isolated,
+        regions,
+        isolated,
+    )
+
+
+def _analyze_chunk(task: Tuple[int, int, int, List[int]]) -> List[BoardMetrics]:
+    """
+    Analyze the boards of a chunk of seeds in a worker.
+
+    Args:
+        task: Grid width, grid height, hazard count and the seeds
+
+    Returns:
+        The metrics of the boards in the order of the seeds
+    """
+    grid_width, grid_height, hazard_count, seeds = task
+    return [
+        board_metrics(
+            AbandonedSpaceStation(
+                grid_width, grid_height, hazard_count, seed=seed, compact=True
+            ),
+            seed,
+        )
+        for seed in seeds
+    ]
+
+
+def analyze_seeds(  # pylint: disable=too-many-arguments
+    seeds: Iterable[int],
+    grid_width: int,
+    grid_height: int,
+    hazard_count: int,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> Iterator[BoardMetrics]:
+    """
+    Analyze the boards of many seeds as a stream.
+
+    The seeds are read lazily in chunks, and at most two chunks per worker
+    are in flight, so neither the seeds nor the results of a whole corpus
+    are held in memory. The results are yielded in the order of the seeds.
+
+    Args:
+        seeds: Seeds of the boards, e.g. a range or the lines of a file
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazard_count: Number of hazards on the game grid
+        workers: Number of worker processes, 1 runs in the calling process
+            (default: number of CPUs)
+        chunk_size: Boards per chunk (default: 1000)
+
+    Returns:
+        Iterator over the metrics of the boards
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be at least 1.")
+    workers = workers or os.cpu_count() or 1
+    seed_iterator = iter(seeds)
+    tasks = (
+        (grid_width, grid_height, hazard_count, chunk)
+        for chunk in iter(lambda: list(itertools.islice(seed_iterator, chunk_size)), [])
+    )
+
+    if workers == 1:
+        for task in tasks:
+            yield from _analyze_chunk(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque["Future[List[BoardMetrics]]"] = deque()
+        for task in tasks:
+            pending.append(executor.submit(_analyze_chunk, task))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_jsonl(metrics: Iterable[BoardMetrics], file: TextIO) -> int:
+    """
+    Write metrics as one JSON object per line.
+
+    Args:
+        metrics: Metrics of the boards
+        file: Text file to write to
+
+    Returns:
+        Number of written boards
+    """
+    written = 0
+    for board in metrics:
+        file.write(json.dumps(asdict(board)) + "\n")
+        written += 1
+    return written
+
+
+def write_csv(metrics: Iterable[BoardMetrics], file: TextIO) -> int:
+    """
+    Write metrics as CSV with a header row.
+
+    Args:
+        metrics: Metrics of the boards
+        file: Text file to write to, opened with ``newline=""``
+
+    Returns:
+        Number of written boards
+    """
+    writer = csv.writer(file)
+    writer.writerow(FIELDS)
+    written = 0
+    for board in metrics:
+        writer.writerow(
+            (
+                "" if board.seed is None else board.seed,
+                board.grid_width,
+                board.grid_height,
+                board.hazards,
+                board.bbbv,
+                board.zero_regions,
+                board.isolated_numbers,
+            )
+        )
+        written += 1
+    return written
+
+
+def _read_seeds(file: TextIO) -> Iterator[int]:
+    """
+    Read seeds lazily, one per line, skipping empty lines.
+
+    Args:
+        file: Text file with the seeds
+
+    Returns:
+        Iterator over the seeds
+    """
+    for line in file:
+        if line.strip():
+            yield int(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line, analyze the boards and write the metrics.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Board analytics")
+    parser.add_argument("--boards", type=int, default=1000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--seeds", help="file with one seed per line")
+    parser.add_argument("--width", type=int, default=30)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--hazards", type=int, default=99)
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        if args.seeds:
+            seeds: Iterable[int] = _read_seeds(
+                stack.enter_context(open(args.seeds, encoding="utf-8"))
+            )
+        else:
+            seeds = range(args.first_seed, args.first_seed + args.boards)
+        output = sys.stdout
+        if args.output:
+            output = stack.enter_context(
+                open(args.output, "w", encoding="utf-8", newline="")
+            )
+        metrics = analyze_seeds(
+            seeds,
+            args.width,
+            args.height,
+            args.hazards,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+        write = write_csv if args.format == "csv" else write_jsonl
+        start = time.perf_counter()
+        written = write(metrics, output)
+        elapsed = time.perf_counter() - start
+    print(
+        f"{written} boards in {elapsed:.1f} s "
+        f"({written / elapsed if elapsed else 0:.0f} boards/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Unbounded board for the game 'Abandoned Space Station'.
+
+Splits an endless board into square chunks. The hazards of a chunk are
+derived from the seed and the chunk coordinates the first time the chunk is
+touched, so the memory usage follows the explored area and every chunk looks
+the same no matter in which order the board is explored.
+"""
+
+import os
+import random
+import sys
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.views import COUNT_MASK, HAZARD_FLAG, TRIGGERED_FLAG
+
+CHUNK_SIZE = 32
+
+# Marks scanned areas in a chunk table, next to the flags shared with views.
+_SCANNED_FLAG = 0x40
+
+
+class UnboundedSpaceStation:
+    """
+    Game board without edges, stored as lazily generated chunks.
+
+    Every chunk is a byte table with one byte per area in the same layout as
+    the adjacency count table of AbandonedSpaceStation, plus a flag for
+    scanned areas. Adjacent hazard counts are computed when an area is
+    scanned and may look into the neighboring chunks, which generates their
+    hazards as well. Chunks that were never touched are not stored.
+
+    Coordinates may be negative. Since the board has no end, the game can be
+    lost but never won.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        hazards_per_chunk: int = 160,
+        *,
+        seed: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+        reveal_limit: int = 10_000,
+        verbose: bool = True,
+    ) -> None:
+        """
+        Initialize a new unbounded game.
+
+        Args:
+            hazards_per_chunk: Number of hazards in every chunk (default: 160)
+            seed: Seed of the board. The same seed always produces the same
+                board (default: random)
+            chunk_size: Width and height of a chunk (default: 32)
+            reveal_limit: Maximum number of areas opened by a single reveal
+                (default: 10000)
+            verbose: Print messages for rejected scans (default: True)
+        """
+        if not 0 <= hazards_per_chunk <= chunk_size * chunk_size:
+            raise ValueError("Number of hazards exceeds the number of areas.")
+        self.hazards_per_chunk = hazards_per_chunk
+        self.seed = seed if seed is not None else random.randrange(1 << 63)
+        self.chunk_size = chunk_size
+        self.reveal_limit = reveal_limit
+        self.verbose = verbose
+        self._chunks: Dict[Tuple[int, int], bytearray] = {}
+        self.scanned_count = 0
+        self.is_defeated = False
+        self.is_victorious = False
+        self.action_count = 0
+
+    @property
+    def chunk_count(self) -> int:
+        """
+        Number of chunks generated so far.
+        """
+        return len(self._chunks)
+
+    def _generate_chunk(self, chunk_x: int, chunk_y: int) -> bytearray:
+        """
+        Generate the hazards of a chunk.
+
+        Args:
+            chunk_x: X-coordinate of the chunk
+            chunk_y: Y-coordinate of the chunk
+
+        Returns:
+            The chunk table with all hazards flagged
+        """
+        area_count = self.chunk_size * self.chunk_size
+        chunk = bytearray(area_count)
+        rng = random.Random(f"{self.seed}:{chunk_x}:{chunk_y}")
+        for position in rng.sample(range(area_count), self.hazards_per_chunk):
+            chunk[position] = HAZARD_FLAG
+        self._chunks[chunk_x, chunk_y] = chunk
+        return chunk
+
+    def _locate(self, x: int, y: int) -> Tuple[bytearray, int]:
+        """
+        Find the chunk table of an area, generating the chunk if necessary.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            The chunk table and the index of the area in it
+        """
+        chunk_x, local_x = divmod(x, self.chunk_size)
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        chunk = self._chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self._generate_chunk(chunk_x, chunk_y)
+        return chunk, local_y * self.chunk_size + local_x
+
+    def is_hazard(self, x: int, y: int) -> bool:
+        """
+        Check whether an area holds a hazard.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            True if the area holds a hazard
+        """
+        chunk, index = self._locate(x, y)
+        return bool(chunk[index] & HAZARD_FLAG)
+
+    def _count_adjacent_hazards(self, x: int, y: int) -> int:
+        """
+        Count the number of adjacent hazards for a given area.
+
+        Neighbors in other chunks are looked up in these chunks, so the
+        count is the same as on a board without chunk edges.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            Number of adjacent hazards, 0 for hazard areas
+        """
+        if self.is_hazard(x, y):
+            return 0
+        return sum(
+            self.is_hazard(nx, ny)
+            for ny in range(y - 1, y + 2)
+            for nx in range(x - 1, x + 2)
+            if (nx, ny) != (x, y)
+        )
+
+    def count_adjacent_hazards(self, x: int, y: int) -> int:
+        """
+        Public method to count the number of adjacent hazards for testing.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            Number of adjacent hazards
+        """
+        return self._count_adjacent_hazards(x, y)
+
+    def is_scanned(self, x: int, y: int) -> bool:
+        """
+        Check whether an area has already been scanned.
+
+        Does not generate the chunk of the area.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            True if the area has been scanned
+        """
+        chunk_x, local_x = divmod(x, self.chunk_size)
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        chunk = self._chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            return False
+        return bool(chunk[local_y * self.chunk_size + local_x] & _SCANNED_FLAG)
+
+    def _scan(self, x: int, y: int) -> int:
+        """
+        Mark a safe area as scanned and store its adjacent hazard count.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            Number of adjacent hazards
+        """
+        adjacent = self._count_adjacent_hazards(x, y)
+        chunk, index = self._locate(x, y)
+        chunk[index] = _SCANNED_FLAG | adjacent
+        self.scanned_count += 1
+        return adjacent
+
+    def _begin_action(self, x: int, y: int) -> Optional[bool]:
+        """
+        Count an action and check the scanned area for a hazard.
+
+        Args:
+            x: X-coordinate
+            y: Y-coordinate
+
+        Returns:
+            None if the area was already scanned, False if a hazard was
+            triggered and True if the area is safe
+        """
+        if self.is_scanned(x, y):
+            if self.verbose:
+                print("This area has already been scanned. Please choose another.")
+            return None
+
+        self.action_count += 1
+        chunk, index = self._locate(x, y)
+        if chunk[index] & HAZARD_FLAG:
+            chunk[index] |= TRIGGERED_FLAG
+            self.is_defeated = True
+            return False
+        return True
+
+    def scan_area(self, x: int, y: int) -> bool:
+        """
+        Scan an area on the game board.
+
+        Args:
+            x: X-coordinate
+            y: Y-coordinate
+
+        Returns:
+            True if the scan was successful, False if a hazard was detected
+        """
+        safe = self._begin_action(x, y)
+        if safe:
+            self._scan(x, y)
+        return safe is not False
+
+    def reveal_area(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """
+        Scan an area and automatically reveal connected areas without hazards.
+
+        Works like AbandonedSpaceStation.reveal_area, but stops opening new
+        areas after ``reveal_limit`` areas, since a region without adjacent
+        hazards may be arbitrarily large on an unbounded board.
+
+        Args:
+            x: X-coordinate
+            y: Y-coordinate
+
+        Returns:
+            List of revealed areas in reveal order. Contains only the hazard
+            position if a hazard was triggered and is empty if nothing changed
+        """
+        safe = self._begin_action(x, y)
+        if safe is None:
+            return []
+        if not safe:
+            return [(x, y)]
+
+        revealed: List[Tuple[int, int]] = []
+        seen = {(x, y)}
+        queue = deque(seen)
+        while queue and len(revealed) < self.reveal_limit:
+            cx, cy = queue.popleft()
+            if self.is_scanned(cx, cy):
+                continue
+            revealed.append((cx, cy))
+            if self._scan(cx, cy):
+                continue
+            for ny in range(cy - 1, cy + 2):
+                for nx in range(cx - 1, cx + 2):
+                    if (nx, ny) not in seen:
+                        seen.add((nx, ny))
+                        queue.append((nx, ny))
+        return revealed
+
+    def area(self, x: int, y: int) -> str:
+        """
+        Get an area as seen by the player.
+
+        Does not generate the chunk of the area.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            "H" for a triggered hazard, the adjacent hazard count for a
+            scanned area and "?" otherwise
+        """
+        chunk_x, local_x = divmod(x, self.chunk_size)
+        chunk_y, local_y = divmod(y, self.chunk_size)
+        chunk = self._chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            return "?"
+        value = chunk[local_y * self.chunk_size + local_x]
+        if value & TRIGGERED_FLAG:
+            return "H"
+        if value & _SCANNED_FLAG:
+            return str(value & COUNT_MASK)
+        return "?"
+
+    def window(self, left: int, top: int, width: int, height: int) -> List[str]:
+        """
+        Get a rectangular part of the board as seen by the player.
+
+        Args:
+            left: X-coordinate of the left column
+            top: Y-coordinate of the top row
+            width: Number of columns
+            height: Number of rows
+
+        Returns:
+            One string per row with one character per area
+        """
+        return [
+            "".join(self.area(x, y) for x in range(left, left + width))
+            for y in range(top, top + height)
+        ]
@@ -0,0 +1,240 @@
+"""
+Event stream for the game 'Abandoned Space Station'.
+
+Turns what happens in a game into structured events: the start of the game,
+scans and reveals, rejected input, victory and defeat. An EventEmitter
+registers itself as a move and rejection listener of one game and passes
+every event as a dictionary to its sinks, so games without an emitter do
+not pay anything. JsonlSink collects the events of any number of games and
+writes them as JSON lines in batches, so monitoring can follow a file or a
+pipe instead of parsing the printed messages.
+"""
+
+import json
+import os
+import sys
+import time
+from typing import IO, Any, Callable, Dict, List, Optional, Union
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.persistence import PathLike
+
+# Names of the events, in the order they can occur in a game.
+EVENTS = ("start", "scan", "reveal", "invalid", "victory", "defeat")
+# Events that end a game, after which JsonlSink writes at once.
+_FINAL_EVENTS = frozenset(("victory", "defeat"))
+
+# An event with its name ("event"), Unix time ("time") and fields.
+Event = Dict[str, Any]
+# Receives every emitted event, e.g. a JsonlSink or list.append.
+EventSink = Callable[[Event], None]
+
+
+class EventEmitter:
+    """
+    Emits the events of a game to sinks.
+
+    Every event is a dictionary with the event name, the Unix time and the
+    fields of the event:
+
+    - start: grid_width, grid_height, hazards and seed of the game
+    - scan, reveal: x, y, safe, the total scanned areas and actions
+    - invalid: action ("scan", "reveal" or "input" for text in play() that
+      is not a position on the grid), x and y, None for input, and reason
+      ("invalid" or "scanned")
+    - victory, defeat: the total scanned areas and actions
+
+    The emitter is attached to one game at a time; sinks can be shared by
+    the emitters of many games.
+    """
+
+    def __init__(self, *sinks: EventSink) -> None:
+        """
+        Initialize a new emitter.
+
+        Args:
+            sinks: Receivers of the events
+        """
+        self.sinks: List[EventSink] = list(sinks)
+        self.game: Optional[AbandonedSpaceStation] = None
+
+    def emit(self, name: str, **fields: Any) -> None:
+        """
+        Pass an event on to all sinks.
+
+        Args:
+            name: Name of the event
+            fields: Fields of the event
+        """
+        event = {"event": name, "time": time.time(), **fields}
+        for sink in self.sinks:
+            sink(event)
+
+    def attach(self, game: AbandonedSpaceStation) -> None:
+        """
+        Start emitting the events of a game with its start event.
+
+        Args:
+            game: The game, detached from a previous game if necessary
+        """
+        self.detach()
+        self.game = game
+        game.move_listeners.append(self.moved)
+        game.rejection_listeners.append(self.rejected)
+        self.emit(
+            "start",
+            grid_width=game.grid_width,
+            grid_height=game.grid_height,
+            hazards=game.statistics()["hazards"],
+            seed=game.seed,
+        )
+
+    def detach(self) -> None:
+        """
+        Stop emitting the events of the attached game.
+        """
+        game = self.game
+        if game is None:
+            return
+        if self.moved in game.move_listeners:
+            game.move_listeners.remove(self.moved)
+        if self.rejected in game.rejection_listeners:
+            game.rejection_listeners.remove(self.rejected)
+        self.game = None
+
+    def moved(self, action: str, x: int, y: int, safe: bool) -> None:
+        """
+        Emit a scan or reveal. Called by the game as a move listener.
+
+        A safe action that leaves the game won is the action that won it,
+        since every area left to scan after a victory is a hazard.
+
+        Args:
+            action: "scan" or "reveal"
+            x: X-coordinate
+            y: Y-coordinate
+            safe: False if a hazard was triggered
+        """
+        game = self.game
+        assert game is not None
+        scanned, actions = game.scanned_count, game.action_count
+        # Built directly rather than through emit(), since this runs for
+        # every action.
+        event = {
+            "event": action,
+            "time": time.time(),
+            "x": x,
+            "y": y,
+            "safe": safe,
+            "scanned": scanned,
+            "actions": actions,
+        }
+        for sink in self.sinks:
+            sink(event)
+        if not safe:
+            self.emit("defeat", scanned=scanned, actions=actions)
+        elif game.is_victorious:
+            self.emit("victory", scanned=scanned, actions=actions)
+
+    def rejected(
+        self, action: str, x: Optional[int], y: Optional[int], reason: str
+    ) -> None:
+        """
+        Emit a rejected input. Called by the game as a rejection listener.
+
+        Args:
+            action: "scan", "reveal" or "input"
+            x: X-coordinate or None
+            y: Y-coordinate or None
+            reason: "invalid" or "scanned"
+        """
+        self.emit("invalid", action=action, x=x, y=y, reason=reason)
+
+
+class JsonlSink:
+    """
+    Writes events to a file or pipe, one JSON object per line.
+
+    Events are collected in memory and encoded and written together once
+    ``batch_size`` events are waiting, an event arrives ``max_delay``
+    seconds after the oldest waiting one or an event ends a game. The delay
+    is only checked when events arrive, as the sink has no timer: while a
+    game waits for input, its latest events stay in memory until the next
+    event, the end of the game or flush(). Call close() or use the sink as
+    a context manager to write the remaining events.
+    """
+
+    def __init__(
+        self,
+        file: Union[PathLike, IO[str]],
+        batch_size: int = 1000,
+        max_delay: float = 1.0,
+    ) -> None:
+        """
+        Open a sink.
+
+        Args:
+            file: Path of a file the events are appended to, or an open text
+                stream such as sys.stdout, which is left open
+            batch_size: Events written at once (default: 1000)
+            max_delay: Seconds after which the next event writes the waiting
+                ones (default: 1)
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1.")
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        if isinstance(file, (str, os.PathLike)):
+            # pylint: disable-next=consider-using-with
+            self._file: IO[str] = open(file, "a", encoding="utf-8")
+            self._owned = True
+        else:
+            self._file = file
+            self._owned = False
+        self._pending: List[Event] = []
+        self._deadline = 0.0
+
+    def __call__(self, event: Event) -> None:
+        """
+        Collect an event. Written with the next batch, or at once if it
+        ends a game.
+
+        Args:
+            event: The event
+        """
+        pending = self._pending
+        if not pending:
+            self._deadline = event["time"] + self.max_delay
+        pending.append(event)
+        if (
+            len(pending) >= self.batch_size
+            or event["time"] >= self._deadline
+            or event["event"] in _FINAL_EVENTS
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all collected events.
+        """
+        if not self._pending:
+            return
+        self._file.write("".join([json.dumps(event) + "\n" for event in self._pending]))
+        self._file.flush()
+        self._pending.clear()
+
+    def close(self) -> None:
+        """
+        Write the collected events and close a file opened by the sink.
+        """
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
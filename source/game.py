@@ -7,12 +7,115 @@ Contains the main game class and related functionality.
 import random
 import sys
 import os
-
-from typing import Set, Tuple, List
+from collections import deque
+
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from exam.source.helpers import clear_terminal, process_coordinates
+from exam.source.hazard_index import (
+    SparseCounts,
+    dense_counts,
+    find_all,
+    move_hazards,
+    use_sparse_index,
+)
+from exam.source.helpers import process_coordinates
+from exam.source.history import (
+    FLAG_BITS,
+    REVEALED,
+    TRIGGERED,
+    WAS_DEFEATED,
+    WAS_TRIGGERED,
+    WAS_VICTORIOUS,
+    ChangeLog,
+    Snapshot,
+)
+from exam.source.renderer import (
+    TerminalRenderer,
+    Viewport,
+    fit_screen,
+    format_grid,
+    terminal_size,
+)
+from exam.source.views import (
+    HAZARD_FLAG,
+    TRIGGERED_FLAG,
+    Counts,
+    GridView,
+    HazardView,
+    ScannedView,
+    Table,
+)
+
+if TYPE_CHECKING:
+    # Only needed for type hints; tracemalloc and json are not loaded for
+    # plain games.
+    from exam.source.events import EventEmitter
+    from exam.source.instrumentation import Instrumentation
+
+# Called after every scan or reveal that counted as an action, with the kind
+# of action ("scan" or "reveal"), the coordinates and whether the area was safe.
+MoveListener = Callable[[str, int, int, bool], None]
+# Called for every rejected input with the kind of action ("scan", "reveal"
+# or "input" for text in play() that is not a position on the grid), the
+# coordinates or None and the reason ("invalid" or "scanned").
+RejectionListener = Callable[[str, Optional[int], Optional[int], str], None]
+
+
+# Header above the grid with the title and the instructions.
+_INTRO = "\n".join(
+    [
+        "",
+        "=" * 40,
+        "  Abandoned Space Station",
+        "=" * 40,
+        "",
+        "Welcome to the derelict space station!",
+        "Your mission is to scan all safe areas,",
+        "without triggering any hazards.",
+        "",
+        "Instructions:",
+        "- ? = Unexplored area",
+        "- 0-8 = Number of adjacent hazards",
+        "- H = Hazard (Game Over)",
+        "",
+        "Enter coordinates in the format 'x y' (e.g. '2 3')",
+        "Enter 'q' to quit the game.",
+        "=" * 40,
+        "",
+        "",
+    ]
+)
+# Header above a grid that is larger than the terminal, kept short so the
+# viewport gets as many rows as possible.
+_VIEWPORT_INTRO = "\n".join(
+    [
+        "Abandoned Space Station - scroll with w/a/s/d or the arrow keys,",
+        "jump with 'g x y', scan with 'x y', quit with 'q'.",
+        "",
+    ]
+)
+
+# Messages for rejected scans of a verbose game.
+_REJECTIONS = {
+    "invalid": "Invalid coordinates. Please try again.",
+    "scanned": "This area has already been scanned. Please choose another.",
+}
 
 
 class AbandonedSpaceStation:
@@ -20,10 +123,32 @@ class AbandonedSpaceStation:
     Main class for the game 'Abandoned Space Station'.
 
     Manages game state, grid, hazards, and player interactions.
+
+    The board is stored in two flat tables: a byte per area holding the
+    adjacent hazard count and hazard flags, and a bitset of scanned areas.
+    By default the game additionally keeps ``grid``, ``hazard_locations``
+    and ``scanned_areas`` as regular lists and sets. In compact mode these
+    attributes are lazy read-only views over the tables instead, which
+    brings the memory usage down to about 1.1 bytes per area.
+
+    Every action is recorded in a change log with the areas it changed, so
+    actions can be undone and redone and a snapshot of the game is just a
+    position in the log. Branching a game for a search therefore never
+    copies the board.
     """
 
-    def __init__(
-        self, grid_width: int = 5, grid_height: int = 5, hazard_count: int = 5
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        grid_width: int = 5,
+        grid_height: int = 5,
+        hazard_count: int = 5,
+        *,
+        seed: Optional[Union[int, random.Random]] = None,
+        compact: bool = False,
+        verbose: bool = True,
+        instrumentation: Optional["Instrumentation"] = None,
+        hazard_index: str = "auto",
+        events: Optional["EventEmitter"] = None,
     ) -> None:
         """
         Initialize a new game instance.
@@ -32,32 +157,320 @@ class AbandonedSpaceStation:
             grid_width: Width of the game grid (default: 5)
             grid_height: Height of the game grid (default: 5)
             hazard_count: Number of hazards on the game grid (default: 5)
+            seed: Seed or random generator for hazard placement. The same
+                seed always produces the same board (default: random)
+            compact: Store the board only in the compact tables and expose
+                grid, hazards and scanned areas as lazy views (default: False)
+            verbose: Print messages for rejected scans (default: True)
+            instrumentation: Record latencies of scans, rendering and input
+                parsing (default: none)
+            hazard_index: "dense" for a count table with one byte per area,
+                "sparse" for a hash set of the hazards with counts computed
+                on demand or "auto" to choose by board size and density
+                (default: "auto")
+            events: Emitter attached to the game, which receives its start,
+                actions, rejected input and end as events (default: none)
         """
+        if hazard_index not in ("auto", "dense", "sparse"):
+            raise ValueError(f"Unknown hazard index '{hazard_index}'.")
         self.grid_width = grid_width
         self.grid_height = grid_height
         self.hazard_count = hazard_count
-        self.grid: List[List[str]] = [
-            ["?"] * self.grid_width for _ in range(self.grid_height)
-        ]
-        self.hazard_locations: Set[Tuple[int, int]] = set()
+        self.seed = seed if isinstance(seed, int) else None
+        self.compact = compact
+        self.verbose = verbose
+        self.hazard_index = hazard_index
+        self._rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        area_count = grid_width * grid_height
+        self._adjacent_counts: Counts = bytearray()
+        self._scanned_bits: Table = bytearray((area_count + 7) >> 3)
+        self._scanned_count = 0
+        self._hazard_total = 0
+        self._grid: List[List[str]] = []
+        self._hazard_locations: FrozenSet[Tuple[int, int]] = frozenset()
+        self._scanned_areas: Set[Tuple[int, int]] = set()
+        if not compact:
+            self._grid = [["?"] * grid_width for _ in range(grid_height)]
         self._place_hazards()
-        self.scanned_areas: Set[Tuple[int, int]] = set()
         self.is_defeated = False
         self.is_victorious = False
         self.action_count = 0
+        self.move_listeners: List[MoveListener] = []
+        self.rejection_listeners: List[RejectionListener] = []
+        # Journals recording the actions, which cannot be taken back then.
+        self.journals = 0
+        self._history = ChangeLog()
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            # The timed methods shadow the class methods on this instance
+            # only, so games without instrumentation run the plain methods.
+            for name in ("scan_area", "reveal_area"):
+                method = instrumentation.wrap(name, getattr(self, name), move=True)
+                setattr(self, name, method)
+        if events is not None:
+            events.attach(self)
+
+    @classmethod
+    def from_tables(  # pylint: disable=too-many-arguments
+        cls,
+        grid_width: int,
+        grid_height: int,
+        counts: Table,
+        scanned_bits: Table,
+        *,
+        hazard_total: int,
+        scanned_count: int,
+        verbose: bool = True,
+    ) -> "AbandonedSpaceStation":
+        """
+        Create a compact game from existing board tables, e.g. a loaded save.
+
+        The tables are used as they are and not copied or checked, so a
+        memory-mapped table is only read where the game touches it.
+
+        Args:
+            grid_width: Width of the game grid
+            grid_height: Height of the game grid
+            counts: Adjacency count table with hazard flags
+            scanned_bits: Bitset of scanned areas
+            hazard_total: Number of hazards in the count table
+            scanned_count: Number of set bits in the scanned bitset
+            verbose: Print messages for rejected scans (default: True)
+
+        Returns:
+            The game in compact mode
+        """
+        game = cls(0, 0, 0, compact=True, verbose=verbose)
+        game.grid_width = grid_width
+        game.grid_height = grid_height
+        game.hazard_count = hazard_total
+        game._adjacent_counts = counts
+        game._scanned_bits = scanned_bits
+        game._hazard_total = hazard_total
+        game._scanned_count = scanned_count
+        return game
+
+    @property
+    def grid(self) -> Sequence[Sequence[str]]:
+        """
+        Rows of the game grid as seen by the player.
+        """
+        if self.compact:
+            return GridView(
+                self._adjacent_counts,
+                self._scanned_bits,
+                self.grid_width,
+                self.grid_height,
+            )
+        return self._grid
+
+    @property
+    def hazard_locations(self) -> AbstractSet[Tuple[int, int]]:
+        """
+        Positions of all hazards on the game grid.
+
+        The positions are read-only; assigning a new collection rebuilds
+        the adjacency count table. Positions outside the grid are rejected
+        with a ValueError.
+        """
+        if isinstance(self._adjacent_counts, SparseCounts):
+            return self._adjacent_counts.locations()
+        if self.compact:
+            return HazardView(
+                self._adjacent_counts,
+                self.grid_width,
+                self.grid_height,
+                self._hazard_total,
+            )
+        return self._hazard_locations
+
+    @hazard_locations.setter
+    def hazard_locations(self, locations: Iterable[Tuple[int, int]]) -> None:
+        width, height = self.grid_width, self.grid_height
+        positions = set()
+        for x, y in locations:
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"Hazard position ({x}, {y}) is outside the grid.")
+            positions.add(y * width + x)
+        self._set_hazards(positions)
+        self._history.clear()
+
+    def move_hazards(
+        self,
+        removed: Iterable[Tuple[int, int]],
+        added: Iterable[Tuple[int, int]],
+    ) -> None:
+        """
+        Move hazards between unscanned areas without rebuilding the board.
+
+        Only the counts around the moved hazards are updated. As no scanned
+        area changes, the recorded actions stay valid; undone actions are
+        dropped, since redoing them could reveal areas that changed.
+
+        Args:
+            removed: Positions of the hazards to remove
+            added: Positions of the new hazards
+
+        Raises:
+            ValueError: If a removed area is no hazard, an added area is a
+                hazard or outside the grid, or a moved hazard or one of its
+                neighbors has been scanned or triggered
+        """
+        width, height = self.grid_width, self.grid_height
+        counts = self._adjacent_counts
+        removed, added = set(removed), set(added)
+        for x, y in removed | added:
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"Hazard position ({x}, {y}) is outside the grid.")
+            if bool(counts[y * width + x] & HAZARD_FLAG) != ((x, y) in removed):
+                raise ValueError(f"Hazard position ({x}, {y}) cannot be moved.")
+            for ny in range(max(y - 1, 0), min(y + 2, height)):
+                for nx in range(max(x - 1, 0), min(x + 2, width)):
+                    area = ny * width + nx
+                    if self._is_scanned(area) or counts[area] & TRIGGERED_FLAG:
+                        raise ValueError(f"Area ({nx}, {ny}) has been revealed.")
+        move_hazards(
+            counts,
+            width,
+            height,
+            [y * width + x for x, y in removed],
+            [y * width + x for x, y in added],
+        )
+        self._hazard_total += len(added) - len(removed)
+        if not self.compact and not isinstance(counts, SparseCounts):
+            self._hazard_locations = self._hazard_locations - removed | added
+        self._history.drop_redo()
+
+    @property
+    def scanned_areas(self) -> AbstractSet[Tuple[int, int]]:
+        """
+        Positions of all scanned areas.
+        """
+        if self.compact:
+            return ScannedView(self._scanned_bits, self.grid_width, self.grid_height)
+        return self._scanned_areas
+
+    @property
+    def sparse_index(self) -> bool:
+        """
+        Whether the hazards are stored in a sparse index instead of a dense
+        count table.
+        """
+        return isinstance(self._adjacent_counts, SparseCounts)
+
+    @property
+    def scanned_count(self) -> int:
+        """
+        Number of scanned areas.
+        """
+        return self._scanned_count
+
+    def tables(self) -> Tuple[Table, Table]:
+        """
+        Get the board tables, e.g. to save the game.
+
+        A sparse hazard index is converted to a new dense count table.
+
+        Returns:
+            The adjacency count table and the bitset of scanned areas
+        """
+        counts = self._adjacent_counts
+        if isinstance(counts, SparseCounts):
+            return counts.to_table(), self._scanned_bits
+        return counts, self._scanned_bits
+
+    def _use_sparse_index(self, hazard_total: int) -> bool:
+        """
+        Decide how the hazards of the board are stored.
+
+        Args:
+            hazard_total: Number of hazards on the board
+
+        Returns:
+            True for a sparse index, False for a dense count table
+        """
+        if self.hazard_index == "auto":
+            return use_sparse_index(self.grid_width * self.grid_height, hazard_total)
+        return self.hazard_index == "sparse"
 
     def _place_hazards(self) -> None:
         """
         Place hazards randomly on the game grid.
+
+        Marks random positions directly in the flat count table. On boards
+        with more hazards than safe areas the safe areas are drawn instead,
+        so every placement needs at most two draws on average regardless of
+        the board density. For a sparse index the positions are drawn in the
+        same order, so a seed gives the same board with either index.
         """
-        placed = 0
-        while placed < self.hazard_count:
-            x = random.randint(0, self.grid_width - 1)
-            y = random.randint(0, self.grid_height - 1)
-            position = (x, y)
-            if position not in self.hazard_locations:
-                self.hazard_locations.add(position)
-                placed += 1
+        area_count = self.grid_width * self.grid_height
+        if not 0 <= self.hazard_count <= area_count:
+            raise ValueError("Number of hazards exceeds the number of areas.")
+        dense = self.hazard_count * 2 > area_count
+        sparse = self._use_sparse_index(self.hazard_count)
+        if not dense and sparse:
+            positions: Set[int] = set()
+            while len(positions) < self.hazard_count:
+                positions.add(self._rng.randrange(area_count))
+            self._set_sparse_hazards(positions)
+            return
+        draws = area_count - self.hazard_count if dense else self.hazard_count
+        marks = bytearray(b"\x01") * area_count if dense else bytearray(area_count)
+        mark = 0 if dense else 1
+        randbelow = self._rng.randrange
+        while draws:
+            position = randbelow(area_count)
+            if marks[position] != mark:
+                marks[position] = mark
+                draws -= 1
+        if sparse:
+            self._set_sparse_hazards(set(find_all(marks, 1)))
+        else:
+            self._set_hazard_marks(marks)
+
+    def _set_hazards(self, positions: Set[int]) -> None:
+        """
+        Mark hazards in the count table and precompute all adjacency counts,
+        or store them in a sparse index.
+
+        Args:
+            positions: Flat indices (y * width + x) of the hazards
+        """
+        if self._use_sparse_index(len(positions)):
+            self._set_sparse_hazards(positions)
+            return
+        marks = bytearray(self.grid_width * self.grid_height)
+        for position in positions:
+            marks[position] = 1
+        self._set_hazard_marks(marks)
+
+    def _set_sparse_hazards(self, positions: Set[int]) -> None:
+        """
+        Store the hazards in a sparse index.
+
+        Args:
+            positions: Flat indices (y * width + x) of the hazards
+        """
+        self._adjacent_counts = SparseCounts(
+            self.grid_width, self.grid_height, positions
+        )
+        self._hazard_total = len(positions)
+
+    def _set_hazard_marks(self, marks: bytearray) -> None:
+        """
+        Fill the count table from a table with one byte per area, 1 for
+        hazards and 0 otherwise.
+
+        Args:
+            marks: Hazard marks, row by row
+        """
+        width = self.grid_width
+        self._adjacent_counts = dense_counts(marks, width, self.grid_height)
+        self._hazard_total = marks.count(1)
+        if not self.compact:
+            self._hazard_locations = frozenset(
+                (position % width, position // width) for position in find_all(marks, 1)
+            )
 
     def _count_adjacent_hazards(self, x: int, y: int) -> int:
         """
@@ -70,20 +483,10 @@ class AbandonedSpaceStation:
         Returns:
             Number of adjacent hazards
         """
-        if (x, y) in self.hazard_locations:
+        if not (0 <= x < self.grid_width and 0 <= y < self.grid_height):
             return 0
-
-        hazard_count = 0
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                nx, ny = x + dx, y + dy
-                if (dx == 0 and dy == 0) or not (
-                    0 <= nx < self.grid_width and 0 <= ny < self.grid_height
-                ):
-                    continue
-                if (nx, ny) in self.hazard_locations:
-                    hazard_count += 1
-        return hazard_count
+        count = self._adjacent_counts[y * self.grid_width + x]
+        return 0 if count & HAZARD_FLAG else count
 
     def count_adjacent_hazards(self, x: int, y: int) -> int:
         """
@@ -98,6 +501,77 @@ class AbandonedSpaceStation:
         """
         return self._count_adjacent_hazards(x, y)
 
+    def _is_scanned(self, index: int) -> bool:
+        """
+        Check whether an area has already been scanned.
+
+        Args:
+            index: Flat index of the area
+
+        Returns:
+            True if the area has been scanned
+        """
+        return bool(self._scanned_bits[index >> 3] & (1 << (index & 7)))
+
+    def _mark_scanned(self, index: int, adjacent: int) -> None:
+        """
+        Record a scanned safe area.
+
+        Args:
+            index: Flat index of the area
+            adjacent: Number of adjacent hazards
+        """
+        self._scanned_bits[index >> 3] |= 1 << (index & 7)
+        self._scanned_count += 1
+        if not self.compact:
+            y, x = divmod(index, self.grid_width)
+            self._grid[y][x] = str(adjacent)
+            self._scanned_areas.add((x, y))
+
+    def _trigger_hazard(self, index: int) -> None:
+        """
+        Record a triggered hazard and end the game.
+
+        Args:
+            index: Flat index of the hazard
+        """
+        self._adjacent_counts[index] |= TRIGGERED_FLAG
+        if not self.compact:
+            y, x = divmod(index, self.grid_width)
+            self._grid[y][x] = "H"
+        self.is_defeated = True
+
+    def _notify_move(self, action: str, x: int, y: int, safe: bool) -> None:
+        """
+        Pass a finished action on to all move listeners.
+
+        Args:
+            action: "scan" or "reveal"
+            x: X-coordinate
+            y: Y-coordinate
+            safe: False if a hazard was triggered
+        """
+        for listener in self.move_listeners:
+            listener(action, x, y, safe)
+
+    def _reject(
+        self, action: str, x: Optional[int], y: Optional[int], reason: str
+    ) -> None:
+        """
+        Pass a rejected input on to all rejection listeners and, for a
+        verbose game, print why a scan was rejected.
+
+        Args:
+            action: "scan", "reveal" or "input"
+            x: X-coordinate or None
+            y: Y-coordinate or None
+            reason: "invalid" or "scanned"
+        """
+        for listener in self.rejection_listeners:
+            listener(action, x, y, reason)
+        if self.verbose and action != "input":
+            print(_REJECTIONS[reason])
+
     def scan_area(self, x: int, y: int) -> bool:
         """
         Scan an area on the game grid.
@@ -110,27 +584,235 @@ class AbandonedSpaceStation:
             True if the scan was successful, False if a hazard was detected
         """
         if not (0 <= x < self.grid_width and 0 <= y < self.grid_height):
-            print("Invalid coordinates. Please try again.")
+            self._reject("scan", x, y, "invalid")
             return True
 
-        if (x, y) in self.scanned_areas:
-            print("This area has already been scanned. Please choose another.")
+        index = y * self.grid_width + x
+        if self._is_scanned(index):
+            self._reject("scan", x, y, "scanned")
             return True
 
         self.action_count += 1
+        state = self.is_defeated << 1 | self.is_victorious
+
+        adjacent = self._adjacent_counts[index]
+        if adjacent & HAZARD_FLAG:
+            self._trigger_hazard(index)
+            if adjacent & TRIGGERED_FLAG:
+                state |= WAS_TRIGGERED
+            self._history.record(index, state | TRIGGERED)
+            self._notify_move("scan", x, y, False)
+            return False
+
+        self._mark_scanned(index, adjacent)
+
+        self.check_victory_condition()
+        self._history.record(index, state)
+        self._notify_move("scan", x, y, True)
+        return True
+
+    def reveal_area(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """
+        Scan an area and automatically reveal connected areas without hazards.
+
+        If the scanned area has no adjacent hazards, all connected areas
+        without adjacent hazards and their numbered border are revealed as
+        well. The whole reveal counts as a single action.
+
+        Args:
+            x: X-coordinate
+            y: Y-coordinate
+
+        Returns:
+            List of revealed areas in reveal order. Contains only the hazard
+            position if a hazard was triggered and is empty if nothing changed
+        """
+        if not (0 <= x < self.grid_width and 0 <= y < self.grid_height):
+            self._reject("reveal", x, y, "invalid")
+            return []
+
+        width = self.grid_width
+        index = y * width + x
+        if self._is_scanned(index):
+            self._reject("reveal", x, y, "scanned")
+            return []
+
+        self.action_count += 1
+        state = self.is_defeated << 1 | self.is_victorious
+
+        counts = self._adjacent_counts
+        if counts[index] & HAZARD_FLAG:
+            if counts[index] & TRIGGERED_FLAG:
+                state |= WAS_TRIGGERED
+            self._trigger_hazard(index)
+            self._history.record(index, state | TRIGGERED)
+            self._notify_move("reveal", x, y, False)
+            return [(x, y)]
+
+        start = len(self._history.revealed)
+        revealed = self._flood_fill(index)
+        self._scanned_count += len(revealed)
+        if not self.compact:
+            grid = self._grid
+            for cx, cy in revealed:
+                grid[cy][cx] = str(counts[cy * width + cx])
+            self._scanned_areas.update(revealed)
 
-        if (x, y) in self.hazard_locations:
-            self.grid[y][x] = "H"
-            self.is_defeated = True
+        self.check_victory_condition()
+        self._history.record(start, state | REVEALED)
+        self._notify_move("reveal", x, y, True)
+        return revealed
+
+    def _flood_fill(self, start: int) -> List[Tuple[int, int]]:
+        """
+        Mark a safe area and all areas reachable over areas without adjacent
+        hazards as scanned.
+
+        Uses an explicit queue so the size of the region is not limited by
+        the recursion limit. The marked areas are added to the change log.
+
+        Args:
+            start: Flat index of a safe, unscanned area
+
+        Returns:
+            List of marked areas in reveal order
+        """
+        width, height = self.grid_width, self.grid_height
+        counts = self._adjacent_counts
+        bits = self._scanned_bits
+        changed = self._history.revealed.append
+        revealed: List[Tuple[int, int]] = []
+        queue = deque([start])
+        bits[start >> 3] |= 1 << (start & 7)
+        while queue:
+            index = queue.popleft()
+            changed(index)
+            cy, cx = divmod(index, width)
+            revealed.append((cx, cy))
+            if counts[index]:
+                continue
+            for ny in range(max(cy - 1, 0), min(cy + 2, height)):
+                row = ny * width
+                for nx in range(max(cx - 1, 0), min(cx + 2, width)):
+                    index = row + nx
+                    if not bits[index >> 3] & (1 << (index & 7)):
+                        bits[index >> 3] |= 1 << (index & 7)
+                        queue.append(index)
+        return revealed
+
+    def undo(self) -> bool:
+        """
+        Take back the last action.
+
+        Only the areas changed by the action are touched, so undoing costs
+        as much as the action itself. Move listeners are not notified, so
+        games recorded by a journal raise a RuntimeError instead.
+
+        Returns:
+            True if an action was taken back, False if there was none
+        """
+        if self.journals:
+            raise RuntimeError("A game recorded by a journal cannot undo actions.")
+        change = self._history.undo()
+        if change is None:
             return False
+        action, areas = change
+        width = self.grid_width
+        if action & TRIGGERED:
+            if not action & WAS_TRIGGERED:
+                index = action >> FLAG_BITS
+                self._adjacent_counts[index] &= ~TRIGGERED_FLAG
+                if not self.compact:
+                    y, x = divmod(index, width)
+                    self._grid[y][x] = "?"
+        else:
+            bits = self._scanned_bits
+            for index in areas:
+                bits[index >> 3] &= ~(1 << (index & 7))
+            self._scanned_count -= len(areas)
+            if not self.compact:
+                grid = self._grid
+                scanned_areas = self._scanned_areas
+                for index in areas:
+                    y, x = divmod(index, width)
+                    grid[y][x] = "?"
+                    scanned_areas.discard((x, y))
+        self.action_count -= 1
+        self.is_defeated = bool(action & WAS_DEFEATED)
+        self.is_victorious = bool(action & WAS_VICTORIOUS)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Repeat the last action taken back by undo().
 
-        adjacent = self._count_adjacent_hazards(x, y)
-        self.grid[y][x] = str(adjacent)
-        self.scanned_areas.add((x, y))
+        The recorded changes are applied again without repeating the reveal.
+        Move listeners are not notified, as for undo().
 
+        Returns:
+            True if an action was repeated, False if there was none
+        """
+        if self.journals:
+            raise RuntimeError("A game recorded by a journal cannot redo actions.")
+        change = self._history.redo()
+        if change is None:
+            return False
+        action, areas = change
+        if action & TRIGGERED:
+            self._trigger_hazard(action >> FLAG_BITS)
+        else:
+            width = self.grid_width
+            counts = self._adjacent_counts
+            bits = self._scanned_bits
+            for index in areas:
+                bits[index >> 3] |= 1 << (index & 7)
+            self._scanned_count += len(areas)
+            if not self.compact:
+                grid = self._grid
+                scanned_areas = self._scanned_areas
+                for index in areas:
+                    y, x = divmod(index, width)
+                    grid[y][x] = str(counts[index])
+                    scanned_areas.add((x, y))
+        self.action_count += 1
         self.check_victory_condition()
         return True
 
+    def snapshot(self) -> Snapshot:
+        """
+        Mark the current state so it can be restored later.
+
+        A snapshot is only a position in the change log, so taking one costs
+        O(1) regardless of the board size.
+
+        Returns:
+            The snapshot
+        """
+        return self._history.snapshot()
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Return to the state of a snapshot by undoing or redoing actions.
+
+        Costs O(areas changed between the snapshot and the current state).
+        Undone actions are kept for redo(), so a snapshot of a later state
+        can be restored as well. A snapshot becomes invalid once an action
+        it contains has been undone and a different action has been made,
+        or the hazards have been replaced.
+
+        Args:
+            snapshot: Snapshot taken by snapshot() on this game
+
+        Raises:
+            ValueError: If the snapshot is not valid for this game any more
+        """
+        history = self._history
+        position = history.position(snapshot)
+        while len(history) > position:
+            self.undo()
+        while len(history) < position:
+            self.redo()
+
     def check_victory_condition(self) -> bool:
         """
         Check if all safe areas have been scanned and update victory status.
@@ -138,65 +820,105 @@ class AbandonedSpaceStation:
         Returns:
             True if the game is won, False otherwise
         """
-        safe_area_count = (self.grid_width * self.grid_height) - len(
-            self.hazard_locations
-        )
-        if len(self.scanned_areas) >= safe_area_count:
+        safe_area_count = (self.grid_width * self.grid_height) - self._hazard_total
+        if self._scanned_count >= safe_area_count:
             self.is_victorious = True
             return True
         return False
 
-    def display_grid(self, debug: bool = False) -> None:
+    def _grid_rows(
+        self, debug: bool = False, viewport: Optional[Viewport] = None
+    ) -> List[str]:
         """
-        Display the current game grid.
+        Get the current game grid as one string per row.
+
+        With a viewport, only the visible window is read, so the cost does
+        not depend on the size of the grid.
 
         Args:
             debug: Shows hazards in debug mode when True
+            viewport: Visible window of the grid (default: the whole grid)
+
+        Returns:
+            List of rows with one character per area
         """
-        print("   ", end="")
-        for x in range(self.grid_width):
-            print(f" {x} ", end="")
-        print("\n   ", end="")
-        print("---" * self.grid_width)
+        if viewport is None:
+            left, top = 0, 0
+            rows = ["".join(row) for row in self.grid]
+        else:
+            left, top = viewport.left, viewport.top
+            right = left + viewport.width
+            rows = [
+                "".join(row[left:right])
+                for row in self.grid[top : top + viewport.height]
+            ]
+        if debug:
+            width = self.grid_width
+            for y, row in enumerate(rows, top):
+                start = y * width + left
+                cells = self._adjacent_counts[start : start + len(row)]
+                rows[y - top] = "".join(
+                    "H" if value & HAZARD_FLAG else cell
+                    for cell, value in zip(row, cells)
+                )
+        return rows
 
-        for y in range(self.grid_height):
-            print(f"{y} |", end="")
-            for x in range(self.grid_width):
-                if debug and (x, y) in self.hazard_locations:
-                    print(" H ", end="")
-                else:
-                    print(f" {self.grid[y][x]} ", end="")
-            print()
-        print()
+    def display_grid(
+        self, debug: bool = False, viewport: Optional[Viewport] = None
+    ) -> None:
+        """
+        Display the current game grid.
 
-    def play(self) -> None:
+        Args:
+            debug: Shows hazards in debug mode when True
+            viewport: Visible window of the grid (default: the whole grid)
+        """
+        rows = self._grid_rows(debug, viewport)
+        if viewport is None:
+            print("\n".join(format_grid(rows)))
+        else:
+            print("\n".join(format_grid(rows, viewport.left, viewport.top)))
+
+    def play(self, viewport: Optional[Viewport] = None) -> None:
         """
         Start the game and manage the game flow.
+
+        The instructions are shown above the grid if both fit into the
+        terminal. Otherwise a short header is shown instead, and grids that
+        still do not fit are shown through a viewport that can be scrolled
+        and moved to any area.
+
+        Args:
+            viewport: Visible window of the grid (default: fitted to the
+                terminal if the grid does not fit into it)
         """
-        clear_terminal()
-        print("\n" + "=" * 40)
-        print("  Abandoned Space Station")
-        print("=" * 40)
-        print("\nWelcome to the derelict space station!")
-        print("Your mission is to scan all safe areas,")
-        print("without triggering any hazards.")
-        print("\nInstructions:")
-        print("- ? = Unexplored area")
-        print("- 0-8 = Number of adjacent hazards")
-        print("- H = Hazard (Game Over)")
-        print("\nEnter coordinates in the format 'x y' (e.g. '2 3')")
-        print("Enter 'q' to quit the game.")
-        print("=" * 40 + "\n")
+        size = self.grid_width, self.grid_height
+        header, viewport = fit_screen(
+            *size, terminal_size(sys.stdout), (_INTRO, _VIEWPORT_INTRO), viewport
+        )
+        scrolling = header is _VIEWPORT_INTRO
+        renderer = TerminalRenderer(header=header)
+        render = renderer.render
+        parse = process_coordinates
+        if self.instrumentation is not None:
+            render = self.instrumentation.wrap("render", render)
+            parse = self.instrumentation.wrap("process_coordinates", parse)
 
         while not (self.is_defeated or self.is_victorious):
-            self.display_grid()
+            render(self._grid_rows(viewport=viewport), viewport.left, viewport.top)
             while True:
                 input_value = input("Enter coordinates (x y) or 'q' to quit: ").strip()
-                success, coordinates, error_message = process_coordinates(
+                if scrolling and viewport.command(input_value, parse):
+                    render(
+                        self._grid_rows(viewport=viewport), viewport.left, viewport.top
+                    )
+                    continue
+                success, coordinates, error_message = parse(
                     input_value, self.grid_width, self.grid_height
                 )
                 if not success:
                     print(error_message)
+                    self._reject("input", None, None, "invalid")
                     continue
                 if input_value.lower() == "q":
                     print("\nGame terminated. Goodbye!")
@@ -207,16 +929,16 @@ class AbandonedSpaceStation:
                 break
 
             x, y = coordinates
+            viewport.show(x, y)
             success = self.scan_area(x, y)
             if not success:
                 break
 
-            clear_terminal()
             self.check_victory_condition()
             if self.is_victorious:
                 break
 
-        self.display_grid()
+        render(self._grid_rows(viewport=viewport), viewport.left, viewport.top)
         if self.is_defeated:
             print("\nALERT! You've triggered a hazard.")
             print("GAME OVER - The station has claimed another explorer.")
@@ -226,24 +948,49 @@ class AbandonedSpaceStation:
 
         self._show_statistics()
 
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Get the game statistics.
+
+        Returns:
+            Grid size, hazards, scanned and safe areas, completion, actions
+            and, if enabled, the instrumentation measurements
+        """
+        safe_areas = self.grid_width * self.grid_height - self._hazard_total
+        statistics: Dict[str, Any] = {
+            "grid_width": self.grid_width,
+            "grid_height": self.grid_height,
+            "hazards": self._hazard_total,
+            "scanned_areas": self._scanned_count,
+            "safe_areas": safe_areas,
+            "completion_percent": (
+                (self._scanned_count / safe_areas) * 100 if safe_areas > 0 else 0
+            ),
+            "actions": self.action_count,
+        }
+        if self.instrumentation is not None:
+            statistics["instrumentation"] = self.instrumentation.as_dict()
+        return statistics
+
     def _show_statistics(self) -> None:
         """
         Display game statistics after the game ends.
         """
-        total_areas = self.grid_width * self.grid_height
-        safe_areas = total_areas - len(self.hazard_locations)
-        completion_percent = (
-            (len(self.scanned_areas) / safe_areas) * 100 if safe_areas > 0 else 0
-        )
+        statistics = self.statistics()
 
         print("\n" + "-" * 40)
         print("MISSION STATISTICS")
         print("-" * 40)
         print(f"Grid size: {self.grid_width}x{self.grid_height}")
-        print(f"Number of hazards: {len(self.hazard_locations)}")
+        print(f"Number of hazards: {statistics['hazards']}")
         print(
-            f"Areas scanned: {len(self.scanned_areas)} of {safe_areas} "
-            f"({completion_percent:.1f}%)"
+            f"Areas scanned: {statistics['scanned_areas']} of "
+            f"{statistics['safe_areas']} ({statistics['completion_percent']:.1f}%)"
         )
         print(f"Total actions: {self.action_count}")
+        if self.instrumentation is not None:
+            print("-" * 40)
+            print("PERFORMANCE")
+            for line in self.instrumentation.format_lines():
+                print(line)
         print("-" * 40)
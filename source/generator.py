@@ -0,0 +1,365 @@
+"""
+No-guess board generator for the game 'Abandoned Space Station'.
+
+Generates boards that the constraint solver can clear from a given start
+area without a single guess. Instead of rejecting an unsolvable board and
+drawing a new one, the generator repairs it locally: whenever the solver
+gets stuck, a hazard on the undecided border of the opened region is moved
+to an area the solver has not reached yet. Game and solver then return to
+the state before the first move that revealed an area next to a moved
+hazard and continue from there, so a repair only replays the moves it
+affects. Boards can be generated in parallel by a pool of worker processes.
+"""
+
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation, Snapshot
+from exam.source.solver import UNKNOWN, ConstraintSolver
+
+
+@dataclass
+class NoGuessBoard:
+    """
+    A board that can be solved without guessing from its start area.
+    """
+
+    grid_width: int
+    grid_height: int
+    start: Tuple[int, int]
+    hazards: List[Tuple[int, int]] = field(default_factory=list)
+    repairs: int = 0
+    restarts: int = 0
+
+    def game(
+        self, *, compact: bool = False, verbose: bool = True
+    ) -> AbandonedSpaceStation:
+        """
+        Create a game with the hazards of this board.
+
+        Args:
+            compact: Create the game in compact mode (default: False)
+            verbose: Print messages for rejected scans (default: True)
+
+        Returns:
+            The new game, nothing scanned yet
+        """
+        game = AbandonedSpaceStation(
+            self.grid_width, self.grid_height, 0, compact=compact, verbose=verbose
+        )
+        game.hazard_locations = set(self.hazards)
+        game.hazard_count = len(self.hazards)
+        return game
+
+
+def _neighborhood(index: int, width: int, height: int) -> List[int]:
+    """
+    Get the flat indices of an area and all its neighbors.
+
+    Args:
+        index: Flat index of the area
+        width: Width of the game grid
+        height: Height of the game grid
+
+    Returns:
+        Flat indices of the area and its neighbors
+    """
+    y, x = divmod(index, width)
+    return [
+        row + nx
+        for row in range(max(y - 1, 0) * width, min(y + 2, height) * width, width)
+        for nx in range(max(x - 1, 0), min(x + 2, width))
+    ]
+
+
+class _Attempt:
+    """
+    A board being solved from its start area, with the states of game and
+    solver before every move.
+
+    Moving hazards returns game and solver to the state before the first
+    move that revealed an area next to a moved hazard. The numbers of all
+    areas revealed before are unchanged, so the deductions made from them
+    stay valid and solving continues from there.
+    """
+
+    def __init__(self, width: int, height: int, hazards: Set[int], start: int) -> None:
+        """
+        Initialize a new attempt, nothing revealed yet.
+
+        Args:
+            width: Width of the game grid
+            height: Height of the game grid
+            hazards: Flat indices of the hazards
+            start: Flat index of the start area
+        """
+        self.game = AbandonedSpaceStation(width, height, 0, verbose=False)
+        self.game.hazard_locations = {
+            (index % width, index // width) for index in hazards
+        }
+        self.solver = ConstraintSolver(self.game)
+        self.start = start
+        # Snapshots of game and solver before every move and the move that
+        # last revealed every area.
+        self._moves: List[Tuple[Snapshot, int]] = []
+        self._revealed_by = array("q", [0]) * (width * height)
+
+    def solve(self) -> bool:
+        """
+        Play the start area and then safe moves until no safe move is left.
+
+        Returns:
+            True if the board was cleared
+        """
+        game, solver = self.game, self.solver
+        width = game.grid_width
+        move: Optional[Tuple[int, int]] = divmod(self.start, width)[::-1]
+        while not game.is_victorious:
+            if self._moves:
+                move = solver.next_safe_move()
+            if move is None:
+                return False
+            self._moves.append((game.snapshot(), solver.snapshot()))
+            revealed = game.reveal_area(*move)
+            solver.update(revealed)
+            for x, y in revealed:
+                self._revealed_by[y * width + x] = len(self._moves) - 1
+        return True
+
+    def move_hazards(self, removed: List[int], added: List[int]) -> None:
+        """
+        Move hazards and return to the last state they do not affect.
+
+        Args:
+            removed: Flat indices of the hazards to remove
+            added: Flat indices of the new hazards
+        """
+        width, height = self.game.grid_width, self.game.grid_height
+        scanned = self.game.scanned_areas
+        first = len(self._moves)
+        for index in (*removed, *added):
+            for area in _neighborhood(index, width, height):
+                if (area % width, area // width) in scanned:
+                    first = min(first, self._revealed_by[area])
+        if first < len(self._moves):
+            game_snapshot, solver_snapshot = self._moves[first]
+            del self._moves[first:]
+            self.game.restore(game_snapshot)
+            self.solver.restore(solver_snapshot)
+        self.game.move_hazards(
+            [(index % width, index // width) for index in removed],
+            [(index % width, index // width) for index in added],
+        )
+
+
+def _repair(
+    solver: ConstraintSolver, hazards: Set[int], protected: Set[int], rng: random.Random
+) -> Optional[Tuple[List[int], List[int]]]:
+    """
+    Move the undecided hazards next to the opened region out of the way.
+
+    The hazards on the undecided border are moved to undecided areas away
+    from the border, as many as there are such areas, so the numbers the
+    solver got stuck on change while the rest of the board stays as it is.
+    If no such area is left, a single hazard is moved into the region that
+    has already been solved instead.
+    If the undecided areas are enclosed by known hazards, one of these is
+    moved.
+
+    Args:
+        solver: The stuck solver
+        hazards: Flat indices of the hazards, updated in place
+        protected: Areas that must stay free of hazards
+        rng: Random generator
+
+    Returns:
+        The removed and the added hazards or None if no hazard can be moved
+    """
+    width, height = solver.grid_width, solver.grid_height
+    state = solver.state
+    border: Set[int] = set()
+    for index in solver.active:
+        border.update(
+            neighbor
+            for neighbor in _neighborhood(index, width, height)
+            if state[neighbor] == UNKNOWN
+        )
+    if not border:
+        # The undecided areas are enclosed by known hazards.
+        border = {
+            index
+            for index in solver.known_hazards
+            if any(
+                state[neighbor] == UNKNOWN
+                for neighbor in _neighborhood(index, width, height)
+            )
+        }
+    sources = sorted(border & hazards)
+    candidates = [
+        index
+        for index in range(width * height)
+        if index not in border and index not in hazards and index not in protected
+    ]
+    targets = [index for index in candidates if state[index] == UNKNOWN]
+    moves = min(len(sources), len(targets))
+    if not moves:
+        targets = candidates
+        moves = min(len(sources), len(targets), 1)
+    if not moves:
+        return None
+    removed = rng.sample(sources, moves)
+    added = rng.sample(targets, moves)
+    hazards.difference_update(removed)
+    hazards.update(added)
+    return removed, added
+
+
+def generate_board(  # pylint: disable=too-many-arguments
+    grid_width: int,
+    grid_height: int,
+    hazard_count: int,
+    start: Optional[Tuple[int, int]] = None,
+    *,
+    seed: Optional[int] = None,
+    max_repairs: Optional[int] = None,
+) -> NoGuessBoard:
+    """
+    Generate a board that can be solved without guessing.
+
+    The start area and its neighbors stay free of hazards, so the first scan
+    always opens a region. If a board cannot be repaired any more, e.g. when
+    the last undecided areas are all enclosed, a new random board is drawn.
+
+    Args:
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazard_count: Number of hazards on the game grid
+        start: Coordinates of the first scan (default: center of the grid)
+        seed: Seed for reproducible boards (default: random)
+        max_repairs: Repairs per board before a new board is drawn, 0
+            rejects every unsolvable board (default: one per hazard)
+
+    Returns:
+        The generated board
+    """
+    if start is None:
+        start = (grid_width // 2, grid_height // 2)
+    start_index = start[1] * grid_width + start[0]
+    protected = set(_neighborhood(start_index, grid_width, grid_height))
+    free = [
+        index for index in range(grid_width * grid_height) if index not in protected
+    ]
+    if not 0 <= hazard_count <= len(free):
+        raise ValueError("Too many hazards for a board without guessing.")
+    if max_repairs is None:
+        max_repairs = max(hazard_count, 1)
+    rng = random.Random(seed)
+    board = NoGuessBoard(grid_width, grid_height, start)
+
+    while True:
+        hazards = set(rng.sample(free, hazard_count))
+        attempt = _Attempt(grid_width, grid_height, hazards, start_index)
+        for repair in range(max_repairs + 1):
+            if attempt.solve():
+                board.hazards = sorted(
+                    (index % grid_width, index // grid_width) for index in hazards
+                )
+                return board
+            if repair == max_repairs:
+                break
+            moved = _repair(attempt.solver, hazards, protected, rng)
+            if moved is None:
+                break
+            attempt.move_hazards(*moved)
+            board.repairs += 1
+        board.restarts += 1
+
+
+def _generate_batch(
+    task: Tuple[int, int, int, int, Optional[Tuple[int, int]], int],
+) -> List[NoGuessBoard]:
+    """
+    Generate a batch of boards in a worker.
+
+    Args:
+        task: Number of boards, grid width, grid height, hazard count, start
+            area and batch seed
+
+    Returns:
+        The generated boards
+    """
+    boards, grid_width, grid_height, hazard_count, start, seed = task
+    rng = random.Random(seed)
+    return [
+        generate_board(
+            grid_width, grid_height, hazard_count, start, seed=rng.getrandbits(64)
+        )
+        for _ in range(boards)
+    ]
+
+
+def generate_boards(  # pylint: disable=too-many-arguments
+    count: int,
+    grid_width: int,
+    grid_height: int,
+    hazard_count: int,
+    start: Optional[Tuple[int, int]] = None,
+    *,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> List[NoGuessBoard]:
+    """
+    Generate a number of boards that can be solved without guessing.
+
+    The boards are split into batches with their own seeds derived from
+    ``seed``, like the batches of the simulation engine. With a fixed batch
+    size the boards therefore do not depend on the number of workers.
+
+    Args:
+        count: Number of boards
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazard_count: Number of hazards on the game grid
+        start: Coordinates of the first scan (default: center of the grid)
+        seed: Seed for reproducible boards (default: random)
+        workers: Number of worker processes, 1 runs in the calling process
+            (default: number of CPUs)
+        batch_size: Boards per batch (default: four batches per worker)
+
+    Returns:
+        The generated boards
+    """
+    workers = workers or os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = max(1, math.ceil(count / (workers * 4)))
+    seeds = random.Random(seed)
+    tasks = [
+        (
+            min(batch_size, count - first),
+            grid_width,
+            grid_height,
+            hazard_count,
+            start,
+            seeds.getrandbits(64),
+        )
+        for first in range(0, count, batch_size)
+    ]
+
+    boards: List[NoGuessBoard] = []
+    if workers == 1:
+        for task in tasks:
+            boards.extend(_generate_batch(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch in executor.map(_generate_batch, tasks):
+                boards.extend(batch)
+    return boards
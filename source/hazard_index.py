@@ -0,0 +1,319 @@
+"""
+Hazard index for the game 'Abandoned Space Station'.
+
+The game reads hazards and adjacency counts through an index with the
+interface of the flat count table. Dense boards use the table itself, one
+byte per area. Large sparse boards use a SparseCounts index instead: a hash
+set of packed area keys (y * width + x) holding only the hazards, with the
+counts computed on demand and kept in an LRU cache. The game picks the
+representation with use_sparse_index() when the hazards are placed.
+"""
+
+import functools
+import os
+import sys
+from collections.abc import Set as AbstractSet
+from typing import TYPE_CHECKING, Iterable, Iterator, Set, Tuple, Union, overload
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.views import HAZARD_FLAG, TRIGGERED_FLAG
+
+if TYPE_CHECKING:
+    # Only needed for type hints; views.py refers to this module for them.
+    from exam.source.views import Counts
+
+# Boards with fewer areas always use the dense table: it needs at most this
+# many bytes, which is not worth a slower index.
+SPARSE_MIN_AREAS = 1 << 22
+# Memory used per hazard by the sparse index (key object and hash set slot),
+# as measured by benchmarks/hazard_index_benchmark.py. Above one hazard per
+# this many areas the dense table with one byte per area is smaller.
+SPARSE_BYTES_PER_HAZARD = 80
+# Computed counts kept by a sparse index, e.g. the areas of the viewport.
+COUNT_CACHE_SIZE = 1 << 14
+# Areas per band when computing the adjacency counts of large boards, which
+# bounds the size of the integers used for the computation.
+_BAND_AREAS = 1 << 20
+
+
+def use_sparse_index(area_count: int, hazard_count: int) -> bool:
+    """
+    Decide whether a board is stored more compactly in a sparse index.
+
+    Args:
+        area_count: Number of areas of the board
+        hazard_count: Number of hazards on the board
+
+    Returns:
+        True if the sparse index needs less memory than the dense table on
+        a board large enough for the difference to matter
+    """
+    return (
+        area_count >= SPARSE_MIN_AREAS
+        and hazard_count * SPARSE_BYTES_PER_HAZARD < area_count
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _column_masks(width: int, rows: int) -> Tuple[int, int]:
+    """
+    Get masks that clear the first or the last column of a band of rows.
+
+    Args:
+        width: Width of the game grid
+        rows: Number of rows in the band
+
+    Returns:
+        Masks with a 0xFF byte per area, except for the first respectively
+        the last area of every row
+    """
+    if not width:
+        return 0, 0
+    not_first = int.from_bytes((b"\x00" + b"\xff" * (width - 1)) * rows, "little")
+    not_last = int.from_bytes((b"\xff" * (width - 1) + b"\x00") * rows, "little")
+    return not_first, not_last
+
+
+def find_all(data: bytearray, value: int) -> Iterator[int]:
+    """
+    Find all positions of a byte value.
+
+    Args:
+        data: The bytes to search
+        value: The byte value to find
+
+    Returns:
+        Iterator over the positions in ascending order
+    """
+    position = data.find(value)
+    while position != -1:
+        yield position
+        position = data.find(value, position + 1)
+
+
+def dense_counts(marks: bytearray, width: int, height: int) -> bytearray:
+    """
+    Build the dense count table from a table with one byte per area, 1 for
+    hazards and 0 otherwise.
+
+    Each band of rows is read as one large integer with a byte per
+    area. Adding the copies shifted by one area and by one row sums the
+    3x3 neighborhood of every area at once, with each sum staying
+    within its byte. Hazard areas carry a flag on top of a count, which
+    for them includes the hazard itself.
+
+    Args:
+        marks: Hazard marks, row by row
+        width: Width of the game grid
+        height: Height of the game grid
+
+    Returns:
+        The count table with one byte per area
+    """
+    counts = bytearray(width * height)
+    row_bits = width * 8
+    band = max(1, _BAND_AREAS // max(width, 1))
+    not_first, not_last = _column_masks(width, band + 2)
+    for first in range(0, height, band):
+        last = min(first + band, height)
+        top = max(first - 1, 0)
+        hazards = int.from_bytes(
+            marks[top * width : min(last + 1, height) * width], "little"
+        )
+        # Sum each row with its left and right neighbors, then each of
+        # these sums with the rows above and below.
+        totals = hazards + (hazards << 8 & not_first) + (hazards >> 8 & not_last)
+        totals += (totals << row_bits) + (totals >> row_bits)
+        totals += hazards * HAZARD_FLAG
+        totals >>= (first - top) * row_bits
+        size = (last - first) * width
+        counts[first * width : last * width] = (
+            totals & ((1 << size * 8) - 1)
+        ).to_bytes(size, "little")
+    return counts
+
+
+def move_hazards(
+    counts: "Counts",
+    width: int,
+    height: int,
+    removed: Iterable[int],
+    added: Iterable[int],
+) -> None:
+    """
+    Move hazards in a count table or sparse index without rebuilding it.
+
+    Only the counts in the 3x3 neighborhoods of the moved hazards change.
+    The caller makes sure that the removed areas are hazards and the added
+    areas are not.
+
+    Args:
+        counts: The count table or sparse index
+        width: Width of the game grid
+        height: Height of the game grid
+        removed: Flat indices of the hazards to remove
+        added: Flat indices of the new hazards
+    """
+    if isinstance(counts, SparseCounts):
+        counts.move(removed, added)
+        return
+    for indices, step in ((removed, -1), (added, 1)):
+        for index in indices:
+            counts[index] += step * HAZARD_FLAG
+            y, x = divmod(index, width)
+            left, right = max(x - 1, 0), min(x + 2, width)
+            for row in range(max(y - 1, 0) * width, min(y + 2, height) * width, width):
+                for neighbor in range(row + left, row + right):
+                    counts[neighbor] += step
+
+
+class SparseCounts:
+    """
+    Sparse index with the interface of the adjacency count table.
+
+    Reading an area returns the same value as the dense table: the number
+    of hazards in its 3x3 neighborhood, for hazards including the hazard
+    itself and combined with HAZARD_FLAG, plus TRIGGERED_FLAG for triggered
+    hazards. Writing an area only updates the triggered flag, which is the
+    only part of the table that changes during a game.
+    """
+
+    def __init__(self, width: int, height: int, hazards: Iterable[int]) -> None:
+        """
+        Initialize a new sparse index.
+
+        Args:
+            width: Width of the game grid
+            height: Height of the game grid
+            hazards: Flat indices (y * width + x) of the hazards
+        """
+        self.width = width
+        self.height = height
+        self.hazards: Set[int] = set(hazards)
+        self.triggered: Set[int] = set()
+        # The cache is created per index, so it is freed with the board.
+        self._count = functools.lru_cache(maxsize=COUNT_CACHE_SIZE)(self._compute)
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def _compute(self, index: int) -> int:
+        """
+        Compute the table value of an area without the triggered flag.
+
+        Args:
+            index: Flat index of the area
+
+        Returns:
+            The neighborhood count, with HAZARD_FLAG for hazards
+        """
+        hazards = self.hazards
+        width = self.width
+        y, x = divmod(index, width)
+        left, right = max(x - 1, 0), min(x + 2, width)
+        value = HAZARD_FLAG if index in hazards else 0
+        for row in range(max(y - 1, 0), min(y + 2, self.height)):
+            start = row * width
+            for key in range(start + left, start + right):
+                if key in hazards:
+                    value += 1
+        return value
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> bytes: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, bytes]:
+        if isinstance(index, slice):
+            return bytes(self[key] for key in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("count table index out of range")
+        value = self._count(index)
+        if self.triggered and index in self.triggered:
+            value |= TRIGGERED_FLAG
+        return value
+
+    def __setitem__(self, index: int, value: int) -> None:
+        if value & TRIGGERED_FLAG:
+            self.triggered.add(index)
+        else:
+            self.triggered.discard(index)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.to_table())
+
+    def move(self, removed: Iterable[int], added: Iterable[int]) -> None:
+        """
+        Move hazards and drop the cached counts.
+
+        Args:
+            removed: Flat indices of the hazards to remove
+            added: Flat indices of the new hazards
+        """
+        self.hazards.difference_update(removed)
+        self.hazards.update(added)
+        self._count.cache_clear()
+
+    def to_table(self) -> bytearray:
+        """
+        Build the equivalent dense count table.
+
+        Returns:
+            The table with one byte per area
+        """
+        marks = bytearray(len(self))
+        for index in self.hazards:
+            marks[index] = 1
+        table = dense_counts(marks, self.width, self.height)
+        for index in self.triggered:
+            table[index] |= TRIGGERED_FLAG
+        return table
+
+    def locations(self) -> AbstractSet[Tuple[int, int]]:
+        """
+        Get a set view of the hazard positions.
+
+        Returns:
+            The hazard positions as (x, y) tuples
+        """
+        return SparseHazardView(self)
+
+
+class SparseHazardView(AbstractSet):  # type: ignore[type-arg]
+    """
+    Read-only set view of the hazard positions in a sparse index.
+    """
+
+    def __init__(self, counts: SparseCounts) -> None:
+        """
+        Initialize a new hazard view.
+
+        Args:
+            counts: The sparse index
+        """
+        self._hazards = counts.hazards
+        self._width = counts.width
+        self._height = counts.height
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, tuple) or len(position) != 2:
+            return False
+        x, y = position
+        width = self._width
+        return (
+            0 <= x < width and 0 <= y < self._height and y * width + x in self._hazards
+        )
+
+    def __len__(self) -> int:
+        return len(self._hazards)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        width = self._width
+        for index in sorted(self._hazards):
+            y, x = divmod(index, width)
+            yield x, y
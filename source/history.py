@@ -0,0 +1,189 @@
+"""
+Change log for the game 'Abandoned Space Station'.
+
+Records every action of a game with the areas it changed, so actions can be
+undone and redone and a snapshot of the game is just a position in the log.
+The log only keeps the changes; applying them to the board is left to the
+game.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Flags of an action in the change log, stored below the flat index of the
+# scanned area or, for a reveal, the position of its areas in the log of
+# revealed areas: the action revealed several areas, triggered a hazard or
+# triggered a hazard that had already been triggered, and the game was
+# defeated or won before the action.
+REVEALED = 16
+TRIGGERED = 8
+WAS_TRIGGERED = 4
+WAS_DEFEATED = 2
+WAS_VICTORIOUS = 1
+FLAG_BITS = 5
+
+# A recorded action with the flat indices of the areas it changed.
+Change = Tuple[int, Sequence[int]]
+
+
+class Snapshot(NamedTuple):
+    """
+    A position in the change log of a game, taken by snapshot().
+    """
+
+    position: int
+    generation: int
+
+
+class ChangeLog:
+    """
+    Log of the actions of a game and of the actions undone since.
+
+    The log is kept in flat integer arrays, so recording an action creates
+    no objects the garbage collector has to track. Every time undone actions
+    are replaced by a different action, the generation is increased and the
+    first replaced position recorded. Only the truncations that are not
+    followed by one at a lower position are kept, so their positions are
+    ascending and a snapshot is checked with a single bisection.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty change log.
+        """
+        # Flat indices of the areas revealed by all recorded reveals, in
+        # reveal order. The game appends to it while it reveals areas.
+        self.revealed = array("q")
+        self._actions = array("q")
+        self._redo: List[Change] = []
+        self._generation = 0
+        self._truncated_generations: List[int] = []
+        self._truncated_positions: List[int] = []
+
+    def __len__(self) -> int:
+        """
+        Number of recorded actions that have not been undone.
+        """
+        return len(self._actions)
+
+    def record(self, value: int, flags: int) -> None:
+        """
+        Append an action, dropping the actions undone before.
+
+        Args:
+            value: Flat index of the scanned area or, for a reveal, position
+                of the revealed areas in ``revealed``
+            flags: Flags of the action
+        """
+        self.drop_redo()
+        self._actions.append(value << FLAG_BITS | flags)
+
+    def drop_redo(self) -> None:
+        """
+        Forget the undone actions, e.g. after the board changed under them.
+
+        Snapshots of the states after the undone actions become invalid.
+        """
+        if self._redo:
+            self._truncate(len(self._actions))
+
+    def _truncate(self, position: int) -> None:
+        """
+        Drop the undone actions and start a new generation of snapshots.
+
+        Snapshots taken in an earlier generation at a later position become
+        invalid.
+
+        Args:
+            position: Number of actions that are kept
+        """
+        self._redo.clear()
+        self._generation += 1
+        generations = self._truncated_generations
+        positions = self._truncated_positions
+        while positions and positions[-1] >= position:
+            positions.pop()
+            generations.pop()
+        generations.append(self._generation)
+        positions.append(position)
+
+    def clear(self) -> None:
+        """
+        Forget all actions, e.g. after the hazards were replaced.
+
+        Snapshots taken before become invalid.
+        """
+        del self._actions[:]
+        del self.revealed[:]
+        self._truncate(0)
+
+    def undo(self) -> Optional[Change]:
+        """
+        Take the last action off the log and keep it for redo().
+
+        Returns:
+            The action and the areas it changed, or None if there was none
+        """
+        if not self._actions:
+            return None
+        action = self._actions.pop()
+        value = action >> FLAG_BITS
+        areas: Sequence[int] = (value,)
+        if action & REVEALED:
+            areas = self.revealed[value:]
+            del self.revealed[value:]
+        self._redo.append((action, areas))
+        return action, areas
+
+    def redo(self) -> Optional[Change]:
+        """
+        Put the last action taken off by undo() back on the log.
+
+        Returns:
+            The action and the areas it changed, or None if there was none
+        """
+        if not self._redo:
+            return None
+        action, areas = self._redo.pop()
+        if action & REVEALED:
+            # The log of revealed areas ends where it ended before the undo.
+            self.revealed.extend(areas)
+        self._actions.append(action)
+        return action, areas
+
+    def snapshot(self) -> Snapshot:
+        """
+        Mark the current position in the log.
+
+        Returns:
+            The snapshot
+        """
+        return Snapshot(len(self._actions), self._generation)
+
+    def position(self, snapshot: Snapshot) -> int:
+        """
+        Check a snapshot and get its position in the log.
+
+        Args:
+            snapshot: Snapshot taken by snapshot() on this log
+
+        Returns:
+            Number of actions recorded at the snapshot
+
+        Raises:
+            ValueError: If an action the snapshot contains has been replaced
+                or the log has been cleared since
+        """
+        position, generation = snapshot
+        # The first truncation after the snapshot has the lowest position of
+        # all later truncations.
+        later = bisect_right(self._truncated_generations, generation)
+        if (
+            generation > self._generation
+            or position > len(self._actions) + len(self._redo)
+            or later < len(self._truncated_positions)
+            and self._truncated_positions[later] < position
+        ):
+            raise ValueError("The snapshot is not part of this game's history.")
+        return position
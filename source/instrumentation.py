@@ -0,0 +1,253 @@
+"""
+Hot-path instrumentation for the game 'Abandoned Space Station'.
+
+Records latency histograms with perf_counter_ns and, if enabled, the memory
+allocated per move with tracemalloc. Instrumentation is opt-in: a game
+without it runs the unmodified methods, so there is no overhead at all.
+"""
+
+import functools
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, TypeVar
+
+T = TypeVar("T")
+
+# Latencies are counted in buckets of powers of two nanoseconds.
+_BUCKETS = 64
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies in power-of-two buckets.
+
+    Bucket i counts latencies below 2**i nanoseconds that are not counted in
+    a lower bucket, so percentiles are reported as upper bounds within a
+    factor of two. Count, total, minimum and maximum are exact.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty histogram.
+        """
+        self.buckets = [0] * (_BUCKETS + 1)
+        self.count = 0
+        self.total = 0
+        self.minimum = 0
+        self.maximum = 0
+
+    def record(self, value: int) -> None:
+        """
+        Add a measurement.
+
+        Args:
+            value: The measured value, e.g. a latency in nanoseconds
+        """
+        if self.count == 0 or value < self.minimum:
+            self.minimum = value
+        self.maximum = max(self.maximum, value)
+        self.count += 1
+        self.total += value
+        self.buckets[min(max(value, 0).bit_length(), _BUCKETS)] += 1
+
+    @property
+    def mean(self) -> float:
+        """
+        Average of all measurements.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, share: float) -> int:
+        """
+        Get an upper bound of a percentile.
+
+        Args:
+            share: The percentile as a share, e.g. 0.99
+
+        Returns:
+            Upper bound of the bucket holding the percentile, at most the
+            maximum measurement
+        """
+        if not self.count:
+            return 0
+        rank = max(1, round(share * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min((1 << index) - 1, self.maximum)
+        return self.maximum
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Count, mean, minimum, percentiles, maximum and non-empty buckets
+            by their upper bound
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.minimum,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.maximum,
+            "buckets": {
+                (1 << index) - 1: bucket
+                for index, bucket in enumerate(self.buckets)
+                if bucket
+            },
+        }
+
+
+class Instrumentation:
+    """
+    Collects latency histograms of wrapped functions.
+
+    With ``trace_allocations`` the memory allocated by every move is
+    recorded with tracemalloc as well: the net growth of the traced memory
+    and the peak above the memory in use before the move. Tracing is started
+    if it is not running yet and stopped again by stop().
+    """
+
+    def __init__(self, trace_allocations: bool = False) -> None:
+        """
+        Initialize a new instrumentation.
+
+        Args:
+            trace_allocations: Record the memory allocated per move
+                (default: False)
+        """
+        self.trace_allocations = trace_allocations
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.allocated_bytes = LatencyHistogram()
+        self.peak_bytes = LatencyHistogram()
+        self._started_tracing = False
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """
+        Get the latency histogram of an operation, creating it if needed.
+
+        Args:
+            name: Name of the operation
+
+        Returns:
+            The histogram
+        """
+        return self.histograms.setdefault(name, LatencyHistogram())
+
+    def wrap(
+        self, name: str, func: Callable[..., T], move: bool = False
+    ) -> Callable[..., T]:
+        """
+        Wrap a function so every call is timed.
+
+        Args:
+            name: Name of the operation
+            func: The function to wrap
+            move: The function makes a move, record its allocations if
+                allocation tracing is enabled (default: False)
+
+        Returns:
+            The wrapped function
+        """
+        histogram = self.histogram(name)
+        clock = time.perf_counter_ns
+        if move and self.trace_allocations:
+            return self._wrap_move(histogram, func)
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> T:
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(clock() - start)
+
+        return timed
+
+    def _wrap_move(
+        self, histogram: LatencyHistogram, func: Callable[..., T]
+    ) -> Callable[..., T]:
+        """
+        Wrap a move so every call is timed and its allocations are recorded.
+
+        Args:
+            histogram: The latency histogram of the move
+            func: The function to wrap
+
+        Returns:
+            The wrapped function
+        """
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def traced(*args: Any, **kwargs: Any) -> T:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(clock() - start)
+                current, peak = tracemalloc.get_traced_memory()
+                self.allocated_bytes.record(current - before)
+                self.peak_bytes.record(peak - before)
+
+        return traced
+
+    def stop(self) -> None:
+        """
+        Stop allocation tracing if it was started by this instrumentation.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Summarize all measurements.
+
+        Returns:
+            Latency summaries in nanoseconds by operation and, with allocation
+            tracing, the allocation summaries in bytes per move
+        """
+        result: Dict[str, Any] = {
+            "latency_ns": {
+                name: histogram.as_dict() for name, histogram in self.histograms.items()
+            }
+        }
+        if self.trace_allocations:
+            result["allocated_bytes"] = self.allocated_bytes.as_dict()
+            result["peak_bytes"] = self.peak_bytes.as_dict()
+        return result
+
+    def format_lines(self) -> List[str]:
+        """
+        Format the measurements for the statistics screen.
+
+        Returns:
+            One line per operation with at least one measurement
+        """
+        lines = []
+        for name, histogram in self.histograms.items():
+            if histogram.count:
+                lines.append(
+                    f"{name}: {histogram.count} calls, "
+                    f"mean {histogram.mean / 1000:.1f} us, "
+                    f"p50 <= {histogram.percentile(0.5) / 1000:.1f} us, "
+                    f"p99 <= {histogram.percentile(0.99) / 1000:.1f} us, "
+                    f"max {histogram.maximum / 1000:.1f} us"
+                )
+        if self.trace_allocations and self.allocated_bytes.count:
+            lines.append(
+                f"allocations per move: mean {self.allocated_bytes.mean:.0f} B net, "
+                f"mean {self.peak_bytes.mean:.0f} B peak, "
+                f"max {self.peak_bytes.maximum} B peak"
+            )
+        return lines
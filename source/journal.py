@@ -0,0 +1,314 @@
+"""
+Move journal for the game 'Abandoned Space Station'.
+
+Streams every action of a game to an append-only file. Every K actions a
+compressed keyframe of the board is added, so a replay can jump to any move
+by loading the nearest keyframe and replaying at most K actions.
+
+Usage: python source/journal.py <journal file> [move]
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.persistence import PathLike, dump_game, load_dump
+
+MAGIC = b"ASSJ"
+VERSION = 1
+
+# File header: magic, version and keyframe interval.
+_FILE_HEADER = struct.Struct("<4sHI")
+# Move record: record type, safe flag, x, y and timestamp.
+_MOVE = struct.Struct("<BBiid")
+# Keyframe record: record type, number of moves before it and data size.
+_KEYFRAME = struct.Struct("<BQI")
+
+_SCAN = 1
+_REVEAL = 2
+_KEYFRAME_RECORD = 3
+_ACTIONS = {"scan": _SCAN, "reveal": _REVEAL}
+
+
+@dataclass
+class Move:
+    """
+    A recorded action.
+    """
+
+    number: int
+    action: str
+    x: int
+    y: int
+    safe: bool
+    timestamp: float
+
+
+class MoveJournal:
+    """
+    Records the actions of a game in an append-only journal file.
+
+    Registers itself as a move listener of the game, which cannot undo or
+    redo actions while it is recorded. Records are collected in a buffer and
+    written in batches, so the file is not touched on every move. Call
+    close() or use the journal as a context manager to write the remaining
+    records.
+    """
+
+    def __init__(
+        self,
+        game: AbandonedSpaceStation,
+        path: PathLike,
+        keyframe_interval: int = 1000,
+        buffer_size: int = 1 << 16,
+    ) -> None:
+        """
+        Create a journal file and start recording.
+
+        Args:
+            game: The game to record
+            path: Path of the journal file
+            keyframe_interval: Moves between two keyframes (default: 1000)
+            buffer_size: Buffered bytes that trigger a write (default: 64 KiB)
+        """
+        if keyframe_interval < 1:
+            raise ValueError("The keyframe interval must be at least 1.")
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.buffer_size = buffer_size
+        self.moves = 0
+        self._buffer = bytearray()
+        self._file: BinaryIO = open(path, "wb")  # pylint: disable=consider-using-with
+        self._buffer += _FILE_HEADER.pack(MAGIC, VERSION, keyframe_interval)
+        self._add_keyframe()
+        game.move_listeners.append(self.record)
+        game.journals += 1
+
+    def _add_keyframe(self) -> None:
+        """
+        Add a compressed snapshot of the current board to the buffer.
+        """
+        data = zlib.compress(dump_game(self.game), 1)
+        self._buffer += _KEYFRAME.pack(_KEYFRAME_RECORD, self.moves, len(data))
+        self._buffer += data
+
+    def record(self, action: str, x: int, y: int, safe: bool) -> None:
+        """
+        Record an action. Called by the game as a move listener.
+
+        Args:
+            action: "scan" or "reveal"
+            x: X-coordinate
+            y: Y-coordinate
+            safe: False if a hazard was triggered
+        """
+        self._buffer += _MOVE.pack(_ACTIONS[action], safe, x, y, time.time())
+        self.moves += 1
+        if self.moves % self.keyframe_interval == 0:
+            self._add_keyframe()
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all buffered records to the journal file.
+        """
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """
+        Stop recording and close the journal file.
+        """
+        if self._file.closed:
+            return
+        if self.record in self.game.move_listeners:
+            self.game.move_listeners.remove(self.record)
+            self.game.journals -= 1
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "MoveJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class JournalReader:
+    """
+    Reads a journal file and restores the game at any move.
+
+    Keyframes are located by jumping from keyframe to keyframe, which is
+    possible because exactly ``keyframe_interval`` move records lie between
+    two keyframes. A record cut off at the end of the file, e.g. after a
+    crash, is ignored.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        """
+        Open a journal file and index its keyframes.
+
+        Args:
+            path: Path of the journal file
+
+        Raises:
+            ValueError: If the file is not a journal of a supported version
+        """
+        self._file: BinaryIO = open(path, "rb")  # pylint: disable=consider-using-with
+        data = self._file.read(_FILE_HEADER.size)
+        if len(data) < _FILE_HEADER.size or data[:4] != MAGIC:
+            self._file.close()
+            raise ValueError("Not a journal file of the game.")
+        header: Tuple[bytes, int, int] = _FILE_HEADER.unpack(data)
+        _, version, self.keyframe_interval = header
+        if version != VERSION:
+            self._file.close()
+            raise ValueError(f"Unsupported journal version {version}.")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._keyframes: List[Tuple[int, int, int]] = []
+        self._index_keyframes()
+        if not self._keyframes:
+            self._file.close()
+            raise ValueError("Journal file contains no keyframe.")
+
+    def _index_keyframes(self) -> None:
+        """
+        Collect the move number, file offset and data size of every complete
+        keyframe.
+        """
+        offset = _FILE_HEADER.size
+        while offset + _KEYFRAME.size <= self._size:
+            self._file.seek(offset)
+            kind, moves, length = _KEYFRAME.unpack(self._file.read(_KEYFRAME.size))
+            if (
+                kind != _KEYFRAME_RECORD
+                or offset + _KEYFRAME.size + length > self._size
+            ):
+                break
+            self._keyframes.append((moves, offset, length))
+            offset += _KEYFRAME.size + length + self.keyframe_interval * _MOVE.size
+
+    @property
+    def move_count(self) -> int:
+        """
+        Number of complete move records in the journal.
+        """
+        moves, offset, length = self._keyframes[-1]
+        records = (self._size - offset - _KEYFRAME.size - length) // _MOVE.size
+        return moves + min(records, self.keyframe_interval)
+
+    def _read_segment(self, keyframe: int) -> Tuple[bytes, Iterator[Move]]:
+        """
+        Read a keyframe and the move records that follow it.
+
+        Args:
+            keyframe: Index of the keyframe
+
+        Returns:
+            The compressed board data and the moves after the keyframe
+        """
+        moves, offset, length = self._keyframes[keyframe]
+        self._file.seek(offset + _KEYFRAME.size)
+        data = self._file.read(length)
+        records = self._file.read(self.keyframe_interval * _MOVE.size)
+        end = len(records) - len(records) % _MOVE.size
+        return data, (
+            Move(
+                moves + i,
+                "scan" if kind == _SCAN else "reveal",
+                x,
+                y,
+                bool(safe),
+                stamp,
+            )
+            for i, (kind, safe, x, y, stamp) in enumerate(
+                _MOVE.iter_unpack(records[:end]), 1
+            )
+        )
+
+    def moves(self, start: int = 1) -> Iterator[Move]:
+        """
+        Iterate over the recorded moves.
+
+        Args:
+            start: Number of the first move, counting from 1 (default: 1)
+
+        Returns:
+            Iterator over the moves
+        """
+        first = max(bisect_right(self._keyframes, (start - 1, self._size)) - 1, 0)
+        for keyframe in range(first, len(self._keyframes)):
+            for move in self._read_segment(keyframe)[1]:
+                if move.number >= start:
+                    yield move
+
+    def seek(self, move: Optional[int] = None) -> AbandonedSpaceStation:
+        """
+        Restore the game after a move.
+
+        Loads the nearest keyframe before the move and replays the moves
+        after it.
+
+        Args:
+            move: Number of moves to apply (default: all recorded moves)
+
+        Returns:
+            The game in compact mode
+        """
+        if move is None:
+            move = self.move_count
+        keyframe = max(bisect_right(self._keyframes, (move, self._size)) - 1, 0)
+        data, moves = self._read_segment(keyframe)
+        game = load_dump(zlib.decompress(data), verbose=False)
+        for record in moves:
+            if record.number > move:
+                break
+            if record.action == "scan":
+                game.scan_area(record.x, record.y)
+            else:
+                game.reveal_area(record.x, record.y)
+        return game
+
+    def close(self) -> None:
+        """
+        Close the journal file.
+        """
+        self._file.close()
+
+    def __enter__(self) -> "JournalReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def main(argv: List[str]) -> None:
+    """
+    Show the board of a recorded game after a move.
+
+    Args:
+        argv: Path of the journal file and optionally the move number
+    """
+    with JournalReader(argv[0]) as reader:
+        total = reader.move_count
+        move = min(int(argv[1]), total) if len(argv) > 1 else total
+        game = reader.seek(move)
+    print(f"Move {move} of {total}")
+    game.display_grid()
+
+
+if __name__ == "__main__":
+    if not 1 <= len(sys.argv) - 1 <= 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+    main(sys.argv[1:])
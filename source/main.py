@@ -1,16 +1,43 @@
 """
 Abandoned Space Station - A console-based Python game.
 
-Main file to start the game and manage game initialization.
+Main file to start the game and manage game initialization. Without
+arguments the game is played interactively; with arguments scripted moves
+are applied in batch mode. Modules only needed by the batch mode are
+imported when it runs, which keeps the game start fast:
+
+python source/main.py --moves moves.txt [--width W] [--height H]
+[--hazards N] [--seed S] [--log log.jsonl] [--results results.db]
+[--events events.jsonl] [--instrument] [--trace-allocations]
+
+If the environment variable STATION_RESULTS names a database file, every
+interactive game is recorded in it when it ends. If STATION_EVENTS names a
+file, the events of every interactive game are appended to it as JSON lines.
+STATION_INSTRUMENTATION=1 adds latency histograms to the statistics of every
+interactive game, STATION_INSTRUMENTATION=allocations also the memory
+allocated per move.
 """
 
 import sys
 import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple, TYPE_CHECKING
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from exam.source.game import AbandonedSpaceStation
-from exam.source.helpers import clear_terminal
+from exam.source.helpers import clear_terminal, process_coordinates
+
+if TYPE_CHECKING:
+    from contextlib import ExitStack
+
+    from exam.source.events import EventEmitter
+    from exam.source.instrumentation import Instrumentation
+    from exam.source.pool import BoardPool
+    from exam.source.results import ResultStore
+
+# Width, height and hazard count of the default game.
+DEFAULT_CONFIGURATION = (5, 5, 5)
 
 
 def _get_custom_settings() -> tuple[int, int, int]:
@@ -62,13 +89,33 @@ def _get_custom_settings() -> tuple[int, int, int]:
     return grid_width, grid_height, hazards
 
 
-def main() -> None:
+def main(
+    pool: Optional["BoardPool"] = None,
+    results: Optional["ResultStore"] = None,
+    events: Optional["EventEmitter"] = None,
+    instrumentation: Optional["Instrumentation"] = None,
+) -> None:
     """
     Main function to start the game.
+
+    Args:
+        pool: Pool with pre-generated boards. Without a pool or a ready board
+            the game is created directly (default: no pool)
+        results: Store recording the game when it ends (default: none)
+        events: Emitter attached to the game (default: none)
+        instrumentation: Record latencies of the game, which is then always
+            created directly (default: none)
     """
+    options: Dict[str, Any] = {}
+    if instrumentation is not None:
+        # The boards of the pool are built without instrumentation.
+        options["instrumentation"] = instrumentation
+        pool = None
     clear_terminal()
     print("Abandoned Space Station\n")
     game = None
+    # Without custom settings the game is created with its defaults.
+    configuration: Tuple[int, ...] = ()
 
     while True:
         customize_input = (
@@ -80,13 +127,297 @@ def main() -> None:
             break
 
     if customize_input == "y":
-        grid_width, grid_height, hazards = _get_custom_settings()
-        game = AbandonedSpaceStation(grid_width, grid_height, hazards)
-    else:
-        game = AbandonedSpaceStation()
+        configuration = _get_custom_settings()
+    if pool is not None:
+        game = pool.take(*(configuration or DEFAULT_CONFIGURATION))
+    if game is None:
+        game = AbandonedSpaceStation(*configuration, **options)
 
     if game:
+        if events is not None:
+            events.attach(game)
+        start = time.perf_counter()
         game.play()
+        if results is not None:
+            results.record(game, time.perf_counter() - start)
+
+
+def _apply_move(game: AbandonedSpaceStation, line: str) -> Optional[Dict[str, Any]]:
+    """
+    Apply a single scripted move.
+
+    Args:
+        game: The game
+        line: The move in "x y" format
+
+    Returns:
+        The log entry of the move or None if the line asks to quit
+    """
+    success, coordinates, error_message = process_coordinates(
+        line, game.grid_width, game.grid_height
+    )
+    if not success:
+        return {"result": "invalid", "error": error_message}
+    if coordinates is None:
+        return None
+    x, y = coordinates
+    actions = game.action_count
+    game.scan_area(x, y)
+    entry: Dict[str, Any] = {"x": x, "y": y}
+    if game.action_count == actions:
+        entry["result"] = "repeated"
+    elif game.is_defeated:
+        entry["result"] = "hazard"
+    else:
+        entry["result"] = "safe"
+        entry["adjacent"] = game.count_adjacent_hazards(x, y)
+    return entry
+
+
+def run_batch(  # pylint: disable=too-many-arguments
+    grid_width: int,
+    grid_height: int,
+    hazard_count: int,
+    moves: Iterable[str],
+    *,
+    seed: Optional[int] = None,
+    log: Optional[TextIO] = None,
+    results: Optional["ResultStore"] = None,
+    events: Optional["EventEmitter"] = None,
+    instrumentation: Optional["Instrumentation"] = None,
+) -> Dict[str, Any]:
+    """
+    Apply scripted moves without prompts, terminal clearing or rendering.
+
+    Every line holds one move in the same "x y" format as the interactive
+    game. Empty lines and lines starting with "#" are skipped, "q" stops the
+    batch. Moves after the end of the game are not applied.
+
+    Args:
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazard_count: Number of hazards on the game grid
+        moves: Lines with one move each, e.g. an open file or sys.stdin
+        seed: Seed for the hazard placement (default: random)
+        log: Stream receiving one JSON object per move (default: no log)
+        results: Store recording the game (default: none)
+        events: Emitter attached to the game, which also receives the
+            lines that are not a position on the grid (default: none)
+        instrumentation: Record the latencies of the moves (default: none)
+
+    Returns:
+        The game statistics with the result ("won", "lost" or "unfinished")
+        and the number of moves read, rejected and ignored
+    """
+    import json  # pylint: disable=import-outside-toplevel
+
+    start = time.perf_counter()
+    game = AbandonedSpaceStation(
+        grid_width,
+        grid_height,
+        hazard_count,
+        seed=seed,
+        compact=True,
+        verbose=False,
+        events=events,
+        instrumentation=instrumentation,
+    )
+    moves_by_result = {"invalid": 0, "repeated": 0, "safe": 0, "hazard": 0}
+    for line in moves:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if game.is_defeated or game.is_victorious:
+            break
+        entry = _apply_move(game, line)
+        if entry is None:
+            break
+        moves_by_result[entry["result"]] += 1
+        if events is not None and entry["result"] == "invalid":
+            events.rejected("input", None, None, "invalid")
+        if log is not None:
+            entry["move"] = sum(moves_by_result.values())
+            log.write(json.dumps(entry) + "\n")
+    if results is not None:
+        results.record(game, time.perf_counter() - start)
+    return _summarize(game, moves_by_result)
+
+
+def _summarize(
+    game: AbandonedSpaceStation, moves_by_result: Dict[str, int]
+) -> Dict[str, Any]:
+    """
+    Summarize a game of the batch mode.
+
+    Args:
+        game: The game
+        moves_by_result: Number of moves read by their result
+
+    Returns:
+        The game statistics with the result and the number of moves read,
+        rejected and ignored
+    """
+    summary = game.statistics()
+    if game.is_victorious:
+        summary["result"] = "won"
+    elif game.is_defeated:
+        summary["result"] = "lost"
+    else:
+        summary["result"] = "unfinished"
+    summary["moves_read"] = sum(moves_by_result.values())
+    summary["moves_rejected"] = moves_by_result["invalid"]
+    summary["moves_ignored"] = moves_by_result["repeated"]
+    return summary
+
+
+def _open_events(stack: "ExitStack", target: str) -> "EventEmitter":
+    """
+    Open an event stream for the games of the batch or interactive mode.
+
+    Args:
+        stack: Exit stack writing the remaining events at the end
+        target: File the events are appended to, - for stdout
+
+    Returns:
+        Emitter writing to the stream
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from exam.source.events import EventEmitter, JsonlSink
+
+    sink = JsonlSink(sys.stdout if target == "-" else target)
+    return EventEmitter(stack.enter_context(sink))
+
+
+def _open_results(stack: "ExitStack", path: str) -> "ResultStore":
+    """
+    Open the result database for the game of the batch or interactive mode.
+
+    Args:
+        stack: Exit stack writing the buffered games at the end
+        path: The database file
+
+    Returns:
+        Store recording the game
+    """
+    # Only loaded if enabled, so sqlite3 does not slow down the game start.
+    # pylint: disable-next=import-outside-toplevel
+    from exam.source.results import ResultStore
+
+    return stack.enter_context(ResultStore(path))
+
+
+def _open_instrumentation(
+    stack: "ExitStack", trace_allocations: bool
+) -> "Instrumentation":
+    """
+    Create the instrumentation of the game of the batch or interactive mode.
+
+    Args:
+        stack: Exit stack stopping the allocation tracing at the end
+        trace_allocations: Record the memory allocated per move
+
+    Returns:
+        The instrumentation
+    """
+    # Only loaded if enabled, so tracemalloc does not slow down the game start.
+    # pylint: disable-next=import-outside-toplevel
+    from exam.source.instrumentation import Instrumentation
+
+    instrumentation = Instrumentation(trace_allocations)
+    stack.callback(instrumentation.stop)
+    return instrumentation
+
+
+def batch_main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parse the command line and run a batch of scripted moves.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Exit code: 0 if the game was won, 1 otherwise
+    """
+    # Only loaded for the batch mode, so they do not slow down the game start.
+    import argparse  # pylint: disable=import-outside-toplevel
+    import contextlib  # pylint: disable=import-outside-toplevel
+    import json  # pylint: disable=import-outside-toplevel
+
+    parser = argparse.ArgumentParser(description="Abandoned Space Station batch mode")
+    parser.add_argument(
+        "--moves", default="-", help="file with one move per line, - for stdin"
+    )
+    parser.add_argument("--width", type=int, default=5)
+    parser.add_argument("--height", type=int, default=5)
+    parser.add_argument("--hazards", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log", help="write one JSON object per move, - for stdout")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--results", help="database recording the game")
+    parser.add_argument(
+        "--events", help="append the game events as JSON lines, - for stdout"
+    )
+    parser.add_argument(
+        "--instrument", action="store_true", help="add latency histograms"
+    )
+    parser.add_argument(
+        "--trace-allocations",
+        action="store_true",
+        help="add the memory allocated per move, implies --instrument",
+    )
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        moves: TextIO = sys.stdin
+        if args.moves != "-":
+            moves = stack.enter_context(open(args.moves, encoding="utf-8"))
+        log: Optional[TextIO] = None
+        if args.log == "-":
+            log = sys.stdout
+        elif args.log:
+            log = stack.enter_context(open(args.log, "w", encoding="utf-8"))
+        results = _open_results(stack, args.results) if args.results else None
+        events = _open_events(stack, args.events) if args.events else None
+        instrumentation = None
+        if args.instrument or args.trace_allocations:
+            instrumentation = _open_instrumentation(stack, args.trace_allocations)
+        summary = run_batch(
+            args.width,
+            args.height,
+            args.hazards,
+            moves,
+            seed=args.seed,
+            log=log,
+            results=results,
+            events=events,
+            instrumentation=instrumentation,
+        )
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        _print_summary(summary, instrumentation)
+    return 0 if summary["result"] == "won" else 1
+
+
+def _print_summary(
+    summary: Dict[str, Any], instrumentation: Optional["Instrumentation"]
+) -> None:
+    """
+    Print the summary of the batch mode as text.
+
+    Args:
+        summary: The summary of the game
+        instrumentation: Instrumentation of the game, whose measurements
+            are printed one operation per line (default: none)
+    """
+    for key, value in summary.items():
+        if key != "instrumentation":
+            print(f"{key}: {value}")
+    if instrumentation is not None:
+        print("performance:")
+        for line in instrumentation.format_lines():
+            print(f"  {line}")
 
 
 def handle_game_interrupt() -> None:
@@ -97,8 +428,46 @@ def handle_game_interrupt() -> None:
     sys.exit(0)
 
 
-if __name__ == "__main__":
+def cli(argv: Optional[List[str]] = None) -> None:
+    """
+    Start the interactive game, or the batch mode if arguments are given.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        sys.exit(batch_main(argv))
+    from exam.source.pool import BoardPool  # pylint: disable=import-outside-toplevel
+
+    results_path = os.environ.get("STATION_RESULTS")
+    events_path = os.environ.get("STATION_EVENTS")
+    instrumentation_setting = os.environ.get("STATION_INSTRUMENTATION", "0")
+    instrument = instrumentation_setting not in ("", "0")
     try:
-        main()
+        # The default board is generated while the player answers the
+        # first prompt.
+        with BoardPool([DEFAULT_CONFIGURATION], size=1) as board_pool:
+            if not (results_path or events_path or instrument):
+                main(board_pool)
+                return
+            # Only loaded if enabled, so sqlite3 and json do not slow down
+            # the game start.
+            import contextlib  # pylint: disable=import-outside-toplevel
+
+            with contextlib.ExitStack() as stack:
+                results = _open_results(stack, results_path) if results_path else None
+                events = _open_events(stack, events_path) if events_path else None
+                instrumentation = None
+                if instrument:
+                    instrumentation = _open_instrumentation(
+                        stack, instrumentation_setting == "allocations"
+                    )
+                main(board_pool, results, events, instrumentation)
     except KeyboardInterrupt:
         handle_game_interrupt()
+
+
+if __name__ == "__main__":
+    cli()
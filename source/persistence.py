@@ -0,0 +1,319 @@
+"""
+Save files for the game 'Abandoned Space Station'.
+
+Stores a game in a versioned binary format: a fixed header with the board
+size and counters, followed by the adjacency count table and the bitset of
+scanned areas exactly as the game keeps them in memory. Large save files are
+memory-mapped on load, so only the pages the game touches are read.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Union
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.views import Table
+
+MAGIC = b"ASSG"
+VERSION = 1
+
+# Save files from this size on are memory-mapped by default.
+MAP_THRESHOLD = 1 << 20
+
+_DEFEATED = 0x01
+_VICTORIOUS = 0x02
+
+# The tables start at offsets aligned for memory mapping on this platform.
+_ALIGNMENT = mmap.ALLOCATIONGRANULARITY
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@dataclass
+class SaveHeader:
+    """
+    Header of a save file.
+
+    All numbers are stored little-endian in a fixed layout, see ``FORMAT``.
+    """
+
+    FORMAT = struct.Struct("<4sHHQQQQQQQQ")
+
+    flags: int
+    grid_width: int
+    grid_height: int
+    hazard_count: int
+    hazard_total: int
+    scanned_count: int
+    action_count: int
+    counts_offset: int
+    scanned_offset: int
+
+    @property
+    def area_count(self) -> int:
+        """
+        Number of areas on the board.
+        """
+        return self.grid_width * self.grid_height
+
+    @property
+    def bitset_size(self) -> int:
+        """
+        Size of the scanned bitset in bytes.
+        """
+        return (self.area_count + 7) >> 3
+
+    def pack(self) -> bytes:
+        """
+        Encode the header.
+
+        Returns:
+            The header bytes
+        """
+        return self.FORMAT.pack(
+            MAGIC,
+            VERSION,
+            self.flags,
+            self.grid_width,
+            self.grid_height,
+            self.hazard_count,
+            self.hazard_total,
+            self.scanned_count,
+            self.action_count,
+            self.counts_offset,
+            self.scanned_offset,
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes, size: int) -> "SaveHeader":
+        """
+        Decode and validate a header.
+
+        Args:
+            data: The first bytes of the save data
+            size: Total size of the save data in bytes
+
+        Returns:
+            The header
+
+        Raises:
+            ValueError: If the data is not a save file of a supported version
+        """
+        if len(data) < cls.FORMAT.size or data[:4] != MAGIC:
+            raise ValueError("Not a save file of the game.")
+        fields = cls.FORMAT.unpack_from(data)
+        if fields[1] != VERSION:
+            raise ValueError(f"Unsupported save file version {fields[1]}.")
+        header = cls(*fields[2:])
+        if (
+            header.counts_offset < cls.FORMAT.size
+            or header.counts_offset + header.area_count > header.scanned_offset
+            or header.scanned_offset + header.bitset_size > size
+        ):
+            raise ValueError("Save file is truncated or corrupt.")
+        return header
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> "SaveHeader":
+        """
+        Read and validate the header at the start of a save file.
+
+        Args:
+            file: The save file opened in binary mode
+
+        Returns:
+            The header
+
+        Raises:
+            ValueError: If the file is not a save file of a supported version
+        """
+        return cls.unpack(file.read(cls.FORMAT.size), os.fstat(file.fileno()).st_size)
+
+
+def _align(offset: int) -> int:
+    """
+    Round an offset up to the next memory mapping boundary.
+
+    Args:
+        offset: Offset in bytes
+
+    Returns:
+        The aligned offset
+    """
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _header(
+    game: AbandonedSpaceStation, counts_offset: int, scanned_offset: int
+) -> SaveHeader:
+    """
+    Build the save header of a game.
+
+    Args:
+        game: The game to save
+        counts_offset: Offset of the adjacency count table
+        scanned_offset: Offset of the scanned bitset
+
+    Returns:
+        The header
+    """
+    return SaveHeader(
+        flags=(_DEFEATED if game.is_defeated else 0)
+        | (_VICTORIOUS if game.is_victorious else 0),
+        grid_width=game.grid_width,
+        grid_height=game.grid_height,
+        hazard_count=game.hazard_count,
+        hazard_total=len(game.hazard_locations),
+        scanned_count=game.scanned_count,
+        action_count=game.action_count,
+        counts_offset=counts_offset,
+        scanned_offset=scanned_offset,
+    )
+
+
+def _restore(
+    header: SaveHeader, counts: Table, scanned_bits: Table, verbose: bool
+) -> AbandonedSpaceStation:
+    """
+    Create a game from a save header and its tables.
+
+    Args:
+        header: The save header
+        counts: Adjacency count table
+        scanned_bits: Bitset of scanned areas
+        verbose: Print messages for rejected scans
+
+    Returns:
+        The restored game in compact mode
+    """
+    game = AbandonedSpaceStation.from_tables(
+        header.grid_width,
+        header.grid_height,
+        counts,
+        scanned_bits,
+        hazard_total=header.hazard_total,
+        scanned_count=header.scanned_count,
+        verbose=verbose,
+    )
+    game.hazard_count = header.hazard_count
+    game.action_count = header.action_count
+    game.is_defeated = bool(header.flags & _DEFEATED)
+    game.is_victorious = bool(header.flags & _VICTORIOUS)
+    return game
+
+
+def save_game(game: AbandonedSpaceStation, path: PathLike) -> None:
+    """
+    Save a game to a file.
+
+    Args:
+        game: The game to save
+        path: Path of the save file
+    """
+    counts, scanned_bits = game.tables()
+    counts_offset = _align(SaveHeader.FORMAT.size)
+    header = _header(game, counts_offset, _align(counts_offset + len(counts)))
+    with open(path, "wb") as file:
+        file.write(header.pack())
+        file.seek(header.counts_offset)
+        file.write(counts)
+        file.seek(header.scanned_offset)
+        file.write(scanned_bits)
+
+
+def dump_game(game: AbandonedSpaceStation) -> bytes:
+    """
+    Encode a game in the save format without alignment padding.
+
+    Args:
+        game: The game to encode
+
+    Returns:
+        The save data
+    """
+    counts, scanned_bits = game.tables()
+    counts_offset = SaveHeader.FORMAT.size
+    header = _header(game, counts_offset, counts_offset + len(counts))
+    return b"".join((header.pack(), counts, scanned_bits))
+
+
+def load_dump(data: bytes, verbose: bool = True) -> AbandonedSpaceStation:
+    """
+    Restore a game encoded with dump_game.
+
+    Args:
+        data: The save data
+        verbose: Print messages for rejected scans (default: True)
+
+    Returns:
+        The restored game in compact mode
+
+    Raises:
+        ValueError: If the data is not valid save data
+    """
+    header = SaveHeader.unpack(data, len(data))
+    counts_end = header.counts_offset + header.area_count
+    scanned_end = header.scanned_offset + header.bitset_size
+    return _restore(
+        header,
+        bytearray(data[header.counts_offset : counts_end]),
+        bytearray(data[header.scanned_offset : scanned_end]),
+        verbose,
+    )
+
+
+def _read_table(file: BinaryIO, offset: int, size: int, mapped: bool) -> Table:
+    """
+    Read a board table from a save file.
+
+    Args:
+        file: The save file opened in binary mode
+        offset: Offset of the table in the file
+        size: Size of the table in bytes
+        mapped: Map the table into memory instead of reading it
+
+    Returns:
+        The table. A mapped table is copy-on-write, so changes by the game
+        never reach the file.
+    """
+    if mapped and size and offset % mmap.ALLOCATIONGRANULARITY == 0:
+        return mmap.mmap(file.fileno(), size, access=mmap.ACCESS_COPY, offset=offset)
+    file.seek(offset)
+    return bytearray(file.read(size))
+
+
+def load_game(
+    path: PathLike, *, mapped: Optional[bool] = None, verbose: bool = True
+) -> AbandonedSpaceStation:
+    """
+    Load a saved game.
+
+    The game is restored in compact mode, so the board is never converted
+    into lists and sets.
+
+    Args:
+        path: Path of the save file
+        mapped: Memory-map the board tables (default: for files of at least
+            MAP_THRESHOLD bytes)
+        verbose: Print messages for rejected scans (default: True)
+
+    Returns:
+        The restored game
+
+    Raises:
+        ValueError: If the file is not a valid save file
+    """
+    with open(path, "rb") as file:
+        header = SaveHeader.read(file)
+        if mapped is None:
+            mapped = header.scanned_offset + header.bitset_size >= MAP_THRESHOLD
+        counts = _read_table(file, header.counts_offset, header.area_count, mapped)
+        scanned_bits = _read_table(
+            file, header.scanned_offset, header.bitset_size, mapped
+        )
+    return _restore(header, counts, scanned_bits, verbose)
@@ -0,0 +1,245 @@
+"""
+Board pool for the game 'Abandoned Space Station'.
+
+Pre-generates boards for the commonly used game configurations in a
+background thread, so a new game can start with a ready board instead of
+placing hazards and precomputing counts on the main thread first.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Iterable, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+
+# Width, height and hazard count of a game.
+Configuration = Tuple[int, int, int]
+# Creates a game for a configuration, e.g. a no-guess generator.
+BoardFactory = Callable[[int, int, int], AbandonedSpaceStation]
+
+
+class BoardPool:
+    """
+    Bounded pool of pre-generated games, filled by a background thread.
+
+    The pool keeps up to ``size`` games for each of at most
+    ``max_configurations`` configurations. Taking a game for a configuration
+    that is not in the pool yet only registers it if asked to, replacing the
+    least recently used configuration if the pool is full, so the next game
+    of the same size starts instantly. Otherwise no board is built that the
+    caller might never use. Taking a game never blocks: if no game is ready,
+    None is returned and the caller creates the game itself. An unexpected
+    error of the factory stops the background thread and is raised by the
+    next take() or wait_full().
+    """
+
+    def __init__(
+        self,
+        configurations: Iterable[Configuration] = (),
+        size: int = 2,
+        *,
+        max_configurations: int = 4,
+        factory: BoardFactory = AbandonedSpaceStation,
+    ) -> None:
+        """
+        Initialize a new board pool and start filling it.
+
+        Args:
+            configurations: Configurations to pre-generate games for
+            size: Games kept ready per configuration (default: 2)
+            max_configurations: Configurations kept in the pool (default: 4)
+            factory: Creates a game for a configuration
+                (default: AbandonedSpaceStation)
+        """
+        if size < 1 or max_configurations < 1:
+            raise ValueError("The pool must hold at least one board.")
+        self.size = size
+        self.max_configurations = max_configurations
+        self.factory = factory
+        self.hits = 0
+        self.misses = 0
+        self._boards: "OrderedDict[Configuration, Deque[AbandonedSpaceStation]]" = (
+            OrderedDict()
+        )
+        self._condition = threading.Condition()
+        self._closed = False
+        self._error: Optional[Exception] = None
+        for configuration in configurations:
+            self._register(configuration)
+        self._worker = threading.Thread(
+            target=self._fill, name="board-pool", daemon=True
+        )
+        self._worker.start()
+
+    def _register(self, configuration: Configuration) -> None:
+        """
+        Mark a configuration as recently used, adding it if needed.
+
+        Must be called with the lock held.
+
+        Args:
+            configuration: Width, height and hazard count
+        """
+        if configuration in self._boards:
+            self._boards.move_to_end(configuration)
+            return
+        self._boards[configuration] = deque()
+        if len(self._boards) > self.max_configurations:
+            self._boards.popitem(last=False)
+
+    def _next_missing(self) -> Optional[Configuration]:
+        """
+        Find the most recently used configuration that is not full.
+
+        Must be called with the lock held.
+
+        Returns:
+            The configuration or None if the pool is full
+        """
+        for configuration in reversed(self._boards):
+            if len(self._boards[configuration]) < self.size:
+                return configuration
+        return None
+
+    def _fill(self) -> None:
+        """
+        Generate games until the pool is closed.
+
+        Games are created without holding the lock, so taking a game is never
+        delayed by a generation in progress. Configurations the factory
+        rejects with a ValueError are removed from the pool; any other error
+        is kept for the callers and ends the thread.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or self._next_missing() is not None
+                )
+                if self._closed:
+                    return
+                configuration = self._next_missing()
+            assert configuration is not None
+            try:
+                game: Optional[AbandonedSpaceStation] = self.factory(*configuration)
+            except ValueError:
+                game = None
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                with self._condition:
+                    self._error = error
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                boards = self._boards.get(configuration)
+                if game is None:
+                    self._boards.pop(configuration, None)
+                elif boards is not None and len(boards) < self.size:
+                    boards.append(game)
+                self._condition.notify_all()
+
+    def _raise_error(self) -> None:
+        """
+        Raise the error that stopped the background thread, if any.
+
+        Must be called with the lock held.
+        """
+        if self._error is not None:
+            raise self._error
+
+    def take(
+        self,
+        grid_width: int,
+        grid_height: int,
+        hazard_count: int,
+        *,
+        register: bool = False,
+    ) -> Optional[AbandonedSpaceStation]:
+        """
+        Take a ready game and let the background thread replace it.
+
+        Args:
+            grid_width: Width of the game grid
+            grid_height: Height of the game grid
+            hazard_count: Number of hazards on the game grid
+            register: Add the configuration to the pool if it is not in it
+                yet, so games of it are generated from now on (default: False)
+
+        Returns:
+            A new game or None if no game of this configuration is ready
+
+        Raises:
+            Exception: The error of the factory that stopped the pool
+        """
+        configuration = (grid_width, grid_height, hazard_count)
+        with self._condition:
+            if self._closed:
+                return None
+            self._raise_error()
+            if register or configuration in self._boards:
+                self._register(configuration)
+            boards = self._boards.get(configuration)
+            game = boards.popleft() if boards else None
+            if game is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if boards is not None:
+                self._condition.notify_all()
+        return game
+
+    def ready(self, grid_width: int, grid_height: int, hazard_count: int) -> int:
+        """
+        Count the ready games of a configuration.
+
+        Args:
+            grid_width: Width of the game grid
+            grid_height: Height of the game grid
+            hazard_count: Number of hazards on the game grid
+
+        Returns:
+            Number of ready games
+        """
+        with self._condition:
+            return len(self._boards.get((grid_width, grid_height, hazard_count), ()))
+
+    def wait_full(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every configuration in the pool has all its games ready.
+
+        Args:
+            timeout: Seconds to wait at most (default: no limit)
+
+        Returns:
+            True if the pool is full
+
+        Raises:
+            Exception: The error of the factory that stopped the pool
+        """
+        with self._condition:
+            full = self._condition.wait_for(
+                lambda: self._closed
+                or self._error is not None
+                or self._next_missing() is None,
+                timeout,
+            )
+            self._raise_error()
+            return full and not self._closed
+
+    def close(self) -> None:
+        """
+        Stop the background thread and drop all ready games.
+        """
+        with self._condition:
+            self._closed = True
+            self._boards.clear()
+            self._condition.notify_all()
+        self._worker.join()
+
+    def __enter__(self) -> "BoardPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,407 @@
+"""
+Exact hazard probabilities for the game 'Abandoned Space Station'.
+
+Splits the frontier of revealed numbers into independent components,
+enumerates every component once and combines the components with the
+number of hazards that are still unaccounted for.
+"""
+
+import math
+import os
+import random
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.solver import ConstraintSolver, tracked_solver
+
+# A constraint is the tuple of its unknown areas and the hazards among them.
+Constraint = Tuple[Tuple[int, ...], int]
+
+
+@dataclass
+class ComponentCounts:
+    """
+    Solution counts of one frontier component.
+
+    ``solutions[k]`` is the number of hazard arrangements with exactly k
+    hazards, ``hazard_counts[k][i]`` the number of those arrangements in
+    which ``cells[i]`` is a hazard.
+    """
+
+    cells: Tuple[int, ...]
+    solutions: Dict[int, int] = field(default_factory=dict)
+    hazard_counts: Dict[int, List[int]] = field(default_factory=dict)
+
+    def add_solution(self, hazards: int, values: List[int]) -> None:
+        """
+        Count a hazard arrangement.
+
+        Args:
+            hazards: Number of hazards in the arrangement
+            values: 1 for every hazard and 0 for every safe area
+        """
+        self.solutions[hazards] = self.solutions.get(hazards, 0) + 1
+        counts = self.hazard_counts.setdefault(hazards, [0] * len(values))
+        for i, value in enumerate(values):
+            counts[i] += value
+
+
+def _index_constraints(
+    constraints: FrozenSet[Constraint],
+) -> Tuple[List[int], List[List[int]], List[int], List[int]]:
+    """
+    Order the areas of a component and index its constraints by area.
+
+    Args:
+        constraints: The constraints of the component
+
+    Returns:
+        The areas in assignment order, the constraint indices per area, the
+        hazards needed and the number of areas per constraint
+    """
+    constraint_list = sorted(constraints)
+    order: List[int] = []
+    position: Dict[int, int] = {}
+    for cells, _ in constraint_list:
+        for cell in cells:
+            if cell not in position:
+                position[cell] = len(order)
+                order.append(cell)
+    cell_constraints: List[List[int]] = [[] for _ in order]
+    for constraint_index, (cells, _) in enumerate(constraint_list):
+        for cell in cells:
+            cell_constraints[position[cell]].append(constraint_index)
+    need = [remaining for _, remaining in constraint_list]
+    free = [len(cells) for cells, _ in constraint_list]
+    return order, cell_constraints, need, free
+
+
+def enumerate_component(constraints: FrozenSet[Constraint]) -> ComponentCounts:
+    """
+    Count all hazard arrangements that satisfy a set of connected constraints.
+
+    Uses iterative backtracking and assigns the areas constraint by
+    constraint, so that contradictions are detected early.
+
+    Args:
+        constraints: The constraints of the component
+
+    Returns:
+        Solution counts by number of hazards
+    """
+    order, cell_constraints, need, free = _index_constraints(constraints)
+    result = ComponentCounts(tuple(order))
+    values = [-1] * len(order)
+    hazards = 0
+    i = 0
+    while i >= 0:
+        if i == len(order):
+            result.add_solution(hazards, values)
+            i -= 1
+            continue
+        value = values[i]
+        if value >= 0:
+            for constraint_index in cell_constraints[i]:
+                free[constraint_index] += 1
+                need[constraint_index] += value
+            hazards -= value
+        if value == 1:
+            values[i] = -1
+            i -= 1
+            continue
+        value += 1
+        values[i] = value
+        hazards += value
+        feasible = True
+        for constraint_index in cell_constraints[i]:
+            free[constraint_index] -= 1
+            need[constraint_index] -= value
+            if not 0 <= need[constraint_index] <= free[constraint_index]:
+                feasible = False
+        if feasible:
+            i += 1
+    return result
+
+
+def _convolve(left: Dict[int, int], right: Dict[int, int]) -> Dict[int, int]:
+    """
+    Combine two hazard count distributions of independent components.
+
+    Args:
+        left: Number of arrangements by hazard count
+        right: Number of arrangements by hazard count
+
+    Returns:
+        Number of combined arrangements by total hazard count
+    """
+    combined: Dict[int, int] = {}
+    for left_hazards, left_count in left.items():
+        for right_hazards, right_count in right.items():
+            total = left_hazards + right_hazards
+            combined[total] = combined.get(total, 0) + left_count * right_count
+    return combined
+
+
+class _InteriorWeights:
+    """
+    Number of ways to place the hazards that are not on the frontier.
+    """
+
+    def __init__(self, interior: int, remaining: int) -> None:
+        """
+        Initialize the weights.
+
+        Args:
+            interior: Number of undecided areas away from the frontier
+            remaining: Number of hazards that are not known yet
+        """
+        self.interior = interior
+        self.remaining = remaining
+        self._weights: Dict[int, int] = {}
+
+    def __call__(self, frontier_hazards: int) -> int:
+        """
+        Get the number of interior arrangements for a frontier hazard count.
+
+        Args:
+            frontier_hazards: Number of hazards on the frontier
+
+        Returns:
+            Number of ways to place the other hazards in the interior
+        """
+        if frontier_hazards not in self._weights:
+            interior_hazards = self.remaining - frontier_hazards
+            self._weights[frontier_hazards] = (
+                math.comb(self.interior, interior_hazards)
+                if 0 <= interior_hazards <= self.interior
+                else 0
+            )
+        return self._weights[frontier_hazards]
+
+    def interior_probability(self, frontier: Dict[int, int], total: int) -> float:
+        """
+        Get the hazard probability of a single interior area.
+
+        Args:
+            frontier: Number of frontier arrangements by hazard count
+            total: Total weighted number of arrangements
+
+        Returns:
+            The hazard probability
+        """
+        if not self.interior:
+            return 0.0
+        interior_total = sum(
+            count * self(hazards) * (self.remaining - hazards)
+            for hazards, count in frontier.items()
+        )
+        return interior_total / (total * self.interior)
+
+
+def _frontier_counts(
+    components: List[ComponentCounts],
+    prefix: List[Dict[int, int]],
+    suffix: List[Dict[int, int]],
+    weight: _InteriorWeights,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Count the weighted arrangements with a hazard on each frontier area.
+
+    Args:
+        components: The enumerated components
+        prefix: Combined distributions of the components before each one
+        suffix: Combined distributions of the components after each one
+        weight: Interior arrangements by frontier hazard count
+
+    Returns:
+        Flat index and weighted hazard count of every frontier area
+    """
+    for i, component in enumerate(components):
+        others = _convolve(prefix[i], suffix[i + 1])
+        cell_totals = [0] * len(component.cells)
+        for hazards, cell_counts in component.hazard_counts.items():
+            factor = sum(
+                count * weight(hazards + other_hazards)
+                for other_hazards, count in others.items()
+            )
+            for j, cell_count in enumerate(cell_counts):
+                cell_totals[j] += cell_count * factor
+        yield from zip(component.cells, cell_totals)
+
+
+class ProbabilityEngine:
+    """
+    Computes the exact hazard probability of every undecided area.
+
+    Builds on a ConstraintSolver, which tracks the revealed numbers and the
+    deduced areas incrementally. Components are cached by their constraints
+    in ``component_cache``, so a component is only enumerated again after one
+    of its constraints changed.
+    """
+
+    def __init__(self, solver: ConstraintSolver) -> None:
+        """
+        Initialize a new probability engine.
+
+        Args:
+            solver: The solver tracking the game
+        """
+        self.solver = solver
+        self.interior_probability = 0.0
+        self.component_cache: Dict[FrozenSet[Constraint], ComponentCounts] = {}
+
+    def _components(self) -> List[FrozenSet[Constraint]]:
+        """
+        Split the active constraints into independent components.
+
+        Returns:
+            The constraints of every component
+        """
+        solver = self.solver
+        by_cell: Dict[int, List[Constraint]] = {}
+        for index in solver.active:
+            unknown, remaining = solver.constraint(index)
+            constraint = (tuple(sorted(unknown)), remaining)
+            for cell in constraint[0]:
+                by_cell.setdefault(cell, []).append(constraint)
+
+        components = []
+        seen_cells = set()
+        for start in by_cell:
+            if start in seen_cells:
+                continue
+            component = set()
+            seen_cells.add(start)
+            queue = deque([start])
+            while queue:
+                for constraint in by_cell[queue.popleft()]:
+                    if constraint in component:
+                        continue
+                    component.add(constraint)
+                    for cell in constraint[0]:
+                        if cell not in seen_cells:
+                            seen_cells.add(cell)
+                            queue.append(cell)
+            components.append(frozenset(component))
+        return components
+
+    def probabilities(self) -> Dict[Tuple[int, int], float]:
+        """
+        Compute the hazard probability of every undecided frontier area.
+
+        The probability of the undecided areas away from the frontier is
+        stored in ``interior_probability``.
+
+        Returns:
+            Hazard probability by coordinates
+        """
+        solver = self.solver
+        component_keys = self._components()
+        cache = {
+            key: self.component_cache.get(key) or enumerate_component(key)
+            for key in component_keys
+        }
+        self.component_cache = cache
+        components = [cache[key] for key in component_keys]
+
+        frontier_size = sum(len(component.cells) for component in components)
+        weight = _InteriorWeights(
+            solver.undecided - frontier_size,
+            len(solver.game.hazard_locations) - len(solver.known_hazards),
+        )
+
+        prefix = [{0: 1}]
+        for component in components:
+            prefix.append(_convolve(prefix[-1], component.solutions))
+        suffix = [{0: 1}]
+        for component in reversed(components):
+            suffix.append(_convolve(suffix[-1], component.solutions))
+        suffix.reverse()
+
+        total = sum(count * weight(hazards) for hazards, count in prefix[-1].items())
+        if total == 0:
+            return {}
+        self.interior_probability = weight.interior_probability(prefix[-1], total)
+
+        width = solver.grid_width
+        return {
+            (cell % width, cell // width): count / total
+            for cell, count in _frontier_counts(components, prefix, suffix, weight)
+        }
+
+    def safest_area(
+        self, rng: Optional[random.Random] = None
+    ) -> Optional[Tuple[Tuple[int, int], float]]:
+        """
+        Find the undecided area with the lowest hazard probability.
+
+        Interior areas, which are undecided and outside the frontier, share
+        one probability; one of them is picked at random from a list built
+        once per call.
+
+        Args:
+            rng: Random generator to pick an interior area (default: random)
+
+        Returns:
+            Coordinates of the area and its hazard probability, or None if
+            no area is undecided
+        """
+        probabilities = self.probabilities()
+        best: Optional[Tuple[int, int]] = None
+        if probabilities:
+            best = min(probabilities, key=probabilities.__getitem__)
+        if self.solver.undecided > len(probabilities) and (
+            best is None or self.interior_probability < probabilities[best]
+        ):
+            interior = [
+                area
+                for area in self.solver.unknown_areas()
+                if area not in probabilities
+            ]
+            if interior:
+                area = (rng or random.Random()).choice(interior)
+                return area, self.interior_probability
+        if best is None:
+            return None
+        return best, probabilities[best]
+
+
+# Probability engines of the games played through probability_policy.
+_ENGINES: "WeakKeyDictionary[AbandonedSpaceStation, ProbabilityEngine]" = (
+    WeakKeyDictionary()
+)
+
+
+def probability_policy(
+    game: AbandonedSpaceStation, rng: random.Random
+) -> Tuple[int, int]:
+    """
+    Move policy for the simulation engine that plays deduced safe areas and
+    otherwise the area with the lowest hazard probability.
+
+    Args:
+        game: The running game
+        rng: Random generator used to pick interior areas
+
+    Returns:
+        Coordinates of the area to scan
+    """
+    solver = tracked_solver(game)
+    move = solver.next_safe_move()
+    if move is None:
+        engine = _ENGINES.get(game)
+        if engine is None:
+            engine = ProbabilityEngine(solver)
+            _ENGINES[game] = engine
+        safest = engine.safest_area(rng)
+        if safest is None:
+            raise ValueError("No undecided area is left to scan.")
+        move = safest[0]
+    solver.last_move = move
+    return move
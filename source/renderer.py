@@ -0,0 +1,507 @@
+"""
+Terminal renderer for the game 'Abandoned Space Station'.
+
+Builds each frame in a single buffer and, on terminals that understand ANSI
+escape sequences, redraws only the areas that changed since the last frame.
+Boards larger than the terminal are shown through a scrollable viewport, so
+a frame only ever contains the visible window.
+"""
+
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+_CLEAR_SCREEN = "\x1b[H\x1b[2J"
+_CLEAR_BELOW = "\x1b[J"
+
+# Scroll direction of the WASD keys and the arrow key escape sequences.
+_SCROLL_KEYS: Dict[str, Tuple[int, int]] = {
+    "w": (0, -1),
+    "a": (-1, 0),
+    "s": (0, 1),
+    "d": (1, 0),
+    "\x1b[A": (0, -1),
+    "\x1b[D": (-1, 0),
+    "\x1b[B": (0, 1),
+    "\x1b[C": (1, 0),
+}
+# Lines below the grid kept free for the prompt and messages.
+_RESERVED_LINES = 3
+
+# Parses coordinates like helpers.process_coordinates.
+CoordinateParser = Callable[
+    [str, int, int], Tuple[bool, Optional[Tuple[int, int]], str]
+]
+
+
+def supports_ansi(stream: TextIO) -> bool:
+    """
+    Check whether a stream is a terminal that understands ANSI escape sequences.
+
+    Args:
+        stream: The output stream
+
+    Returns:
+        True if cursor positioning can be used on the stream
+    """
+    if not stream.isatty():
+        return False
+    if os.name == "nt":
+        return any(name in os.environ for name in ("WT_SESSION", "ANSICON", "TERM"))
+    return os.environ.get("TERM", "dumb") != "dumb"
+
+
+def terminal_size(stream: TextIO) -> Optional[Tuple[int, int]]:
+    """
+    Get the size of the terminal a stream writes to.
+
+    Args:
+        stream: The output stream
+
+    Returns:
+        Columns and lines or None if the stream is not a terminal
+    """
+    try:
+        size = os.get_terminal_size(stream.fileno())
+    except (AttributeError, OSError, ValueError):
+        return None
+    return size.columns, size.lines
+
+
+def _label_width(top: int, height: int) -> int:
+    """
+    Get the width of the row labels.
+
+    Args:
+        top: Y-coordinate of the first row
+        height: Number of rows
+
+    Returns:
+        Number of characters of the widest row label
+    """
+    return len(str(max(top + height - 1, 0)))
+
+
+def _header_lines(left: int, width: int) -> int:
+    """
+    Get the number of column header lines, one per digit of the widest label.
+
+    Args:
+        left: X-coordinate of the first column
+        width: Number of columns
+
+    Returns:
+        Number of header lines
+    """
+    return len(str(max(left + width - 1, 0)))
+
+
+def format_grid(rows: Sequence[str], left: int = 0, top: int = 0) -> List[str]:
+    """
+    Format grid rows as they are shown to the player.
+
+    Column labels with several digits are written vertically, one line per
+    digit, so every column keeps the width of a single area.
+
+    Args:
+        rows: One string per grid row with one character per area
+        left: X-coordinate of the first column (default: 0)
+        top: Y-coordinate of the first row (default: 0)
+
+    Returns:
+        The output lines, starting with the column header
+    """
+    width = len(rows[0]) if rows else 0
+    label_width = _label_width(top, len(rows))
+    indent = " " * (label_width + 2)
+    lines = []
+    digits = _header_lines(left, width)
+    for digit in range(digits - 1, -1, -1):
+        power = 10**digit
+        lines.append(
+            indent
+            + "".join(
+                f" {x // power % 10} " if x >= power or not digit else "   "
+                for x in range(left, left + width)
+            )
+        )
+    lines.append(indent + "---" * width)
+    for y, row in enumerate(rows, top):
+        lines.append(f"{y:>{label_width}} | " + "  ".join(row) + " ")
+    lines.append("")
+    return lines
+
+
+def scroll_steps(command: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a scroll command made of WASD keys and arrow keys.
+
+    Every key counts as one step, so ``dd`` scrolls two steps to the right.
+    Arrow keys arrive as escape sequences when entered before Enter.
+
+    Args:
+        command: The input line
+
+    Returns:
+        Steps in x and y direction or None if the input is no scroll command
+    """
+    if not command:
+        return None
+    dx = dy = 0
+    position = 0
+    while position < len(command):
+        if command.startswith("\x1b", position):
+            step = _SCROLL_KEYS.get(command[position : position + 3])
+            length = 3
+        else:
+            step = _SCROLL_KEYS.get(command[position].lower())
+            length = 1
+        if step is None:
+            return None
+        dx += step[0]
+        dy += step[1]
+        position += length
+    return dx, dy
+
+
+class Viewport:
+    """
+    Visible window of a game grid that is larger than the terminal.
+
+    A scroll step moves the window by half its size, so consecutive windows
+    overlap and the player keeps their bearings.
+    """
+
+    def __init__(
+        self, grid_width: int, grid_height: int, width: int, height: int
+    ) -> None:
+        """
+        Initialize a new viewport in the top left corner of the grid.
+
+        Args:
+            grid_width: Width of the game grid
+            grid_height: Height of the game grid
+            width: Number of visible columns
+            height: Number of visible rows
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.width = max(1, min(width, grid_width))
+        self.height = max(1, min(height, grid_height))
+        self.left = 0
+        self.top = 0
+
+    @classmethod
+    def fit(
+        cls,
+        grid_width: int,
+        grid_height: int,
+        terminal: Tuple[int, int],
+        header_lines: int = 0,
+    ) -> Optional["Viewport"]:
+        """
+        Create a viewport if the grid does not fit into the terminal.
+
+        Args:
+            grid_width: Width of the game grid
+            grid_height: Height of the game grid
+            terminal: Columns and lines of the terminal
+            header_lines: Lines of text shown above the grid (default: 0)
+
+        Returns:
+            A viewport of the terminal size or None if the whole grid fits
+        """
+        columns, lines = terminal
+        label_width = _label_width(0, grid_height)
+        width = (columns - label_width - 4) // 3
+        height = (
+            lines - header_lines - _header_lines(0, grid_width) - 2 - _RESERVED_LINES
+        )
+        if grid_width <= width and grid_height <= height:
+            return None
+        return cls(grid_width, grid_height, width, height)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        """
+        Move the window by a number of steps, staying inside the grid.
+
+        Args:
+            dx: Steps to the right, negative to the left
+            dy: Steps down, negative up
+        """
+        self.move_to(
+            self.left + dx * max(1, self.width // 2),
+            self.top + dy * max(1, self.height // 2),
+        )
+
+    def move_to(self, left: int, top: int) -> None:
+        """
+        Place the top left corner of the window, staying inside the grid.
+
+        Args:
+            left: X-coordinate of the first visible column
+            top: Y-coordinate of the first visible row
+        """
+        self.left = max(0, min(left, self.grid_width - self.width))
+        self.top = max(0, min(top, self.grid_height - self.height))
+
+    def center(self, x: int, y: int) -> None:
+        """
+        Move the window so an area is in its center.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+        """
+        self.move_to(x - self.width // 2, y - self.height // 2)
+
+    def show(self, x: int, y: int) -> None:
+        """
+        Move the window to an area unless the area is already visible.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+        """
+        if not self.contains(x, y):
+            self.center(x, y)
+
+    def command(self, command: str, parse: CoordinateParser) -> bool:
+        """
+        Handle an input line that moves the window instead of scanning.
+
+        Scroll commands are parsed by scroll_steps(), ``g x y`` moves the
+        window to an area. Invalid coordinates are reported to the player.
+
+        Args:
+            command: The input line
+            parse: Parses the coordinates of a ``g`` command
+
+        Returns:
+            True if the input was a viewport command
+        """
+        steps = scroll_steps(command)
+        if steps is not None:
+            self.scroll(*steps)
+            return True
+        name, _, target = command.partition(" ")
+        if name.lower() != "g":
+            return False
+        success, coordinates, error_message = parse(
+            target, self.grid_width, self.grid_height
+        )
+        if success and coordinates is not None:
+            self.center(*coordinates)
+        else:
+            print(error_message or "Invalid coordinates. Please try again.")
+        return True
+
+    def contains(self, x: int, y: int) -> bool:
+        """
+        Check whether an area is visible.
+
+        Args:
+            x: X-coordinate of the area
+            y: Y-coordinate of the area
+
+        Returns:
+            True if the area is inside the window
+        """
+        return (
+            self.left <= x < self.left + self.width
+            and self.top <= y < self.top + self.height
+        )
+
+
+def fit_screen(
+    grid_width: int,
+    grid_height: int,
+    terminal: Optional[Tuple[int, int]],
+    headers: Tuple[str, str],
+    viewport: Optional[Viewport] = None,
+) -> Tuple[str, Viewport]:
+    """
+    Choose the header and the viewport of a grid shown in a terminal.
+
+    The full header is shown if it fits into the terminal together with the
+    whole grid. Otherwise the short header is shown, with a viewport fitted
+    below it if the grid still does not fit.
+
+    Args:
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        terminal: Columns and lines of the terminal or None if unknown
+        headers: The full header, e.g. with instructions, and the short one
+        viewport: Viewport to use instead of a fitted one, shown with the
+            short header unless it contains the whole grid (default: none)
+
+    Returns:
+        The header and the viewport, which shows the whole grid if it fits
+    """
+    full, short = headers
+    size = grid_width, grid_height
+    if viewport is not None:
+        fits = (viewport.width, viewport.height) == size
+        return (full if fits else short), viewport
+    if terminal is None or Viewport.fit(*size, terminal, full.count("\n")) is None:
+        return full, Viewport(*size, *size)
+    viewport = Viewport.fit(*size, terminal, short.count("\n"))
+    return short, viewport or Viewport(*size, *size)
+
+
+class TerminalRenderer:
+    """
+    Renders the game grid with as few terminal writes as possible.
+
+    The first frame clears the screen and draws the header and the grid.
+    Later frames move the cursor to each changed area and overwrite it, then
+    clear everything below the grid. This relies on the frame staying at the
+    top of the screen, so frames taller than the terminal, which scroll it,
+    are always drawn completely. Terminals without ANSI support get the full
+    grid printed every time and the header only once.
+    """
+
+    def __init__(
+        self,
+        header: str = "",
+        stream: Optional[TextIO] = None,
+        ansi: Optional[bool] = None,
+    ) -> None:
+        """
+        Initialize a new renderer.
+
+        Args:
+            header: Text shown above the grid on full frames (default: none)
+            stream: Output stream (default: sys.stdout at render time)
+            ansi: Use ANSI cursor positioning (default: detect from stream)
+        """
+        self.header = header
+        self._stream = stream
+        self._ansi = ansi
+        self._previous: Optional[List[str]] = None
+        self._origin = (0, 0)
+
+    @property
+    def stream(self) -> TextIO:
+        """
+        The stream frames are written to.
+        """
+        return self._stream if self._stream is not None else sys.stdout
+
+    @property
+    def ansi(self) -> bool:
+        """
+        Whether frames are updated with ANSI cursor positioning.
+        """
+        if self._ansi is None:
+            self._ansi = supports_ansi(self.stream)
+        return self._ansi
+
+    def invalidate(self) -> None:
+        """
+        Force the next frame to be drawn completely.
+        """
+        self._previous = None
+
+    def render(self, rows: Sequence[str], left: int = 0, top: int = 0) -> None:
+        """
+        Draw a frame of the game grid with a single write.
+
+        The frame only contains the given rows, so drawing a viewport costs
+        as much as its size, no matter how large the grid is.
+
+        Args:
+            rows: One string per grid row with one character per area
+            left: X-coordinate of the first column (default: 0)
+            top: Y-coordinate of the first row (default: 0)
+        """
+        previous = self._previous
+        if (
+            not self.ansi
+            or previous is None
+            or len(previous) != len(rows)
+            or self._origin != (left, top)
+            or not self._fits(rows, left)
+        ):
+            frame = self._full_frame(
+                rows, left, top, with_header=previous is None or self.ansi
+            )
+        else:
+            frame = self._diff_frame(previous, rows, left, top)
+        self._previous = list(rows)
+        self._origin = (left, top)
+        stream = self.stream
+        stream.write(frame)
+        stream.flush()
+
+    def _fits(self, rows: Sequence[str], left: int) -> bool:
+        """
+        Check whether a frame and the lines kept free below it for the prompt
+        fit into the terminal, so the screen does not scroll.
+
+        Args:
+            rows: One string per grid row
+            left: X-coordinate of the first column
+
+        Returns:
+            True if the frame fits or the terminal size is unknown
+        """
+        size = terminal_size(self.stream)
+        if size is None:
+            return True
+        width = len(rows[0]) if rows else 0
+        height = self.header.count("\n") + _header_lines(left, width) + len(rows) + 2
+        return height + _RESERVED_LINES <= size[1]
+
+    def _full_frame(
+        self, rows: Sequence[str], left: int, top: int, with_header: bool
+    ) -> str:
+        """
+        Build a frame that draws the whole grid.
+
+        Args:
+            rows: One string per grid row
+            left: X-coordinate of the first column
+            top: Y-coordinate of the first row
+            with_header: Draw the header above the grid
+
+        Returns:
+            The frame text
+        """
+        parts = []
+        if self.ansi:
+            parts.append(_CLEAR_SCREEN)
+        if with_header:
+            parts.append(self.header)
+        parts.append("\n".join(format_grid(rows, left, top)) + "\n")
+        return "".join(parts)
+
+    def _diff_frame(
+        self, previous: Sequence[str], rows: Sequence[str], left: int, top: int
+    ) -> str:
+        """
+        Build a frame that only overwrites changed areas.
+
+        Args:
+            previous: Rows of the last drawn frame
+            rows: Rows of the new frame
+            left: X-coordinate of the first column
+            top: Y-coordinate of the first row
+
+        Returns:
+            The frame text
+        """
+        width = len(rows[0]) if rows else 0
+        first_line = self.header.count("\n") + _header_lines(left, width) + 2
+        first_column = _label_width(top, len(rows)) + 4
+        parts = []
+        for y, (old, new) in enumerate(zip(previous, rows)):
+            if old == new:
+                continue
+            for x, (old_cell, new_cell) in enumerate(zip(old, new)):
+                if old_cell != new_cell:
+                    parts.append(
+                        f"\x1b[{first_line + y};{first_column + 3 * x}H{new_cell}"
+                    )
+        parts.append(f"\x1b[{first_line + len(rows) + 1};1H{_CLEAR_BELOW}")
+        return "".join(parts)
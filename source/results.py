@@ -0,0 +1,386 @@
+"""
+Results store for the game 'Abandoned Space Station'.
+
+Records every finished game in a local SQLite database: the board
+configuration, seed, outcome, actions, duration and, if enabled, the
+instrumentation measurements. Records are collected in memory and written
+in batches, one transaction per batch, so simulations finishing thousands
+of games per second do not wait for a commit after every game. Indexes on
+the board configuration and the finish time keep the aggregate queries for
+win rates, percentiles and trends fast as the database grows.
+
+Usage: python source/results.py <database> [summary|trend] [--width W]
+[--height H] [--hazards N] [--period PERIOD] [--json]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+
+# Width, height and hazard count of a game.
+Configuration = Tuple[int, int, int]
+
+# Time buckets of the trend query as SQLite strftime formats.
+PERIODS = {
+    "hour": "%Y-%m-%d %H:00",
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+    "month": "%Y-%m",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    grid_width INTEGER NOT NULL,
+    grid_height INTEGER NOT NULL,
+    hazards INTEGER NOT NULL,
+    seed TEXT,
+    outcome TEXT NOT NULL,
+    actions INTEGER NOT NULL,
+    scanned_areas INTEGER NOT NULL,
+    safe_areas INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    instrumentation TEXT
+);
+CREATE INDEX IF NOT EXISTS games_by_configuration
+    ON games (grid_width, grid_height, hazards, actions);
+CREATE INDEX IF NOT EXISTS games_by_time
+    ON games (grid_width, grid_height, hazards, finished_at);
+"""
+
+_INSERT = """
+INSERT INTO games (
+    finished_at, grid_width, grid_height, hazards, seed, outcome, actions,
+    scanned_areas, safe_areas, duration, instrumentation
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Nearest-rank percentiles of the actions: the smallest value whose rank
+# reaches the share of the games of its configuration.
+_SUMMARY = """
+WITH ranked AS (
+    SELECT grid_width, grid_height, hazards, outcome, actions, duration,
+        ROW_NUMBER() OVER configuration AS rank,
+        COUNT(*) OVER (PARTITION BY grid_width, grid_height, hazards) AS total
+    FROM games {where}
+    WINDOW configuration AS (
+        PARTITION BY grid_width, grid_height, hazards ORDER BY actions
+    )
+)
+SELECT grid_width, grid_height, hazards, COUNT(*),
+    SUM(outcome = 'won'), SUM(outcome = 'lost'),
+    MIN(CASE WHEN rank >= 0.5 * total THEN actions END),
+    MIN(CASE WHEN rank >= 0.9 * total THEN actions END),
+    MIN(CASE WHEN rank >= 0.99 * total THEN actions END),
+    AVG(duration)
+FROM ranked
+GROUP BY grid_width, grid_height, hazards
+ORDER BY grid_width, grid_height, hazards
+"""
+
+_TREND = """
+SELECT strftime(?, finished_at, 'unixepoch') AS period,
+    grid_width, grid_height, hazards, COUNT(*), SUM(outcome = 'won'),
+    AVG(actions)
+FROM games {where}
+GROUP BY grid_width, grid_height, hazards, period
+ORDER BY grid_width, grid_height, hazards, period
+"""
+
+
+@dataclass
+class ConfigurationSummary:
+    """
+    Aggregated results of the games of one board configuration.
+    """
+
+    grid_width: int
+    grid_height: int
+    hazards: int
+    games: int
+    wins: int
+    losses: int
+    p50_actions: int
+    p90_actions: int
+    p99_actions: int
+    mean_duration: float
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Share of games that were won.
+        """
+        return self.wins / self.games if self.games else 0.0
+
+
+@dataclass
+class TrendPoint:
+    """
+    Aggregated results of one board configuration in one time period.
+    """
+
+    period: str
+    grid_width: int
+    grid_height: int
+    hazards: int
+    games: int
+    wins: int
+    mean_actions: float
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Share of games that were won.
+        """
+        return self.wins / self.games if self.games else 0.0
+
+
+def outcome(game: AbandonedSpaceStation) -> str:
+    """
+    Get the outcome of a game.
+
+    Args:
+        game: The game
+
+    Returns:
+        "won", "lost" or "unfinished"
+    """
+    if game.is_victorious:
+        return "won"
+    if game.is_defeated:
+        return "lost"
+    return "unfinished"
+
+
+def _filter(configuration: Optional[Configuration]) -> Tuple[str, Tuple[int, ...]]:
+    """
+    Build the WHERE clause selecting a board configuration.
+
+    Args:
+        configuration: Width, height and hazard count or None for all
+
+    Returns:
+        The clause and its parameters
+    """
+    if configuration is None:
+        return "", ()
+    return "WHERE grid_width = ? AND grid_height = ? AND hazards = ?", configuration
+
+
+class ResultStore:
+    """
+    SQLite database of finished games.
+
+    Recorded games are buffered and written in one transaction per
+    ``batch_size`` games. Queries write the buffer first, so they always see
+    every recorded game. Call close() or use the store as a context manager
+    to write the remaining games.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        """
+        Open or create a results database.
+
+        Args:
+            path: Path of the database file, ":memory:" for a temporary one
+            batch_size: Games written per transaction (default: 1000)
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1.")
+        self.batch_size = batch_size
+        # Worker processes of a simulation may write to the same database,
+        # so wait for their transactions instead of failing.
+        self._connection = sqlite3.connect(path, timeout=30)
+        # The write-ahead log lets readers continue while a batch is written,
+        # and a batch only needs to reach the disk at a checkpoint.
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._pending: List[Tuple[Any, ...]] = []
+
+    def record(
+        self,
+        game: AbandonedSpaceStation,
+        duration: float,
+        finished_at: Optional[float] = None,
+    ) -> None:
+        """
+        Record a game. Written with the next batch.
+
+        Args:
+            game: The game, usually finished
+            duration: Time spent playing the game in seconds
+            finished_at: Unix time the game ended (default: now)
+        """
+        statistics = game.statistics()
+        instrumentation = statistics.get("instrumentation")
+        self._pending.append(
+            (
+                time.time() if finished_at is None else finished_at,
+                game.grid_width,
+                game.grid_height,
+                statistics["hazards"],
+                None if game.seed is None else str(game.seed),
+                outcome(game),
+                game.action_count,
+                statistics["scanned_areas"],
+                statistics["safe_areas"],
+                duration,
+                None if instrumentation is None else json.dumps(instrumentation),
+            )
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all buffered games in one transaction.
+        """
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(_INSERT, self._pending)
+        self._pending.clear()
+
+    def count(self) -> int:
+        """
+        Count the recorded games.
+
+        Returns:
+            Number of games in the database
+        """
+        self.flush()
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM games").fetchone()
+        return int(count)
+
+    def summary(
+        self, configuration: Optional[Configuration] = None
+    ) -> List[ConfigurationSummary]:
+        """
+        Aggregate the games by board configuration.
+
+        Args:
+            configuration: Width, height and hazard count to select
+                (default: all configurations)
+
+        Returns:
+            Win counts, action percentiles and mean duration per configuration
+        """
+        self.flush()
+        where, parameters = _filter(configuration)
+        rows = self._connection.execute(_SUMMARY.format(where=where), parameters)
+        return [ConfigurationSummary(*row) for row in rows]
+
+    def trend(
+        self, configuration: Optional[Configuration] = None, period: str = "day"
+    ) -> List[TrendPoint]:
+        """
+        Aggregate the games by board configuration and time period.
+
+        Args:
+            configuration: Width, height and hazard count to select
+                (default: all configurations)
+            period: "hour", "day", "week" or "month" (default: "day")
+
+        Returns:
+            Win counts and mean actions per configuration and period
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period '{period}'.")
+        self.flush()
+        where, parameters = _filter(configuration)
+        rows = self._connection.execute(
+            _TREND.format(where=where), (PERIODS[period], *parameters)
+        )
+        return [TrendPoint(*row) for row in rows]
+
+    def close(self) -> None:
+        """
+        Write the buffered games and close the database.
+        """
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _as_dict(row: Any) -> Dict[str, Any]:
+    """
+    Convert a query result to a dictionary including the win rate.
+
+    Args:
+        row: A ConfigurationSummary or TrendPoint
+
+    Returns:
+        The fields and the win rate
+    """
+    result = asdict(row)
+    result["win_rate"] = row.win_rate
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line and print aggregated results.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Game results")
+    parser.add_argument("database")
+    parser.add_argument("query", nargs="?", choices=("summary", "trend"))
+    parser.add_argument("--width", type=int, default=None)
+    parser.add_argument("--height", type=int, default=None)
+    parser.add_argument("--hazards", type=int, default=None)
+    parser.add_argument("--period", choices=tuple(PERIODS), default="day")
+    parser.add_argument("--json", action="store_true", help="print JSON lines")
+    args = parser.parse_args(argv)
+
+    selected = (args.width, args.height, args.hazards)
+    configuration: Optional[Configuration] = None
+    if None not in selected:
+        configuration = (args.width, args.height, args.hazards)
+    elif selected != (None, None, None):
+        parser.error("--width, --height and --hazards must be given together")
+
+    with ResultStore(args.database) as store:
+        if args.query == "trend":
+            rows: List[Any] = store.trend(configuration, args.period)
+        else:
+            rows = store.summary(configuration)
+
+    for row in rows:
+        if args.json:
+            print(json.dumps(_as_dict(row)))
+        elif isinstance(row, TrendPoint):
+            print(
+                f"{row.period}  {row.grid_width}x{row.grid_height}/{row.hazards}  "
+                f"{row.games} games  win rate {row.win_rate:.1%}  "
+                f"mean actions {row.mean_actions:.1f}"
+            )
+        else:
+            print(
+                f"{row.grid_width}x{row.grid_height}/{row.hazards}  "
+                f"{row.games} games  win rate {row.win_rate:.1%}  "
+                f"actions p50 {row.p50_actions} p90 {row.p90_actions} "
+                f"p99 {row.p99_actions}  mean duration "
+                f"{row.mean_duration * 1000:.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
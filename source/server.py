@@ -0,0 +1,256 @@
+"""
+Game server for the game 'Abandoned Space Station'.
+
+Hosts one game per TCP connection with asyncio, so a single process can
+serve thousands of remote bots. The protocol is line based:
+
+- the server greets every connection with ``NEW <width> <height> <hazards>``
+- the client sends ``x y`` to scan an area, ``new`` for a new game or ``q``
+  to quit
+- the server answers a move with ``OK``, ``WIN`` or ``LOSE``, followed by
+  the changed areas as ``x,y,value`` (value is the number of adjacent
+  hazards or ``H``), and answers invalid input with ``ERR <message>``
+
+Usage: python source/server.py [--host HOST] [--port PORT] [--width W]
+[--height H] [--hazards N]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.helpers import process_coordinates
+from exam.source.instrumentation import LatencyHistogram
+
+# Longest accepted input line in bytes.
+_LINE_LIMIT = 256
+
+
+class GameServer:
+    """
+    Asyncio TCP server with one game per connection.
+
+    Games are created in compact mode, so an idle session only holds the
+    board tables, the game object and the connection's stream buffers.
+    Answers contain only the areas changed by a move instead of the whole
+    grid. The server measures the processing time of every move.
+    """
+
+    def __init__(
+        self,
+        grid_width: int = 5,
+        grid_height: int = 5,
+        hazard_count: int = 5,
+        auto_reveal: bool = True,
+    ) -> None:
+        """
+        Initialize a new game server.
+
+        Args:
+            grid_width: Width of the game grid (default: 5)
+            grid_height: Height of the game grid (default: 5)
+            hazard_count: Number of hazards on the game grid (default: 5)
+            auto_reveal: Open regions without adjacent hazards automatically
+                (default: True)
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.hazard_count = hazard_count
+        self.auto_reveal = auto_reveal
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.moves = 0
+        self.latency = LatencyHistogram()
+
+    def new_game(self) -> Tuple[AbandonedSpaceStation, bytes]:
+        """
+        Create the game of a session.
+
+        Returns:
+            The game and the greeting line announcing it
+        """
+        game = AbandonedSpaceStation(
+            self.grid_width,
+            self.grid_height,
+            self.hazard_count,
+            compact=True,
+            verbose=False,
+        )
+        greeting = f"NEW {self.grid_width} {self.grid_height} {self.hazard_count}\n"
+        return game, greeting.encode()
+
+    def _move(self, game: AbandonedSpaceStation, x: int, y: int) -> str:
+        """
+        Make a move and describe the changed areas.
+
+        Args:
+            game: The game of the session
+            x: X-coordinate
+            y: Y-coordinate
+
+        Returns:
+            The answer line
+        """
+        if game.is_defeated or game.is_victorious:
+            return "ERR The game is over. Send 'new' for a new game.\n"
+        if (x, y) in game.scanned_areas:
+            return "ERR This area has already been scanned.\n"
+
+        if self.auto_reveal:
+            revealed = game.reveal_area(x, y)
+        else:
+            game.scan_area(x, y)
+            revealed = [(x, y)]
+        # The grid reads single areas, so a sparse hazard index is not
+        # converted to a table on every move.
+        grid = game.grid
+        cells = [f"{cx},{cy},{grid[cy][cx]}" for cx, cy in revealed]
+        if game.is_defeated:
+            status = "LOSE"
+        elif game.is_victorious:
+            status = "WIN"
+        else:
+            status = "OK"
+        return " ".join([status, *cells]) + "\n"
+
+    def answer(self, game: AbandonedSpaceStation, line: str) -> Optional[str]:
+        """
+        Process a line of input.
+
+        Args:
+            game: The game of the session
+            line: The input line without line break
+
+        Returns:
+            The answer line or None if the client quits
+        """
+        success, coordinates, error_message = process_coordinates(
+            line, self.grid_width, self.grid_height
+        )
+        if not success:
+            return f"ERR {error_message}\n"
+        if coordinates is None:
+            return None
+        self.moves += 1
+        return self._move(game, *coordinates)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve a connection until the client quits or disconnects.
+
+        Args:
+            reader: Stream of the client input
+            writer: Stream to the client
+        """
+        self.active_sessions += 1
+        self.total_sessions += 1
+        game, greeting = self.new_game()
+        clock = time.perf_counter_ns
+        try:
+            writer.write(greeting)
+            while True:
+                data = await reader.readline()
+                if not data:
+                    break
+                start = clock()
+                line = data.decode("utf-8", "replace").strip()
+                if line.lower() == "new":
+                    game, answer = self.new_game()
+                else:
+                    text = self.answer(game, line)
+                    if text is None:
+                        writer.write(b"BYE\n")
+                        break
+                    answer = text.encode()
+                self.latency.record(clock() - start)
+                writer.write(answer)
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            # Waiting tears the transport down now; a client that already
+            # disconnected makes this fail, which is no longer of interest.
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """
+        Start listening for connections.
+
+        Args:
+            host: Address to listen on (default: localhost)
+            port: Port to listen on (default: any free port)
+
+        Returns:
+            The running asyncio server
+        """
+        return await asyncio.start_server(
+            self.handle, host, port, limit=_LINE_LIMIT, backlog=4096
+        )
+
+    def summary(self) -> List[str]:
+        """
+        Summarize the sessions and move latencies.
+
+        Returns:
+            The summary lines
+        """
+        return [
+            f"Sessions: {self.total_sessions} ({self.active_sessions} active)",
+            f"Moves: {self.moves}",
+            f"Move latency: p50 <= {self.latency.percentile(0.5) / 1000:.1f} us, "
+            f"p99 <= {self.latency.percentile(0.99) / 1000:.1f} us, "
+            f"max {self.latency.maximum / 1000:.1f} us",
+        ]
+
+
+async def serve(server: GameServer, host: str, port: int) -> None:
+    """
+    Run a game server until it is cancelled.
+
+    Args:
+        server: The game server
+        host: Address to listen on
+        port: Port to listen on
+    """
+    listener = await server.start(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Serving on {addresses}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line and run the server.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Abandoned Space Station server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--width", type=int, default=5)
+    parser.add_argument("--height", type=int, default=5)
+    parser.add_argument("--hazards", type=int, default=5)
+    args = parser.parse_args(argv)
+    server = GameServer(args.width, args.height, args.hazards)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n".join(server.summary()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Headless simulation engine for the game 'Abandoned Space Station'.
+
+Runs many games without any terminal interaction and aggregates the
+results, optionally spread across a pool of worker processes and recorded
+game by game in a results database.
+"""
+
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+
+if TYPE_CHECKING:
+    # Only needed for type hints; sqlite3 is only loaded by workers that
+    # record results.
+    from exam.source.results import ResultStore
+
+# A move policy picks the next area to scan. Policies used with worker
+# processes must be defined at module level so they can be pickled.
+Policy = Callable[[AbandonedSpaceStation, random.Random], Tuple[int, int]]
+
+
+def random_policy(game: AbandonedSpaceStation, rng: random.Random) -> Tuple[int, int]:
+    """
+    Pick a random area that has not been scanned yet.
+
+    Args:
+        game: The running game
+        rng: Random generator of the simulation
+
+    Returns:
+        Coordinates of the area to scan
+    """
+    scanned = game.scanned_areas
+    while True:
+        position = (rng.randrange(game.grid_width), rng.randrange(game.grid_height))
+        if position not in scanned:
+            return position
+
+
+@dataclass
+class SimulationResult:
+    """
+    Aggregated results of a number of simulated games.
+    """
+
+    games: int = 0
+    wins: int = 0
+    losses: int = 0
+    unfinished: int = 0
+    total_actions: int = 0
+    min_actions: int = 0
+    max_actions: int = 0
+    game_time: float = 0.0
+    wall_time: float = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Share of games that were won.
+        """
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_actions(self) -> float:
+        """
+        Average number of actions per game.
+        """
+        return self.total_actions / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """
+        Simulated games per second of wall time.
+        """
+        return self.games / self.wall_time if self.wall_time > 0 else 0.0
+
+    def add_game(self, game: AbandonedSpaceStation, duration: float) -> None:
+        """
+        Add the outcome of a finished game.
+
+        Args:
+            game: The finished game
+            duration: Time spent playing the game in seconds
+        """
+        if self.games == 0 or game.action_count < self.min_actions:
+            self.min_actions = game.action_count
+        self.max_actions = max(self.max_actions, game.action_count)
+        self.games += 1
+        if game.is_victorious:
+            self.wins += 1
+        elif game.is_defeated:
+            self.losses += 1
+        else:
+            self.unfinished += 1
+        self.total_actions += game.action_count
+        self.game_time += duration
+
+    def merge(self, other: "SimulationResult") -> None:
+        """
+        Add the results of another simulation run.
+
+        Args:
+            other: Results to add
+        """
+        if other.games == 0:
+            return
+        if self.games == 0 or other.min_actions < self.min_actions:
+            self.min_actions = other.min_actions
+        self.max_actions = max(self.max_actions, other.max_actions)
+        self.games += other.games
+        self.wins += other.wins
+        self.losses += other.losses
+        self.unfinished += other.unfinished
+        self.total_actions += other.total_actions
+        self.game_time += other.game_time
+
+
+def play_headless(
+    game: AbandonedSpaceStation,
+    policy: Policy,
+    rng: random.Random,
+    auto_reveal: bool = True,
+) -> None:
+    """
+    Play a game to the end without any terminal output.
+
+    Every valid move scans at least one area, so the game stops after at
+    most one move per area even if the policy keeps choosing scanned areas.
+
+    Args:
+        game: The game to play
+        policy: Move policy choosing the areas to scan
+        rng: Random generator passed to the policy
+        auto_reveal: Open regions without adjacent hazards automatically
+    """
+    game.verbose = False
+    scan = game.reveal_area if auto_reveal else game.scan_area
+    for _ in range(game.grid_width * game.grid_height):
+        if game.is_defeated or game.is_victorious:
+            return
+        scan(*policy(game, rng))
+
+
+def _play_batch(
+    task: Tuple[int, int, int, int, Policy, int, bool],
+    store: Optional["ResultStore"],
+) -> SimulationResult:
+    """
+    Simulate a batch of games.
+
+    Args:
+        task: Number of games, grid width, grid height, hazard count,
+            policy, batch seed and auto reveal flag
+        store: Store recording every game or None
+
+    Returns:
+        Results of the batch
+    """
+    games, grid_width, grid_height, hazard_count, policy, seed, auto_reveal = task
+    rng = random.Random(seed)
+    result = SimulationResult()
+    start = time.perf_counter()
+    for _ in range(games):
+        game_start = time.perf_counter()
+        # Headless games only need the compact tables, not the grid lists.
+        game = AbandonedSpaceStation(
+            grid_width,
+            grid_height,
+            hazard_count,
+            seed=rng.getrandbits(64),
+            compact=True,
+            verbose=False,
+        )
+        play_headless(game, policy, rng, auto_reveal)
+        duration = time.perf_counter() - game_start
+        result.add_game(game, duration)
+        if store is not None:
+            store.record(game, duration)
+    result.wall_time = time.perf_counter() - start
+    return result
+
+
+def _run_batch(
+    task: Tuple[int, int, int, int, Policy, int, bool, Optional[str]],
+) -> SimulationResult:
+    """
+    Simulate a batch of games in a worker.
+
+    Args:
+        task: Number of games, grid width, grid height, hazard count,
+            policy, batch seed, auto reveal flag and path of the results
+            database or None
+
+    Returns:
+        Results of the batch
+    """
+    batch, path = task[:-1], task[-1]
+    if path is None:
+        return _play_batch(batch, None)
+    # pylint: disable-next=import-outside-toplevel
+    from exam.source.results import ResultStore
+
+    with ResultStore(path) as store:
+        return _play_batch(batch, store)
+
+
+def run_simulations(  # pylint: disable=too-many-arguments
+    games: int,
+    grid_width: int = 5,
+    grid_height: int = 5,
+    hazard_count: int = 5,
+    policy: Policy = random_policy,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    auto_reveal: bool = True,
+    batch_size: Optional[int] = None,
+    results: Optional[str] = None,
+) -> SimulationResult:
+    """
+    Simulate a number of games and aggregate the results.
+
+    The games are split into batches with their own seeds derived from
+    ``seed``. With a fixed batch size the results therefore do not depend on
+    the number of workers.
+
+    Args:
+        games: Number of games to simulate
+        grid_width: Width of the game grid (default: 5)
+        grid_height: Height of the game grid (default: 5)
+        hazard_count: Number of hazards on the game grid (default: 5)
+        policy: Move policy (default: random unscanned area)
+        workers: Number of worker processes, 1 runs in the calling process
+            (default: number of CPUs)
+        seed: Seed for reproducible runs (default: random)
+        auto_reveal: Open regions without adjacent hazards automatically
+            (default: True)
+        batch_size: Games per batch (default: four batches per worker)
+        results: Path of a results database recording every game, written
+            by each worker in batched transactions (default: none)
+
+    Returns:
+        Aggregated results of all games
+    """
+    workers = workers or os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = max(1, math.ceil(games / (workers * 4)))
+    seeds = random.Random(seed)
+    tasks = [
+        (
+            min(batch_size, games - first),
+            grid_width,
+            grid_height,
+            hazard_count,
+            policy,
+            seeds.getrandbits(64),
+            auto_reveal,
+            results,
+        )
+        for first in range(0, games, batch_size)
+    ]
+
+    result = SimulationResult(wall_time=-time.perf_counter())
+    if workers == 1:
+        for batch_result in map(_run_batch, tasks):
+            result.merge(batch_result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch_result in executor.map(_run_batch, tasks):
+                result.merge(batch_result)
+    result.wall_time += time.perf_counter()
+    return result
@@ -0,0 +1,475 @@
+"""
+Deterministic solver for the game 'Abandoned Space Station'.
+
+Deduces safe areas and hazards from the revealed numbers in the game grid
+and plays the safe areas. The solver is incremental: after a move only the
+constraints around the newly revealed areas are examined again.
+"""
+
+import functools
+import os
+import random
+import sys
+from array import array
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Set, Tuple
+from weakref import WeakKeyDictionary
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+
+UNKNOWN = 0
+SAFE = 1
+HAZARD = 2
+
+
+@functools.lru_cache(maxsize=8)
+def neighbor_table(width: int, height: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Get the flat indices of the neighbors of every area of a grid.
+
+    The table is shared by all solvers of the same grid size, so solving
+    many boards of one size computes it only once.
+
+    Args:
+        width: Width of the game grid
+        height: Height of the game grid
+
+    Returns:
+        Neighbor indices by flat index of the area
+    """
+    table = []
+    for y in range(height):
+        rows = range(max(y - 1, 0) * width, min(y + 2, height) * width, width)
+        for x in range(width):
+            index = y * width + x
+            table.append(
+                tuple(
+                    row + nx
+                    for row in rows
+                    for nx in range(max(x - 1, 0), min(x + 2, width))
+                    if row + nx != index
+                )
+            )
+    return tuple(table)
+
+
+class ConstraintSolver:
+    """
+    Incremental constraint propagation over the revealed numbers of a game.
+
+    Every revealed number is a constraint: the number of hazards among its
+    unknown neighbors equals the number minus the known hazards around it.
+    Constraints that still have unknown neighbors are kept in ``active``.
+    The solver applies two rules to these constraints:
+
+    - single area: if no hazards remain, all unknown neighbors are safe; if
+      as many hazards remain as there are unknown neighbors, all are hazards
+    - subset: if the unknown neighbors of one constraint are a subset of
+      another's, the difference holds the difference of the remaining hazards
+
+    Every revealed and every deduced area is appended to a log, so the
+    solver can return to an earlier state with snapshot() and restore()
+    instead of reading the board again.
+    """
+
+    def __init__(self, game: AbandonedSpaceStation) -> None:
+        """
+        Initialize a solver and read all areas revealed so far.
+
+        Args:
+            game: The game to solve
+        """
+        self.game = game
+        self.grid_width = game.grid_width
+        self.grid_height = game.grid_height
+        area_count = self.grid_width * self.grid_height
+        self._values = bytearray(area_count)
+        self._revealed = bytearray(area_count)
+        self.state = bytearray(area_count)
+        self.safe_moves: Deque[int] = deque()
+        self.known_hazards: Set[int] = set()
+        self.active: Set[int] = set()
+        self.undecided = area_count
+        self.last_move: Optional[Tuple[int, int]] = None
+        self._pending: Deque[int] = deque()
+        self._queued = bytearray(area_count)
+        # Flat indices of deduced areas and, as ~index, of revealed areas.
+        self._log = array("q")
+        self._neighbor_table = neighbor_table(self.grid_width, self.grid_height)
+        self.update(
+            (x, y)
+            for y, row in enumerate(game.grid)
+            for x, cell in enumerate(row)
+            if cell.isdigit()
+        )
+
+    def _neighbors(self, index: int) -> Tuple[int, ...]:
+        """
+        Get the flat indices of all neighbors of an area.
+
+        Args:
+            index: Flat index of the area
+
+        Returns:
+            Flat indices of the neighbors
+        """
+        return self._neighbor_table[index]
+
+    def _enqueue(self, index: int) -> None:
+        """
+        Schedule a revealed area for examination.
+
+        Args:
+            index: Flat index of the area
+        """
+        if self._revealed[index] and not self._queued[index]:
+            self._queued[index] = 1
+            self._pending.append(index)
+
+    def update(self, cells: Iterable[Tuple[int, int]]) -> None:
+        """
+        Add newly revealed areas and propagate all resulting deductions.
+
+        Args:
+            cells: Coordinates of the newly revealed areas
+        """
+        grid = self.game.grid
+        for x, y in cells:
+            index = y * self.grid_width + x
+            cell = grid[y][x]
+            if self._revealed[index] or not cell.isdigit():
+                continue
+            self._revealed[index] = 1
+            self._values[index] = int(cell)
+            if self.state[index] == UNKNOWN:
+                self.undecided -= 1
+                self._log.append(index)
+            self.state[index] = SAFE
+            self._log.append(~index)
+            self._enqueue(index)
+            for neighbor in self._neighbors(index):
+                self._enqueue(neighbor)
+        self._propagate()
+
+    def observe(self, x: int, y: int) -> None:
+        """
+        Read the areas revealed by a move from the game grid.
+
+        Follows areas without adjacent hazards from the scanned area, so
+        regions opened by an automatic reveal are picked up as well.
+
+        Args:
+            x: X-coordinate of the scanned area
+            y: Y-coordinate of the scanned area
+        """
+        grid = self.game.grid
+        width = self.grid_width
+        found: List[Tuple[int, int]] = []
+        seen = {y * width + x}
+        queue = deque(seen)
+        while queue:
+            index = queue.popleft()
+            cy, cx = divmod(index, width)
+            cell = grid[cy][cx]
+            if self._revealed[index] or not cell.isdigit():
+                continue
+            found.append((cx, cy))
+            if cell == "0":
+                for neighbor in self._neighbors(index):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        queue.append(neighbor)
+        self.update(found)
+
+    def constraint(self, index: int) -> Tuple[List[int], int]:
+        """
+        Get the open part of the constraint of a revealed area.
+
+        Args:
+            index: Flat index of a revealed area
+
+        Returns:
+            Unknown neighbors and the number of hazards among them
+        """
+        unknown = []
+        remaining = self._values[index]
+        state = self.state
+        for neighbor in self._neighbors(index):
+            if state[neighbor] == UNKNOWN:
+                unknown.append(neighbor)
+            elif state[neighbor] == HAZARD:
+                remaining -= 1
+        return unknown, remaining
+
+    def _mark(self, cells: Iterable[int], value: int) -> None:
+        """
+        Record deduced areas and schedule the constraints that touch them.
+
+        Args:
+            cells: Flat indices of the deduced areas
+            value: SAFE or HAZARD
+        """
+        for index in cells:
+            if self.state[index] != UNKNOWN:
+                continue
+            self.state[index] = value
+            self.undecided -= 1
+            self._log.append(index)
+            if value == SAFE:
+                self.safe_moves.append(index)
+            else:
+                self.known_hazards.add(index)
+            for neighbor in self._neighbors(index):
+                self._enqueue(neighbor)
+
+    def _propagate(self) -> None:
+        """
+        Examine scheduled constraints until no further deduction is possible.
+        """
+        while self._pending:
+            index = self._pending.popleft()
+            self._queued[index] = 0
+            unknown, remaining = self.constraint(index)
+            if not unknown:
+                self.active.discard(index)
+                continue
+            self.active.add(index)
+            if remaining == 0:
+                self._mark(unknown, SAFE)
+            elif remaining == len(unknown):
+                self._mark(unknown, HAZARD)
+            else:
+                self._examine_pairs(index, set(unknown), remaining)
+
+    def _examine_pairs(self, index: int, unknown: Set[int], remaining: int) -> None:
+        """
+        Apply the subset rule between a constraint and all nearby constraints.
+
+        Args:
+            index: Flat index of the revealed area
+            unknown: Unknown neighbors of the area
+            remaining: Hazards among the unknown neighbors
+        """
+        width = self.grid_width
+        y, x = divmod(index, width)
+        for ny in range(max(y - 2, 0), min(y + 3, self.grid_height)):
+            for nx in range(max(x - 2, 0), min(x + 3, width)):
+                other = ny * width + nx
+                if other == index or not self._revealed[other]:
+                    continue
+                other_list, other_remaining = self.constraint(other)
+                other_unknown = set(other_list)
+                if not other_unknown or other_unknown == unknown:
+                    continue
+                if unknown < other_unknown:
+                    deduced = self._apply_subset(
+                        other_unknown - unknown, other_remaining - remaining
+                    )
+                elif other_unknown < unknown:
+                    deduced = self._apply_subset(
+                        unknown - other_unknown, remaining - other_remaining
+                    )
+                else:
+                    deduced = False
+                if deduced:
+                    # The deduction scheduled this constraint again.
+                    return
+
+    def _apply_subset(self, difference: Set[int], hazards: int) -> bool:
+        """
+        Resolve the areas of a constraint that are not part of a subset.
+
+        Args:
+            difference: Areas outside the subset
+            hazards: Number of hazards among them
+
+        Returns:
+            True if the areas could be resolved
+        """
+        if hazards == 0:
+            self._mark(difference, SAFE)
+            return True
+        if hazards == len(difference):
+            self._mark(difference, HAZARD)
+            return True
+        return False
+
+    def next_safe_move(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the next area that is known to be safe and not revealed yet.
+
+        Returns:
+            Coordinates of a safe area or None if no safe move is known
+        """
+        while self.safe_moves:
+            index = self.safe_moves[0]
+            if not self._revealed[index]:
+                y, x = divmod(index, self.grid_width)
+                return x, y
+            self.safe_moves.popleft()
+        return None
+
+    def unknown_areas(self) -> List[Tuple[int, int]]:
+        """
+        Get all areas that are neither revealed nor deduced.
+
+        Returns:
+            Coordinates of the undecided areas
+        """
+        width = self.grid_width
+        return [
+            (index % width, index // width)
+            for index, value in enumerate(self.state)
+            if value == UNKNOWN
+        ]
+
+    def random_unknown_area(self, rng: random.Random) -> Tuple[int, int]:
+        """
+        Pick a random area that is neither revealed nor deduced, for guessing.
+
+        Tries a few random draws before falling back to a full scan, so a
+        guess is cheap as long as undecided areas are common.
+
+        Args:
+            rng: Random generator
+
+        Returns:
+            Coordinates of an undecided area
+        """
+        state = self.state
+        for _ in range(16):
+            index = rng.randrange(len(state))
+            if state[index] == UNKNOWN:
+                return index % self.grid_width, index // self.grid_width
+        return rng.choice(self.unknown_areas())
+
+    def snapshot(self) -> int:
+        """
+        Mark the current state so it can be restored later.
+
+        Returns:
+            The snapshot, the number of revealed and deduced areas so far
+        """
+        return len(self._log)
+
+    def restore(self, snapshot: int) -> None:
+        """
+        Return to an earlier state, e.g. after the board changed.
+
+        Takes back the areas revealed and deduced since the snapshot. The
+        deductions kept only depend on the areas that stay revealed, so they
+        remain valid as long as the numbers of these areas did not change.
+
+        Args:
+            snapshot: Snapshot taken by snapshot() on this solver
+
+        Raises:
+            ValueError: If the snapshot is later than the current state
+        """
+        log = self._log
+        if snapshot > len(log):
+            raise ValueError("The snapshot is later than the solver's state.")
+        state = self.state
+        revealed = self._revealed
+        hidden: List[int] = []
+        undecided: List[int] = []
+        for entry in reversed(log[snapshot:]):
+            if entry < 0:
+                hidden.append(~entry)
+                revealed[~entry] = 0
+                self._values[~entry] = 0
+            else:
+                if state[entry] == HAZARD:
+                    self.known_hazards.discard(entry)
+                state[entry] = UNKNOWN
+                undecided.append(entry)
+        del log[snapshot:]
+        self.undecided += len(undecided)
+        # Revealed areas next to an area that is undecided again have an open
+        # constraint again, hidden areas none.
+        self.active.difference_update(hidden)
+        for index in undecided:
+            self.active.update(
+                neighbor for neighbor in self._neighbors(index) if revealed[neighbor]
+            )
+        self.safe_moves = deque(
+            dict.fromkeys(
+                index
+                for index in (*self.safe_moves, *hidden)
+                if state[index] == SAFE and not revealed[index]
+            )
+        )
+
+    def step(self) -> Optional[List[Tuple[int, int]]]:
+        """
+        Play the next safe move, if one is known.
+
+        Returns:
+            The revealed areas or None if no safe move is known
+        """
+        move = self.next_safe_move()
+        if move is None:
+            return None
+        revealed = self.game.reveal_area(*move)
+        self.update(revealed)
+        return revealed
+
+    def solve(self) -> int:
+        """
+        Play safe moves until the game is won or no safe move is left.
+
+        Returns:
+            Number of moves played
+        """
+        moves = 0
+        while not self.game.is_victorious and self.step() is not None:
+            moves += 1
+        return moves
+
+
+# Solvers following the games played through a policy.
+_SOLVERS: "WeakKeyDictionary[AbandonedSpaceStation, ConstraintSolver]" = (
+    WeakKeyDictionary()
+)
+
+
+def tracked_solver(game: AbandonedSpaceStation) -> ConstraintSolver:
+    """
+    Get the solver following a game that is played through a policy.
+
+    The solver is created on first use and reads the areas revealed by the
+    last move chosen through ``last_move``.
+
+    Args:
+        game: The running game
+
+    Returns:
+        The up-to-date solver of the game
+    """
+    solver = _SOLVERS.get(game)
+    if solver is None:
+        solver = ConstraintSolver(game)
+        _SOLVERS[game] = solver
+    elif solver.last_move is not None:
+        solver.observe(*solver.last_move)
+    return solver
+
+
+def solver_policy(game: AbandonedSpaceStation, rng: random.Random) -> Tuple[int, int]:
+    """
+    Move policy for the simulation engine that plays deduced safe areas and
+    guesses a random undecided area when no deduction is possible.
+
+    Args:
+        game: The running game
+        rng: Random generator used for guesses
+
+    Returns:
+        Coordinates of the area to scan
+    """
+    solver = tracked_solver(game)
+    move = solver.next_safe_move() or solver.random_unknown_area(rng)
+    solver.last_move = move
+    return move
@@ -0,0 +1,288 @@
+"""
+Vectorized multi-board engine for the game 'Abandoned Space Station'.
+
+Keeps a whole batch of boards in NumPy arrays of shape (boards, height,
+width), so hazard placement, adjacency counting and scanning run as array
+operations over all boards at once instead of one Python call per area.
+Intended for bulk simulation; NumPy is an optional dependency that is only
+needed for this module.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+
+# Boards simulated at once by simulate_random(), bounding the memory use to
+# a few bytes per area of a chunk.
+CHUNK_SIZE = 10000
+
+
+def place_hazards(
+    rng: np.random.Generator,
+    boards: int,
+    grid_width: int,
+    grid_height: int,
+    hazard_count: int,
+) -> np.ndarray:
+    """
+    Place hazards on a batch of boards.
+
+    Every board gets exactly ``hazard_count`` hazards at distinct random
+    positions: each area draws a random key and the areas with the smallest
+    keys receive the hazards, which samples without replacement for all
+    boards in one operation.
+
+    Args:
+        rng: NumPy random generator
+        boards: Number of boards
+        grid_width: Width of the game grid
+        grid_height: Height of the game grid
+        hazard_count: Number of hazards per board
+
+    Returns:
+        Boolean array of shape (boards, height, width), True for hazards
+    """
+    area_count = grid_width * grid_height
+    if not 0 <= hazard_count <= area_count:
+        raise ValueError("Number of hazards exceeds the number of areas.")
+    hazards = np.zeros((boards, area_count), dtype=bool)
+    if 0 < hazard_count < area_count:
+        keys = rng.random((boards, area_count))
+        positions = np.argpartition(keys, hazard_count - 1, axis=1)[:, :hazard_count]
+        np.put_along_axis(hazards, positions, True, axis=1)
+    elif hazard_count == area_count:
+        hazards[:] = True
+    return hazards.reshape((boards, grid_height, grid_width))
+
+
+def adjacent_counts(hazards: np.ndarray) -> np.ndarray:
+    """
+    Count the adjacent hazards of every area of every board.
+
+    Sums the eight shifted copies of the zero-padded hazard array, which is
+    a convolution with a 3x3 kernel without its center. Like
+    ``AbandonedSpaceStation.count_adjacent_hazards``, hazard areas count 0.
+
+    Args:
+        hazards: Boolean array of shape (boards, height, width)
+
+    Returns:
+        Array of shape (boards, height, width) with the counts as uint8
+    """
+    boards, height, width = hazards.shape
+    padded = np.zeros((boards, height + 2, width + 2), dtype=np.uint8)
+    padded[:, 1:-1, 1:-1] = hazards
+    counts = np.zeros((boards, height, width), dtype=np.uint8)
+    for dy in range(3):
+        for dx in range(3):
+            if dy != 1 or dx != 1:
+                counts += padded[:, dy : dy + height, dx : dx + width]
+    counts[hazards] = 0
+    return counts
+
+
+class BoardBatch:
+    """
+    A batch of games with the same size, played in lockstep.
+
+    Every call of scan() makes at most one move per board, following the
+    rules of ``AbandonedSpaceStation.scan_area``: moves outside the grid,
+    on scanned areas or on finished boards are ignored, a hazard ends the
+    board with a defeat and scanning all safe areas with a victory.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        boards: int,
+        grid_width: int,
+        grid_height: int,
+        hazard_count: int,
+        *,
+        seed: Union[None, int, np.random.Generator] = None,
+    ) -> None:
+        """
+        Initialize a batch of new games.
+
+        Args:
+            boards: Number of boards
+            grid_width: Width of the game grid
+            grid_height: Height of the game grid
+            hazard_count: Number of hazards per board
+            seed: Seed or NumPy random generator (default: random)
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.hazard_count = hazard_count
+        self.rng = np.random.default_rng(seed)
+        self.hazards = place_hazards(
+            self.rng, boards, grid_width, grid_height, hazard_count
+        )
+        self.counts = adjacent_counts(self.hazards)
+        self.scanned = np.zeros_like(self.hazards)
+        self.scanned_count = np.zeros(boards, dtype=np.int64)
+        self.action_count = np.zeros(boards, dtype=np.int64)
+        self.is_defeated = np.zeros(boards, dtype=bool)
+        self.is_victorious = np.zeros(boards, dtype=bool)
+        self._safe_areas = grid_width * grid_height - hazard_count
+
+    def __len__(self) -> int:
+        return len(self.hazards)
+
+    @property
+    def is_finished(self) -> np.ndarray:
+        """
+        Boards that have been won or lost.
+        """
+        return self.is_defeated | self.is_victorious
+
+    def scan(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Scan one area on every board.
+
+        Args:
+            xs: X-coordinate per board
+            ys: Y-coordinate per board
+
+        Returns:
+            Boolean array, True for boards where the move counted as an
+            action
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        valid = (
+            ~self.is_finished
+            & (xs >= 0)
+            & (xs < self.grid_width)
+            & (ys >= 0)
+            & (ys < self.grid_height)
+        )
+        boards = np.flatnonzero(valid)
+        x, y = xs[boards], ys[boards]
+        fresh = ~self.scanned[boards, y, x]
+        boards, x, y = boards[fresh], x[fresh], y[fresh]
+        self.action_count[boards] += 1
+
+        hit = self.hazards[boards, y, x]
+        self.is_defeated[boards[hit]] = True
+        safe = boards[~hit]
+        self.scanned[safe, y[~hit], x[~hit]] = True
+        self.scanned_count[safe] += 1
+        self.is_victorious[safe] = self.scanned_count[safe] == self._safe_areas
+
+        counted = np.zeros(len(self), dtype=bool)
+        counted[boards] = True
+        return counted
+
+    def random_moves(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pick a random unscanned area on every board.
+
+        Returns:
+            X- and Y-coordinates per board
+        """
+        keys = self.rng.random(self.scanned.shape)
+        keys[self.scanned] = -1.0
+        positions = keys.reshape(len(self), -1).argmax(axis=1)
+        ys, xs = np.divmod(positions, self.grid_width)
+        return xs, ys
+
+    def game(self, index: int, verbose: bool = False) -> AbandonedSpaceStation:
+        """
+        Create a regular game with the hazards of one board.
+
+        Args:
+            index: Index of the board
+            verbose: Print messages for rejected scans (default: False)
+
+        Returns:
+            The game, nothing scanned yet
+        """
+        game = AbandonedSpaceStation(
+            self.grid_width, self.grid_height, 0, verbose=verbose
+        )
+        ys, xs = np.nonzero(self.hazards[index])
+        game.hazard_locations = set(zip(xs.tolist(), ys.tolist()))
+        game.hazard_count = self.hazard_count
+        return game
+
+
+@dataclass
+class BatchResult:
+    """
+    Aggregated results of the boards simulated by simulate_random().
+    """
+
+    games: int = 0
+    wins: int = 0
+    losses: int = 0
+    total_actions: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Share of games that were won.
+        """
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_actions(self) -> float:
+        """
+        Average number of actions per game.
+        """
+        return self.total_actions / self.games if self.games else 0.0
+
+
+def simulate_random(
+    games: int,
+    grid_width: int = 5,
+    grid_height: int = 5,
+    hazard_count: int = 5,
+    seed: Optional[int] = None,
+) -> BatchResult:
+    """
+    Play games with random moves until every board is finished.
+
+    The games are played in chunks of CHUNK_SIZE boards, one vectorized
+    scan per step and chunk, until every board of the chunk is finished.
+
+    Args:
+        games: Number of games
+        grid_width: Width of the game grid (default: 5)
+        grid_height: Height of the game grid (default: 5)
+        hazard_count: Number of hazards on the game grid (default: 5)
+        seed: Seed for reproducible runs (default: random)
+
+    Returns:
+        Aggregated results of all games
+    """
+    rng = np.random.default_rng(seed)
+    result = BatchResult()
+    for first in range(0, games, CHUNK_SIZE):
+        batch = BoardBatch(
+            min(CHUNK_SIZE, games - first),
+            grid_width,
+            grid_height,
+            hazard_count,
+            seed=rng,
+        )
+        # Scanning never reveals more than the chosen area, so picking a
+        # random unscanned area every step is the same as scanning the
+        # areas in a random order drawn once per board.
+        order = batch.rng.random((len(batch), grid_width * grid_height)).argsort(axis=1)
+        for step in range(order.shape[1]):
+            if batch.is_finished.all():
+                break
+            ys, xs = np.divmod(order[:, step], grid_width)
+            batch.scan(xs, ys)
+        result.games += len(batch)
+        result.wins += int(batch.is_victorious.sum())
+        result.losses += int(batch.is_defeated.sum())
+        result.total_actions += int(batch.action_count.sum())
+    return result
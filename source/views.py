@@ -0,0 +1,241 @@
+"""
+Lazy board views for the game 'Abandoned Space Station'.
+
+Provides read-only views that expose the compact board tables through the
+familiar grid, hazard and scan set interfaces.
+"""
+
+import mmap
+import re
+from collections.abc import Set as AbstractSet, Sequence
+from typing import Iterator, Tuple, Union, overload, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from exam.source.hazard_index import SparseCounts
+
+# Layout of a cell in the adjacency count table: the low nibble holds the
+# number of adjacent hazards, the flags mark hazards and triggered hazards.
+COUNT_MASK = 0x0F
+HAZARD_FLAG = 0x10
+TRIGGERED_FLAG = 0x20
+
+# Board tables live in memory or in a memory-mapped save file.
+Table = Union[bytearray, mmap.mmap]
+# Adjacency counts are read from a table or, on large sparse boards, from a
+# sparse index.
+Counts = Union[Table, "SparseCounts"]
+
+_HAZARD_PATTERN = re.compile(rb"[\x10-\xff]")
+_POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+_BLOCK_SIZE = 1 << 16
+
+
+def is_bit_set(bits: Table, index: int) -> bool:
+    """
+    Check whether a bit is set in a bitset.
+
+    Args:
+        bits: The bitset
+        index: Index of the bit
+
+    Returns:
+        True if the bit is set
+    """
+    return bool(bits[index >> 3] & (1 << (index & 7)))
+
+
+def count_bits(bits: Table) -> int:
+    """
+    Count the set bits in a bitset.
+
+    Works block by block, so a memory-mapped bitset is never copied as a
+    whole.
+
+    Args:
+        bits: The bitset
+
+    Returns:
+        Number of set bits
+    """
+    return sum(
+        sum(bits[start : start + _BLOCK_SIZE].translate(_POPCOUNT))
+        for start in range(0, len(bits), _BLOCK_SIZE)
+    )
+
+
+class GridRowView(Sequence):  # type: ignore[type-arg]
+    """
+    Read-only view of a single grid row.
+    """
+
+    def __init__(
+        self, counts: Counts, scanned_bits: Table, offset: int, width: int
+    ) -> None:
+        """
+        Initialize a new row view.
+
+        Args:
+            counts: Adjacency count table of the board
+            scanned_bits: Bitset of scanned areas
+            offset: Flat index of the first area in the row
+            width: Width of the game grid
+        """
+        self._counts = counts
+        self._scanned_bits = scanned_bits
+        self._offset = offset
+        self._width = width
+
+    def __len__(self) -> int:
+        return self._width
+
+    def _cell(self, x: int) -> str:
+        index = self._offset + x
+        value = self._counts[index]
+        if value & TRIGGERED_FLAG:
+            return "H"
+        if is_bit_set(self._scanned_bits, index):
+            return str(value & COUNT_MASK)
+        return "?"
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "list[str]": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "list[str]"]:
+        if isinstance(index, slice):
+            return [self._cell(x) for x in range(*index.indices(self._width))]
+        if index < 0:
+            index += self._width
+        if not 0 <= index < self._width:
+            raise IndexError("grid row index out of range")
+        return self._cell(index)
+
+
+class GridView(Sequence):  # type: ignore[type-arg]
+    """
+    Read-only view of the game grid in the same layout as a list of rows.
+    """
+
+    def __init__(
+        self, counts: Counts, scanned_bits: Table, width: int, height: int
+    ) -> None:
+        """
+        Initialize a new grid view.
+
+        Args:
+            counts: Adjacency count table of the board
+            scanned_bits: Bitset of scanned areas
+            width: Width of the game grid
+            height: Height of the game grid
+        """
+        self._counts = counts
+        self._scanned_bits = scanned_bits
+        self._width = width
+        self._height = height
+
+    def __len__(self) -> int:
+        return self._height
+
+    def _row(self, y: int) -> GridRowView:
+        return GridRowView(
+            self._counts, self._scanned_bits, y * self._width, self._width
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> GridRowView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "list[GridRowView]": ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[GridRowView, "list[GridRowView]"]:
+        if isinstance(index, slice):
+            return [self._row(y) for y in range(*index.indices(self._height))]
+        if index < 0:
+            index += self._height
+        if not 0 <= index < self._height:
+            raise IndexError("grid index out of range")
+        return self._row(index)
+
+
+class HazardView(AbstractSet):  # type: ignore[type-arg]
+    """
+    Read-only set view of the hazard positions in the adjacency count table.
+    """
+
+    def __init__(self, counts: Table, width: int, height: int, size: int) -> None:
+        """
+        Initialize a new hazard view.
+
+        Args:
+            counts: Adjacency count table of the board
+            width: Width of the game grid
+            height: Height of the game grid
+            size: Number of hazards on the board
+        """
+        self._counts = counts
+        self._width = width
+        self._height = height
+        self._size = size
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, tuple) or len(position) != 2:
+            return False
+        x, y = position
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return False
+        return bool(self._counts[y * self._width + x] & HAZARD_FLAG)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        width = self._width
+        for match in _HAZARD_PATTERN.finditer(self._counts):
+            y, x = divmod(match.start(), width)
+            yield x, y
+
+
+class ScannedView(AbstractSet):  # type: ignore[type-arg]
+    """
+    Read-only set view of the scanned positions in a bitset.
+    """
+
+    def __init__(self, scanned_bits: Table, width: int, height: int) -> None:
+        """
+        Initialize a new scan view.
+
+        Args:
+            scanned_bits: Bitset of scanned areas
+            width: Width of the game grid
+            height: Height of the game grid
+        """
+        self._scanned_bits = scanned_bits
+        self._width = width
+        self._height = height
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, tuple) or len(position) != 2:
+            return False
+        x, y = position
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return False
+        return is_bit_set(self._scanned_bits, y * self._width + x)
+
+    def __len__(self) -> int:
+        return count_bits(self._scanned_bits)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        width = self._width
+        bits = self._scanned_bits
+        for start in range(0, len(bits), _BLOCK_SIZE):
+            for byte_index, byte in enumerate(bits[start : start + _BLOCK_SIZE], start):
+                if not byte:
+                    continue
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        y, x = divmod((byte_index << 3) + bit, width)
+                        yield x, y
@@ -0,0 +1,151 @@
+"""
+Unit tests for the board analytics in analytics.py.
+
+Tests the metrics against counting the clicks of an actual game, the
+streaming analysis and the output formats.
+"""
+
+# pylint: disable=C
+
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.analytics import (
+    FIELDS,
+    analyze_seeds,
+    board_metrics,
+    main,
+    write_csv,
+    write_jsonl,
+)
+from exam.source.game import AbandonedSpaceStation
+
+
+def count_clicks(game: AbandonedSpaceStation) -> tuple:
+    # Open every zero region with one reveal, then scan the numbers left.
+    width, height = game.grid_width, game.grid_height
+    regions = 0
+    for y in range(height):
+        for x in range(width):
+            if (
+                (x, y) not in game.hazard_locations
+                and (x, y) not in game.scanned_areas
+                and game.count_adjacent_hazards(x, y) == 0
+            ):
+                game.reveal_area(x, y)
+                regions += 1
+    clicks = regions
+    for y in range(height):
+        for x in range(width):
+            if (x, y) not in game.hazard_locations | game.scanned_areas:
+                game.scan_area(x, y)
+                clicks += 1
+    return clicks, regions
+
+
+class TestBoardMetrics(unittest.TestCase):
+    def test_small_board(self) -> None:
+        game = AbandonedSpaceStation(5, 3, 0, verbose=False)
+        game.hazard_locations = {(2, 0), (2, 2)}
+        metrics = board_metrics(game, seed=9)
+        self.assertEqual(metrics.seed, 9)
+        self.assertEqual(metrics.hazards, 2)
+        self.assertEqual(metrics.zero_regions, 2)
+        # Area (2, 1) is the only number that borders no zero region.
+        self.assertEqual(metrics.isolated_numbers, 1)
+        self.assertEqual(metrics.bbbv, 3)
+
+    def test_matches_clicks_of_a_game(self) -> None:
+        for seed in range(40):
+            size = (30, 16, 99) if seed % 2 else (9, 9, 10)
+            metrics = board_metrics(
+                AbandonedSpaceStation(*size, seed=seed, compact=True)
+            )
+            game = AbandonedSpaceStation(*size, seed=seed, verbose=False)
+            self.assertEqual((metrics.bbbv, metrics.zero_regions), count_clicks(game))
+            self.assertEqual(metrics.seed, seed)
+
+    def test_independent_of_scanned_areas(self) -> None:
+        game = AbandonedSpaceStation(9, 9, 10, seed=3, verbose=False)
+        before = board_metrics(game)
+        game.reveal_area(0, 0)
+        self.assertEqual(board_metrics(game), before)
+
+
+class TestAnalyzeSeeds(unittest.TestCase):
+    def test_stream_in_seed_order(self) -> None:
+        local = list(analyze_seeds(range(10, 35), 9, 9, 10, workers=1, chunk_size=4))
+        self.assertEqual([metrics.seed for metrics in local], list(range(10, 35)))
+        pooled = list(
+            analyze_seeds(iter(range(10, 35)), 9, 9, 10, workers=2, chunk_size=4)
+        )
+        self.assertEqual(pooled, local)
+
+    def test_invalid_chunk_size(self) -> None:
+        with self.assertRaises(ValueError):
+            list(analyze_seeds(range(3), 9, 9, 10, chunk_size=0))
+
+
+class TestOutput(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = list(analyze_seeds(range(3), 9, 9, 10, workers=1))
+
+    def test_write_jsonl(self) -> None:
+        output = io.StringIO()
+        self.assertEqual(write_jsonl(self.metrics, output), 3)
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([row["seed"] for row in rows], [0, 1, 2])
+        self.assertEqual(rows[1]["bbbv"], self.metrics[1].bbbv)
+        self.assertEqual(tuple(rows[0]), FIELDS)
+
+    def test_write_csv(self) -> None:
+        output = io.StringIO(newline="")
+        self.assertEqual(write_csv(self.metrics, output), 3)
+        output.seek(0)
+        rows = list(csv.DictReader(output))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(int(rows[2]["zero_regions"]), self.metrics[2].zero_regions)
+
+    def test_main_with_seed_file(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        seeds = os.path.join(directory, "seeds.txt")
+        output = os.path.join(directory, "metrics.csv")
+        with open(seeds, "w", encoding="utf-8") as file:
+            file.write("5\n\n7\n")
+        with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            main(
+                [
+                    "--seeds",
+                    seeds,
+                    "--width",
+                    "9",
+                    "--height",
+                    "9",
+                    "--hazards",
+                    "10",
+                    "--format",
+                    "csv",
+                    "--output",
+                    output,
+                    "--workers",
+                    "1",
+                ]
+            )
+        self.assertIn("2 boards", stderr.getvalue())
+        with open(output, encoding="utf-8", newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([row["seed"] for row in rows], ["5", "7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Unit tests for the unbounded board in chunked.py.
+
+Tests chunk generation, adjacency counts across chunk edges and scanning.
+"""
+
+# pylint: disable=C
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.chunked import UnboundedSpaceStation
+
+
+def _brute_force_count(game: UnboundedSpaceStation, x: int, y: int) -> int:
+    if game.is_hazard(x, y):
+        return 0
+    return sum(
+        game.is_hazard(x + dx, y + dy)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        if dx or dy
+    )
+
+
+class TestChunkGeneration(unittest.TestCase):
+    def test_chunks_are_deterministic(self) -> None:
+        first = UnboundedSpaceStation(40, seed=7, chunk_size=16)
+        second = UnboundedSpaceStation(40, seed=7, chunk_size=16)
+        # Touch the chunks in a different order.
+        first.is_hazard(100, -50)
+        hazards = [
+            (x, y)
+            for x in range(-20, 20)
+            for y in range(-20, 20)
+            if first.is_hazard(x, y)
+        ]
+        self.assertEqual(
+            hazards,
+            [
+                (x, y)
+                for x in range(-20, 20)
+                for y in range(-20, 20)
+                if second.is_hazard(x, y)
+            ],
+        )
+        other = UnboundedSpaceStation(40, seed=8, chunk_size=16)
+        self.assertNotEqual(
+            hazards,
+            [
+                (x, y)
+                for x in range(-20, 20)
+                for y in range(-20, 20)
+                if other.is_hazard(x, y)
+            ],
+        )
+
+    def test_hazards_per_chunk(self) -> None:
+        game = UnboundedSpaceStation(10, seed=1, chunk_size=8)
+        self.assertEqual(
+            sum(game.is_hazard(x, y) for x in range(-8, 0) for y in range(8, 16)), 10
+        )
+        self.assertEqual(game.chunk_count, 1)
+
+    def test_untouched_chunks_are_not_generated(self) -> None:
+        game = UnboundedSpaceStation(10, seed=1, chunk_size=8)
+        self.assertFalse(game.is_scanned(1000, 1000))
+        self.assertEqual(game.area(-1000, 1000), "?")
+        self.assertEqual(game.window(0, 0, 3, 2), ["???", "???"])
+        self.assertEqual(game.chunk_count, 0)
+
+    def test_invalid_hazard_count(self) -> None:
+        with self.assertRaises(ValueError):
+            UnboundedSpaceStation(65, chunk_size=8)
+
+
+class TestUnboundedScanning(unittest.TestCase):
+    def test_counts_across_chunk_edges(self) -> None:
+        game = UnboundedSpaceStation(20, seed=3, chunk_size=8)
+        for x in range(-9, 10):
+            for y in range(-9, 10):
+                self.assertEqual(
+                    game.count_adjacent_hazards(x, y), _brute_force_count(game, x, y)
+                )
+
+    def test_scan_area(self) -> None:
+        game = UnboundedSpaceStation(20, seed=3, chunk_size=8, verbose=False)
+        x, y = next(
+            (x, y) for x in range(8) for y in range(8) if not game.is_hazard(x, y)
+        )
+        self.assertTrue(game.scan_area(x, y))
+        self.assertEqual(game.area(x, y), str(game.count_adjacent_hazards(x, y)))
+        self.assertEqual(game.scanned_count, 1)
+        with patch("builtins.print") as mock_print:
+            game.verbose = True
+            self.assertTrue(game.scan_area(x, y))
+            mock_print.assert_called_once()
+        self.assertEqual(game.action_count, 1)
+
+        hx, hy = next(
+            (x, y) for x in range(8) for y in range(8) if game.is_hazard(x, y)
+        )
+        self.assertFalse(game.scan_area(hx, hy))
+        self.assertTrue(game.is_defeated)
+        self.assertEqual(game.area(hx, hy), "H")
+
+    def test_reveal_area(self) -> None:
+        game = UnboundedSpaceStation(1, seed=5, chunk_size=8)
+        start = next(
+            (x, y)
+            for x in range(8)
+            for y in range(8)
+            if game.count_adjacent_hazards(x, y) == 0 and not game.is_hazard(x, y)
+        )
+        revealed = game.reveal_area(*start)
+        self.assertEqual(len(revealed), game.reveal_limit)
+        self.assertEqual(len(set(revealed)), len(revealed))
+        self.assertEqual(game.action_count, 1)
+        self.assertFalse(game.is_defeated)
+        for x, y in revealed:
+            self.assertFalse(game.is_hazard(x, y))
+            self.assertEqual(game.area(x, y), str(_brute_force_count(game, x, y)))
+
+    def test_memory_follows_explored_area(self) -> None:
+        game = UnboundedSpaceStation(160, seed=9, verbose=False)
+        game.scan_area(10_000_000, -10_000_000)
+        self.assertLessEqual(game.chunk_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for the engine benchmark suite in benchmarks/engine_benchmark.py.
+
+Tests the result format and the comparison against a baseline.
+"""
+
+# pylint: disable=C
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.benchmarks.engine_benchmark import (
+    BASELINE,
+    BENCHMARKS,
+    BOARD_SIZES,
+    DENSITIES,
+    find_regressions,
+    main,
+    run_suite,
+)
+
+
+class TestEngineBenchmark(unittest.TestCase):
+    def test_run_suite(self) -> None:
+        results = run_suite([(6, 5)], [0.2], repeat=1)
+        self.assertEqual([result["name"] for result in results], list(BENCHMARKS))
+        for result in results:
+            self.assertEqual((result["grid_width"], result["grid_height"]), (6, 5))
+            self.assertGreater(result["ns_per_op"], 0)
+
+    def test_find_regressions(self) -> None:
+        baseline = [
+            {
+                "name": "scan_area",
+                "grid_width": 10,
+                "grid_height": 10,
+                "density": 0.1,
+                "ns_per_op": 1000.0,
+            }
+        ]
+        slower = [dict(baseline[0], ns_per_op=1150.0)]
+        self.assertEqual(find_regressions(slower, baseline, 0.2), [])
+        regressions = find_regressions(slower, baseline, 0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("scan_area 10x10", regressions[0])
+        other_case = [dict(slower[0], density=0.5)]
+        self.assertEqual(find_regressions(other_case, baseline, 0.1), [])
+
+    def test_main_with_baseline(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "results.json")
+        with patch("builtins.print"):
+            self.assertEqual(main(["--quick", "--repeat", "1", "--output", path]), 0)
+        with open(path, encoding="utf-8") as file:
+            stored = json.load(file)
+        self.assertIn("python", stored)
+        for result in stored["results"]:
+            result["ns_per_op"] /= 100
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(stored, file)
+        with patch("builtins.print"):
+            self.assertEqual(main(["--quick", "--repeat", "1", "--baseline", path]), 1)
+
+    def test_committed_baseline(self) -> None:
+        with open(BASELINE, encoding="utf-8") as file:
+            results = json.load(file)["results"]
+        self.assertEqual(
+            sorted(
+                (result["name"], result["grid_width"], result["grid_height"])
+                + (result["density"],)
+                for result in results
+            ),
+            sorted(
+                (name, width, height, density)
+                for name in BENCHMARKS
+                for width, height in BOARD_SIZES
+                for density in DENSITIES
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
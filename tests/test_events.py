@@ -0,0 +1,174 @@
+"""
+Unit tests for the event stream in events.py.
+
+Tests the events of played games, the batched JSONL sink and the event
+output of the batch mode.
+"""
+
+# pylint: disable=C
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.events import EVENTS, EventEmitter, JsonlSink
+from exam.source.game import AbandonedSpaceStation
+from exam.source.main import batch_main
+
+
+def small_game(events: EventEmitter, verbose: bool = False) -> AbandonedSpaceStation:
+    game = AbandonedSpaceStation(3, 3, 0, verbose=verbose, events=events)
+    game.hazard_locations = {(2, 2)}
+    return game
+
+
+class TestEventEmitter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.events: list = []
+        self.emitter = EventEmitter(self.events.append)
+
+    def names(self) -> list:
+        return [event["event"] for event in self.events]
+
+    def test_start_and_actions(self) -> None:
+        game = small_game(self.emitter)
+        game.scan_area(0, 0)
+        game.reveal_area(5, 0)
+        game.reveal_area(0, 0)
+        self.assertEqual(self.names(), ["start", "scan", "invalid", "invalid"])
+        start, scan = self.events[0], self.events[1]
+        self.assertEqual(
+            (start["grid_width"], start["grid_height"], start["hazards"]), (3, 3, 0)
+        )
+        self.assertEqual(
+            (scan["x"], scan["y"], scan["safe"], scan["scanned"], scan["actions"]),
+            (0, 0, True, 1, 1),
+        )
+        self.assertEqual(
+            [
+                (event["action"], event["x"], event["reason"])
+                for event in self.events[2:]
+            ],
+            [("reveal", 5, "invalid"), ("reveal", 0, "scanned")],
+        )
+        self.assertTrue(all(isinstance(event["time"], float) for event in self.events))
+
+    def test_victory(self) -> None:
+        game = small_game(self.emitter)
+        game.scan_area(2, 0)
+        game.reveal_area(0, 0)
+        self.assertTrue(game.is_victorious)
+        self.assertEqual(self.names(), ["start", "scan", "reveal", "victory"])
+        self.assertEqual(self.events[-1]["scanned"], 8)
+
+    def test_defeat(self) -> None:
+        game = small_game(self.emitter)
+        game.reveal_area(2, 2)
+        self.assertEqual(self.names(), ["start", "reveal", "defeat"])
+        self.assertFalse(self.events[1]["safe"])
+        self.assertEqual(set(self.names()) - set(EVENTS), set())
+
+    def test_attach_and_detach(self) -> None:
+        first = small_game(self.emitter)
+        second = AbandonedSpaceStation(4, 4, 1, seed=1, verbose=False)
+        self.emitter.attach(second)
+        first.scan_area(0, 0)
+        self.emitter.detach()
+        second.scan_area(0, 0)
+        self.assertEqual(self.names(), ["start", "start"])
+        self.assertEqual(first.move_listeners, [])
+        self.assertEqual(second.rejection_listeners, [])
+
+    def test_rejected_scans_print_only_for_verbose_games(self) -> None:
+        with patch("builtins.print") as mock_print:
+            small_game(self.emitter).scan_area(3, 0)
+            mock_print.assert_not_called()
+            small_game(self.emitter, verbose=True).scan_area(3, 0)
+            mock_print.assert_called_once_with("Invalid coordinates. Please try again.")
+        self.assertEqual(self.names().count("invalid"), 2)
+
+    def test_play_input(self) -> None:
+        game = small_game(self.emitter, verbose=True)
+        with patch("builtins.input", side_effect=["abc", "7 7", "0 0", "q"]), patch(
+            "builtins.print"
+        ), patch("sys.stdout", new_callable=io.StringIO):
+            game.play()
+        self.assertEqual(self.names(), ["start", "invalid", "invalid", "scan"])
+        self.assertEqual(
+            [(event["action"], event["x"]) for event in self.events[1:3]],
+            [("input", None), ("input", None)],
+        )
+
+
+class TestJsonlSink(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "events.jsonl")
+
+    def read_events(self) -> list:
+        with open(self.path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_batched_writes(self) -> None:
+        sink = JsonlSink(self.path, batch_size=3, max_delay=60)
+        emitter = EventEmitter(sink)
+        for number in range(4):
+            emitter.emit("scan", number=number)
+        # The fourth event waits for the next batch.
+        self.assertEqual([event["number"] for event in self.read_events()], [0, 1, 2])
+        sink.close()
+        self.assertEqual(len(self.read_events()), 4)
+        with JsonlSink(self.path) as appended:
+            appended({"event": "start", "time": 0.0})
+        self.assertEqual(self.read_events()[-1], {"event": "start", "time": 0.0})
+
+    def test_max_delay(self) -> None:
+        stream = io.StringIO()
+        with JsonlSink(stream, max_delay=1.0) as sink:
+            sink({"event": "scan", "time": 10.0})
+            sink({"event": "scan", "time": 10.5})
+            self.assertEqual(stream.getvalue(), "")
+            sink({"event": "scan", "time": 11.0})
+            self.assertEqual(len(stream.getvalue().splitlines()), 3)
+        # Streams passed to the sink stay open.
+        self.assertFalse(stream.closed)
+
+    def test_end_of_game_is_written_at_once(self) -> None:
+        stream = io.StringIO()
+        with JsonlSink(stream, max_delay=60) as sink:
+            small_game(EventEmitter(sink)).reveal_area(2, 2)
+            self.assertEqual(
+                [json.loads(line)["event"] for line in stream.getvalue().splitlines()],
+                ["start", "reveal", "defeat"],
+            )
+
+    def test_invalid_batch_size(self) -> None:
+        with self.assertRaises(ValueError):
+            JsonlSink(io.StringIO(), batch_size=0)
+
+    def test_batch_mode(self) -> None:
+        moves = os.path.join(os.path.dirname(self.path), "moves.txt")
+        with open(moves, "w", encoding="utf-8") as file:
+            file.write("0 0\nabc\n0 0\n")
+        with patch("sys.stdout", new_callable=io.StringIO):
+            batch_main(
+                ["--moves", moves, "--width", "2", "--height", "1", "--hazards", "0"]
+                + ["--events", self.path]
+            )
+        self.assertEqual(
+            [event["event"] for event in self.read_events()],
+            ["start", "scan", "invalid", "invalid"],
+        )
+        self.assertEqual(self.read_events()[2]["action"], "input")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,17 +3,20 @@ Unit tests for the game functions in game.py.
 
 Tests all core functionality of the AbandonedSpaceStation class.
 """
+
 # pylint: disable=C
 
 import io
 import os
+import random
 import sys
 import unittest
 from unittest.mock import patch, MagicMock, call
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from exam.source.game import AbandonedSpaceStation
+from exam.source.game import AbandonedSpaceStation, Snapshot
+from exam.source.renderer import Viewport
 
 
 class TestAbandonedSpaceStation(unittest.TestCase):
@@ -46,6 +49,32 @@ class TestAbandonedSpaceStation(unittest.TestCase):
                 f"Hazard position Y ({y}) outside valid range",
             )
 
+    def test_place_hazards_dense(self) -> None:
+        test_game = AbandonedSpaceStation(
+            grid_width=50, grid_height=50, hazard_count=2499
+        )
+        self.assertEqual(len(test_game.hazard_locations), 2499)
+
+    def test_seed_reproducible(self) -> None:
+        first = AbandonedSpaceStation(
+            grid_width=20, grid_height=15, hazard_count=40, seed=7
+        )
+        second = AbandonedSpaceStation(
+            grid_width=20, grid_height=15, hazard_count=40, seed=7
+        )
+        other = AbandonedSpaceStation(
+            grid_width=20, grid_height=15, hazard_count=40, seed=8
+        )
+        self.assertEqual(first.hazard_locations, second.hazard_locations)
+        self.assertNotEqual(first.hazard_locations, other.hazard_locations)
+        self.assertEqual(first.seed, 7)
+
+        rng_game = AbandonedSpaceStation(
+            grid_width=20, grid_height=15, hazard_count=40, seed=random.Random(7)
+        )
+        self.assertEqual(rng_game.hazard_locations, first.hazard_locations)
+        self.assertIsNone(rng_game.seed)
+
     def test_count_adjacent_hazards(self) -> None:
         test_game = AbandonedSpaceStation(grid_width=5, grid_height=5, hazard_count=0)
         test_game.hazard_locations = {(1, 1), (2, 2), (3, 3)}
@@ -53,6 +82,52 @@ class TestAbandonedSpaceStation(unittest.TestCase):
         self.assertEqual(test_game.count_adjacent_hazards(2, 2), 0)
         self.assertEqual(test_game.count_adjacent_hazards(2, 1), 2)
 
+    def test_adjacent_counts_match_neighbors(self) -> None:
+        test_game = AbandonedSpaceStation(grid_width=7, grid_height=6, hazard_count=12)
+        hazards = test_game.hazard_locations
+        for y in range(test_game.grid_height):
+            for x in range(test_game.grid_width):
+                expected = 0
+                if (x, y) not in hazards:
+                    expected = sum(
+                        (x + dx, y + dy) in hazards
+                        for dx in range(-1, 2)
+                        for dy in range(-1, 2)
+                    )
+                self.assertEqual(test_game.count_adjacent_hazards(x, y), expected)
+
+    def test_adjacent_counts_across_bands(self) -> None:
+        # Large boards are counted in bands of rows; this board has a band
+        # boundary between rows 698 and 699.
+        test_game = AbandonedSpaceStation(1500, 1000, 0, compact=True)
+        hazards = {(0, 698), (1499, 699), (700, 698), (701, 699), (700, 700)}
+        test_game.hazard_locations = hazards
+        self.assertEqual(test_game.hazard_locations, hazards)
+        for x, y in [(0, 699), (1, 697), (1498, 698), (1499, 700), (701, 698)]:
+            expected = sum(
+                (x + dx, y + dy) in hazards
+                for dx in range(-1, 2)
+                for dy in range(-1, 2)
+            )
+            self.assertEqual(test_game.count_adjacent_hazards(x, y), expected)
+        self.assertEqual(test_game.count_adjacent_hazards(1499, 698), 1)
+        self.assertEqual(test_game.count_adjacent_hazards(700, 699), 3)
+
+    def test_hazard_reassignment_rebuilds_counts(self) -> None:
+        test_game = AbandonedSpaceStation(grid_width=5, grid_height=5, hazard_count=0)
+        self.assertEqual(test_game.count_adjacent_hazards(1, 1), 0)
+        test_game.hazard_locations = {(0, 0), (2, 2)}
+        self.assertEqual(test_game.count_adjacent_hazards(1, 1), 2)
+        self.assertEqual(test_game.count_adjacent_hazards(4, 4), 0)
+        self.assertEqual(test_game.count_adjacent_hazards(-1, 0), 0)
+        for position in [(-1, 0), (0, -1), (5, 0), (0, 5)]:
+            with self.assertRaises(ValueError):
+                test_game.hazard_locations = {position}
+        with self.assertRaises(AttributeError):
+            test_game.hazard_locations.add((4, 4))  # type: ignore[attr-defined]
+        self.assertEqual(test_game.hazard_locations, {(0, 0), (2, 2)})
+        self.assertEqual(test_game.count_adjacent_hazards(3, 3), 1)
+
     def test_scan_area_safe(self) -> None:
         test_game = AbandonedSpaceStation(grid_width=5, grid_height=5, hazard_count=0)
         test_game.hazard_locations = {(1, 1), (2, 2)}
@@ -116,6 +191,20 @@ class TestAbandonedSpaceStation(unittest.TestCase):
         finally:
             sys.stdout = original_stdout
 
+    def test_compact_game_won(self) -> None:
+        test_game = AbandonedSpaceStation(
+            grid_width=3, grid_height=3, hazard_count=0, compact=True
+        )
+        test_game.hazard_locations = {(2, 2)}
+        self.assertEqual(len(test_game.reveal_area(0, 0)), 8)
+        self.assertTrue(test_game.is_victorious)
+        self.assertEqual(test_game.grid[1][1], "1")
+        self.assertEqual(test_game.grid[2][2], "?")
+
+    def test_too_many_hazards(self) -> None:
+        with self.assertRaises(ValueError):
+            AbandonedSpaceStation(grid_width=5, grid_height=5, hazard_count=26)
+
     def test_game_won(self) -> None:
         test_game = AbandonedSpaceStation(grid_width=2, grid_height=2, hazard_count=0)
         test_game.hazard_locations = {(1, 1)}
@@ -197,6 +286,214 @@ class TestAbandonedSpaceStation(unittest.TestCase):
                         )
                         mock_scan.assert_called_once_with(2, 2)
 
+    def test_play_with_viewport(self) -> None:
+        test_game = AbandonedSpaceStation(40, 30, 0, verbose=False)
+        test_game.hazard_locations = {(39, 29)}
+        viewport = Viewport(40, 30, 10, 6)
+        output = io.StringIO()
+        inputs = ["dd", "g 35 2", "g 99 0", "0 29", "q"]
+        with patch("builtins.input", side_effect=inputs):
+            with patch("sys.stdout", output):
+                test_game.play(viewport)
+        # Scrolling and jumping draw the window without scanning, scanning
+        # outside the window moves it to the scanned area.
+        self.assertEqual(test_game.action_count, 1)
+        self.assertEqual((viewport.left, viewport.top), (0, 24))
+        frames = output.getvalue()
+        self.assertIn("out of bounds", frames)
+        self.assertIn("    1  1  1  1  1  1  1  1  1  1 \n", frames)
+        self.assertIn("    3  3  3  3  3  3  3  3  3  3 \n", frames)
+        self.assertIn("29 | 0  ?  ?  ?  ?  ?  ?  ?  ?  ? \n", frames)
+        self.assertNotIn("5 | ?  ?  ?  ?  ?  ?  ?  ?  ?  ?  ?", frames)
+
+    def test_display_grid_in_viewport(self) -> None:
+        for compact in (False, True):
+            test_game = AbandonedSpaceStation(12, 9, 0, verbose=False, compact=compact)
+            test_game.hazard_locations = {(5, 4), (11, 8)}
+            test_game.scan_area(6, 4)
+            viewport = Viewport(12, 9, 4, 3)
+            viewport.move_to(4, 3)
+            with patch("builtins.print") as mock_print:
+                test_game.display_grid(debug=True, viewport=viewport)
+            lines = mock_print.call_args[0][0].split("\n")
+            self.assertEqual(
+                lines,
+                [
+                    "    4  5  6  7 ",
+                    "   ------------",
+                    "3 | ?  ?  ?  ? ",
+                    "4 | ?  H  1  ? ",
+                    "5 | ?  ?  ?  ? ",
+                    "",
+                ],
+            )
+
+
+class TestRevealArea(unittest.TestCase):
+    def test_reveal_area_opens_zero_region(self) -> None:
+        test_game = AbandonedSpaceStation(grid_width=5, grid_height=5, hazard_count=0)
+        test_game.hazard_locations = {(4, 4)}
+        revealed = test_game.reveal_area(0, 0)
+        self.assertEqual(len(revealed), 24)
+        self.assertEqual(len(set(revealed)), 24)
+        self.assertEqual(set(revealed), test_game.scanned_areas)
+        self.assertEqual(test_game.grid[3][3], "1")
+        self.assertEqual(test_game.grid[4][4], "?")
+        self.assertEqual(test_game.action_count, 1)
+        self.assertTrue(test_game.is_victorious)
+
+    def test_reveal_area_stops_at_numbers(self) -> None:
+        test_game = AbandonedSpaceStation(grid_width=5, grid_height=5, hazard_count=0)
+        test_game.hazard_locations = {(2, 0), (2, 1), (2, 2), (2, 3), (2, 4)}
+        revealed = test_game.reveal_area(0, 0)
+        self.assertEqual(set(revealed), {(x, y) for x in range(2) for y in range(5)})
+        self.assertEqual(test_game.grid[0][3], "?")
+        self.assertFalse(test_game.is_victorious)
+
+        with patch("builtins.print") as mock_print:
+            self.assertEqual(test_game.reveal_area(0, 0), [])
+            mock_print.assert_called_once()
+        self.assertEqual(test_game.action_count, 1)
+
+        self.assertEqual(test_game.reveal_area(3, 0), [(3, 0)])
+        self.assertEqual(test_game.action_count, 2)
+
+    def test_reveal_area_hazard(self) -> None:
+        test_game = AbandonedSpaceStation(grid_width=5, grid_height=5, hazard_count=0)
+        test_game.hazard_locations = {(1, 1)}
+        self.assertEqual(test_game.reveal_area(1, 1), [(1, 1)])
+        self.assertTrue(test_game.is_defeated)
+        self.assertNotIn((1, 1), test_game.scanned_areas)
+
+    def test_reveal_area_large_board(self) -> None:
+        test_game = AbandonedSpaceStation(
+            grid_width=200, grid_height=200, hazard_count=0
+        )
+        revealed = test_game.reveal_area(100, 100)
+        self.assertEqual(len(revealed), 40_000)
+        self.assertTrue(test_game.is_victorious)
+
+
+class TestHistory(unittest.TestCase):
+    def state(self, game: AbandonedSpaceStation) -> tuple:
+        counts, bits = game.tables()
+        return (
+            bytes(counts),
+            bytes(bits),
+            [list(row) for row in game.grid],
+            set(game.scanned_areas),
+            game.scanned_count,
+            game.action_count,
+            game.is_defeated,
+            game.is_victorious,
+        )
+
+    def test_undo_redo_scan_and_reveal(self) -> None:
+        for compact in (False, True):
+            game = AbandonedSpaceStation(5, 5, 0, compact=compact, verbose=False)
+            game.hazard_locations = {(4, 4), (2, 4)}
+            states = [self.state(game)]
+            game.scan_area(4, 0)
+            states.append(self.state(game))
+            game.reveal_area(0, 0)
+            states.append(self.state(game))
+            game.scan_area(4, 4)
+            states.append(self.state(game))
+            self.assertTrue(game.is_defeated)
+
+            for expected in reversed(states[:-1]):
+                self.assertTrue(game.undo())
+                self.assertEqual(self.state(game), expected)
+            self.assertFalse(game.undo())
+            for expected in states[1:]:
+                self.assertTrue(game.redo())
+                self.assertEqual(self.state(game), expected)
+            self.assertFalse(game.redo())
+
+    def test_undo_victory_and_repeated_trigger(self) -> None:
+        game = AbandonedSpaceStation(2, 1, 0, verbose=False)
+        game.hazard_locations = {(1, 0)}
+        game.scan_area(1, 0)
+        game.scan_area(1, 0)
+        self.assertEqual(game.action_count, 2)
+        game.undo()
+        self.assertTrue(game.is_defeated)
+        self.assertEqual(game.grid[0][1], "H")
+        game.undo()
+        self.assertFalse(game.is_defeated)
+        self.assertEqual(game.grid[0][1], "?")
+        self.assertTrue(game.scan_area(0, 0))
+        self.assertTrue(game.is_victorious)
+        game.undo()
+        self.assertFalse(game.is_victorious)
+        self.assertEqual(game.scanned_count, 0)
+
+    def test_new_action_clears_redo(self) -> None:
+        game = AbandonedSpaceStation(3, 3, 0, verbose=False)
+        game.scan_area(0, 0)
+        game.undo()
+        game.scan_area(1, 1)
+        self.assertFalse(game.redo())
+        self.assertEqual(game.scanned_areas, {(1, 1)})
+
+    def test_snapshot_branching(self) -> None:
+        rng = random.Random(3)
+        game = AbandonedSpaceStation(12, 10, 15, seed=4, verbose=False)
+        game.reveal_area(0, 0)
+        root = game.snapshot()
+        root_state = self.state(game)
+        for _ in range(50):
+            self.assertEqual(self.state(game), root_state)
+            for _ in range(rng.randrange(1, 6)):
+                game.reveal_area(rng.randrange(12), rng.randrange(10))
+            leaf = game.snapshot()
+            leaf_state = self.state(game)
+            game.restore(root)
+            self.assertEqual(self.state(game), root_state)
+            game.restore(leaf)
+            self.assertEqual(self.state(game), leaf_state)
+            game.restore(root)
+
+    def test_move_hazards_keeps_history(self) -> None:
+        for compact in (False, True):
+            game = AbandonedSpaceStation(8, 5, 0, compact=compact, verbose=False)
+            game.hazard_locations = {(7, 0), (7, 4)}
+            game.scan_area(0, 0)
+            game.scan_area(7, 2)
+            game.undo()
+            game.move_hazards([(7, 0)], [(6, 4)])
+            self.assertEqual(set(game.hazard_locations), {(6, 4), (7, 4)})
+            self.assertEqual(game.count_adjacent_hazards(6, 3), 2)
+            self.assertEqual(game.count_adjacent_hazards(6, 1), 0)
+            # The redone scan would show a changed number.
+            self.assertFalse(game.redo())
+            self.assertTrue(game.undo())
+            self.assertEqual(game.scanned_count, 0)
+            for removed, added in (([(0, 0)], []), ([], [(7, 4)]), ([], [(8, 0)])):
+                with self.assertRaises(ValueError):
+                    game.move_hazards(removed, added)
+            game.scan_area(5, 3)
+            with self.assertRaises(ValueError):
+                game.move_hazards([(6, 4)], [(0, 0)])
+
+    def test_invalid_snapshots(self) -> None:
+        game = AbandonedSpaceStation(3, 3, 0, verbose=False)
+        game.scan_area(0, 0)
+        branch = game.snapshot()
+        game.undo()
+        game.scan_area(2, 2)
+        with self.assertRaises(ValueError):
+            game.restore(branch)
+
+        current = game.snapshot()
+        game.hazard_locations = {(1, 1)}
+        with self.assertRaises(ValueError):
+            game.restore(current)
+        with self.assertRaises(ValueError):
+            game.restore(Snapshot(0, 100))
+        game.restore(game.snapshot())
+        self.assertEqual(game.hazard_locations, {(1, 1)})
+
 
 if __name__ == "__main__":
     unittest.main()
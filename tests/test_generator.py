@@ -0,0 +1,99 @@
+"""
+Unit tests for the no-guess board generator in generator.py.
+
+Tests that generated boards can be solved without guessing.
+"""
+
+# pylint: disable=C
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.generator import (
+    NoGuessBoard,
+    _Attempt,
+    _repair,
+    generate_board,
+    generate_boards,
+)
+from exam.source.solver import ConstraintSolver
+
+
+def _solved_without_guessing(board: NoGuessBoard) -> bool:
+    game = board.game(verbose=False)
+    solver = ConstraintSolver(game)
+    solver.update(game.reveal_area(*board.start))
+    solver.solve()
+    return game.is_victorious
+
+
+class TestGenerateBoard(unittest.TestCase):
+    def test_expert_board_is_solvable(self) -> None:
+        board = generate_board(30, 16, 99, seed=3)
+        self.assertEqual(len(set(board.hazards)), 99)
+        self.assertEqual(board.start, (15, 8))
+        self.assertTrue(_solved_without_guessing(board))
+
+    def test_start_area_is_free(self) -> None:
+        board = generate_board(8, 8, 20, (0, 0), seed=1)
+        self.assertFalse({(0, 0), (1, 0), (0, 1), (1, 1)} & set(board.hazards))
+        game = board.game(compact=True, verbose=False)
+        self.assertEqual(game.hazard_count, 20)
+        self.assertEqual(game.count_adjacent_hazards(0, 0), 0)
+
+    def test_reproducible(self) -> None:
+        self.assertEqual(
+            generate_board(16, 16, 40, seed=5).hazards,
+            generate_board(16, 16, 40, seed=5).hazards,
+        )
+
+    def test_rejection_only(self) -> None:
+        board = generate_board(9, 9, 10, seed=2, max_repairs=0)
+        self.assertEqual(board.repairs, 0)
+        self.assertTrue(_solved_without_guessing(board))
+
+    def test_repair_continues_from_unaffected_state(self) -> None:
+        rng = random.Random(1)
+        protected = {0, 1, 30, 31}
+        repairs = 0
+        for _ in range(20):
+            hazards = set(rng.sample(range(2, 30 * 16), 99)) - protected
+            attempt = _Attempt(30, 16, hazards, 0)
+            if attempt.solve():
+                continue
+            moves = attempt.game.action_count
+            moved = _repair(attempt.solver, hazards, protected, rng)
+            assert moved is not None
+            attempt.move_hazards(*moved)
+            self.assertLess(attempt.game.action_count, moves)
+            fresh = _Attempt(30, 16, hazards, 0)
+            self.assertEqual(attempt.solve(), fresh.solve())
+            self.assertEqual(
+                set(attempt.game.hazard_locations), set(fresh.game.hazard_locations)
+            )
+            self.assertEqual(attempt.game.scanned_areas, fresh.game.scanned_areas)
+            self.assertEqual(attempt.solver.known_hazards, fresh.solver.known_hazards)
+            repairs += 1
+        self.assertGreater(repairs, 5)
+
+    def test_too_many_hazards(self) -> None:
+        with self.assertRaises(ValueError):
+            generate_board(5, 5, 17)
+
+
+class TestGenerateBoards(unittest.TestCase):
+    def test_independent_of_workers(self) -> None:
+        local = generate_boards(4, 9, 9, 10, seed=7, workers=1, batch_size=2)
+        pooled = generate_boards(4, 9, 9, 10, seed=7, workers=2, batch_size=2)
+        self.assertEqual(
+            [board.hazards for board in local], [board.hazards for board in pooled]
+        )
+        self.assertTrue(all(_solved_without_guessing(board) for board in local))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Unit tests for the hazard index in hazard_index.py.
+
+Tests the choice between the dense and the sparse index, the sparse counts
+against the dense table and games played with both indexes.
+"""
+
+# pylint: disable=C
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.hazard_index import (
+    SPARSE_BYTES_PER_HAZARD,
+    SPARSE_MIN_AREAS,
+    SparseCounts,
+    dense_counts,
+    move_hazards,
+    use_sparse_index,
+)
+from exam.source.persistence import dump_game
+from exam.source.views import TRIGGERED_FLAG
+
+
+class TestIndexChoice(unittest.TestCase):
+    def test_thresholds(self) -> None:
+        limit = SPARSE_MIN_AREAS // SPARSE_BYTES_PER_HAZARD
+        self.assertTrue(use_sparse_index(SPARSE_MIN_AREAS, limit))
+        self.assertFalse(use_sparse_index(SPARSE_MIN_AREAS, limit + 1))
+        self.assertFalse(use_sparse_index(SPARSE_MIN_AREAS - 1, 1))
+
+    def test_automatic_choice(self) -> None:
+        large = AbandonedSpaceStation(
+            10000, 10000, 1000, seed=1, compact=True, verbose=False
+        )
+        self.assertTrue(large.sparse_index)
+        self.assertEqual(len(large.hazard_locations), 1000)
+        small = AbandonedSpaceStation(30, 16, 99, seed=1, compact=True)
+        self.assertFalse(small.sparse_index)
+
+    def test_invalid_index(self) -> None:
+        with self.assertRaises(ValueError):
+            AbandonedSpaceStation(5, 5, 5, hazard_index="tree")
+
+
+class TestSparseCounts(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(4)
+        self.hazards = set(rng.sample(range(13 * 9), 20))
+        self.counts = SparseCounts(13, 9, self.hazards)
+        marks = bytearray(13 * 9)
+        for index in self.hazards:
+            marks[index] = 1
+        self.table = dense_counts(marks, 13, 9)
+
+    def test_matches_dense_table(self) -> None:
+        self.assertEqual(len(self.counts), len(self.table))
+        self.assertEqual([self.counts[i] for i in range(117)], list(self.table))
+        self.assertEqual(self.counts.to_table(), self.table)
+        self.assertEqual(self.counts[20:40], bytes(self.table[20:40]))
+        self.assertEqual(self.counts[-1], self.table[-1])
+        with self.assertRaises(IndexError):
+            self.counts[117]  # pylint: disable=pointless-statement
+
+    def test_move_hazards(self) -> None:
+        rng = random.Random(5)
+        removed = rng.sample(sorted(self.hazards), 6)
+        added = rng.sample(sorted(set(range(117)) - self.hazards), 4)
+        marks = bytearray(117)
+        for index in self.hazards - set(removed) | set(added):
+            marks[index] = 1
+        moved = self.counts.to_table()
+        move_hazards(moved, 13, 9, removed, added)
+        self.assertEqual(moved, dense_counts(marks, 13, 9))
+        move_hazards(self.counts, 13, 9, removed, added)
+        self.assertEqual(self.counts.to_table(), moved)
+
+    def test_triggered_flag(self) -> None:
+        index = min(self.hazards)
+        self.counts[index] = self.counts[index] | TRIGGERED_FLAG
+        self.assertTrue(self.counts[index] & TRIGGERED_FLAG)
+        self.assertTrue(bytes(self.counts)[index] & TRIGGERED_FLAG)
+        self.counts[index] = self.counts[index] & ~TRIGGERED_FLAG
+        self.assertEqual(self.counts[index], self.table[index])
+
+    def test_locations(self) -> None:
+        locations = self.counts.locations()
+        self.assertEqual(
+            set(locations), {(index % 13, index // 13) for index in self.hazards}
+        )
+        self.assertNotIn((13, 0), locations)
+        self.assertNotIn("0,0", locations)
+
+
+class TestSparseGame(unittest.TestCase):
+    def play_both(self, compact: bool):
+        games = [
+            AbandonedSpaceStation(
+                16,
+                12,
+                25,
+                seed=7,
+                compact=compact,
+                verbose=False,
+                hazard_index=index,
+            )
+            for index in ("dense", "sparse")
+        ]
+        self.assertEqual([game.sparse_index for game in games], [False, True])
+        rng = random.Random(8)
+        for _ in range(30):
+            x, y = rng.randrange(16), rng.randrange(12)
+            for game in games:
+                game.is_defeated = False
+            results = [game.reveal_area(x, y) for game in games]
+            self.assertEqual(results[0], results[1])
+        for game in games:
+            game.undo()
+        return games
+
+    def test_same_board_and_moves(self) -> None:
+        for compact in (False, True):
+            dense, sparse = self.play_both(compact)
+            self.assertEqual(set(dense.hazard_locations), set(sparse.hazard_locations))
+            self.assertEqual(
+                [list(row) for row in dense.grid], [list(row) for row in sparse.grid]
+            )
+            self.assertEqual(dense.tables(), sparse.tables())
+            self.assertEqual(dump_game(dense), dump_game(sparse))
+
+    def test_assigned_hazards(self) -> None:
+        game = AbandonedSpaceStation(
+            6, 6, 0, compact=True, verbose=False, hazard_index="sparse"
+        )
+        game.hazard_locations = {(0, 0), (5, 5)}
+        self.assertTrue(game.sparse_index)
+        self.assertEqual(set(game.hazard_locations), {(0, 0), (5, 5)})
+        self.assertEqual(game.count_adjacent_hazards(1, 1), 1)
+        self.assertTrue(game.scan_area(2, 2))
+        self.assertFalse(game.scan_area(5, 5))
+        self.assertEqual(game.grid[5][5], "H")
+
+    def test_sparse_index_on_dense_board(self) -> None:
+        games = [
+            AbandonedSpaceStation(6, 6, 30, seed=3, verbose=False, hazard_index=index)
+            for index in ("dense", "sparse")
+        ]
+        self.assertEqual([game.sparse_index for game in games], [False, True])
+        self.assertEqual(set(games[0].hazard_locations), set(games[1].hazard_locations))
+        self.assertEqual(len(games[1].hazard_locations), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for the change log in history.py.
+
+Tests recording, undoing and redoing actions and checking snapshots.
+"""
+
+# pylint: disable=C
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.history import FLAG_BITS, REVEALED, TRIGGERED, ChangeLog, Snapshot
+
+
+class TestChangeLog(unittest.TestCase):
+    def test_undo_and_redo(self) -> None:
+        log = ChangeLog()
+        log.record(7, TRIGGERED)
+        log.revealed.extend([1, 2, 3])
+        log.record(0, REVEALED)
+        self.assertEqual(len(log), 2)
+        action, areas = log.undo() or (0, ())
+        self.assertEqual((action >> FLAG_BITS, list(areas)), (0, [1, 2, 3]))
+        self.assertEqual(list(log.revealed), [])
+        action, areas = log.undo() or (0, ())
+        self.assertEqual((action, tuple(areas)), (7 << FLAG_BITS | TRIGGERED, (7,)))
+        self.assertIsNone(log.undo())
+        log.redo()
+        log.redo()
+        self.assertIsNone(log.redo())
+        self.assertEqual((len(log), list(log.revealed)), (2, [1, 2, 3]))
+
+    def test_snapshots(self) -> None:
+        log = ChangeLog()
+        root = log.snapshot()
+        log.record(1, 0)
+        leaf = log.snapshot()
+        log.undo()
+        self.assertEqual(log.position(leaf), 1)
+        # A different action replaces the undone one.
+        log.record(2, 0)
+        with self.assertRaises(ValueError):
+            log.position(leaf)
+        self.assertEqual(log.position(root), 0)
+        with self.assertRaises(ValueError):
+            log.position(Snapshot(0, 100))
+        log.clear()
+        self.assertEqual(len(log), 0)
+        with self.assertRaises(ValueError):
+            log.position(log.snapshot()._replace(position=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
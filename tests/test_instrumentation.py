@@ -0,0 +1,98 @@
+"""
+Unit tests for the hot-path instrumentation in instrumentation.py.
+
+Tests the latency histograms and the instrumented game.
+"""
+
+# pylint: disable=C
+
+import os
+import sys
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.instrumentation import Instrumentation, LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_empty(self) -> None:
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.mean, 0.0)
+        self.assertEqual(histogram.percentile(0.5), 0)
+        self.assertEqual(histogram.as_dict()["buckets"], {})
+
+    def test_percentiles(self) -> None:
+        histogram = LatencyHistogram()
+        for value in [100] * 90 + [5000] * 9 + [70000]:
+            histogram.record(value)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.minimum, 100)
+        self.assertEqual(histogram.maximum, 70000)
+        self.assertAlmostEqual(histogram.mean, (9000 + 45000 + 70000) / 100)
+        self.assertEqual(histogram.percentile(0.5), 127)
+        self.assertEqual(histogram.percentile(0.95), 8191)
+        self.assertEqual(histogram.percentile(1.0), 70000)
+        self.assertEqual(histogram.as_dict()["buckets"], {127: 90, 8191: 9, 131071: 1})
+
+
+class TestInstrumentedGame(unittest.TestCase):
+    def test_disabled_by_default(self) -> None:
+        game = AbandonedSpaceStation()
+        self.assertIsNone(game.instrumentation)
+        self.assertNotIn("scan_area", vars(game))
+        self.assertNotIn("instrumentation", game.statistics())
+
+    def test_records_moves(self) -> None:
+        instrumentation = Instrumentation()
+        game = AbandonedSpaceStation(
+            5, 5, 0, verbose=False, instrumentation=instrumentation
+        )
+        game.scan_area(0, 0)
+        game.scan_area(1, 0)
+        game.reveal_area(4, 4)
+        latency = game.statistics()["instrumentation"]["latency_ns"]
+        self.assertEqual(latency["scan_area"]["count"], 2)
+        self.assertEqual(latency["reveal_area"]["count"], 1)
+        self.assertTrue(game.is_victorious)
+        self.assertNotIn("allocated_bytes", instrumentation.as_dict())
+
+    def test_trace_allocations(self) -> None:
+        was_tracing = tracemalloc.is_tracing()
+        instrumentation = Instrumentation(trace_allocations=True)
+        self.addCleanup(instrumentation.stop)
+        game = AbandonedSpaceStation(
+            20, 20, 0, verbose=False, instrumentation=instrumentation
+        )
+        game.reveal_area(0, 0)
+        self.assertEqual(instrumentation.allocated_bytes.count, 1)
+        self.assertGreater(instrumentation.peak_bytes.maximum, 0)
+        self.assertIn("peak_bytes", instrumentation.as_dict())
+        instrumentation.stop()
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+
+    def test_play_shows_measurements(self) -> None:
+        instrumentation = Instrumentation()
+        game = AbandonedSpaceStation(5, 5, 0, instrumentation=instrumentation)
+        game.hazard_locations = {
+            (x, y) for x in range(5) for y in range(5) if (x, y) != (0, 0)
+        }
+        with patch("builtins.input", side_effect=["x", "0 0"]):
+            with patch("builtins.print") as mock_print:
+                with patch("sys.stdout"):
+                    game.play()
+        self.assertTrue(game.is_victorious)
+        self.assertEqual(instrumentation.histograms["process_coordinates"].count, 2)
+        self.assertEqual(instrumentation.histograms["render"].count, 2)
+        self.assertEqual(instrumentation.histograms["scan_area"].count, 1)
+
+        printed = [str(call[0][0]) for call in mock_print.call_args_list if call[0]]
+        self.assertIn("PERFORMANCE", printed)
+        self.assertTrue(any(line.startswith("scan_area: 1 calls") for line in printed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Unit tests for the move journal in journal.py.
+
+Tests recording, batched writing, keyframes and seeking.
+"""
+
+# pylint: disable=C
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.journal import JournalReader, MoveJournal, main
+
+
+def _grid(game: AbandonedSpaceStation) -> list:
+    return [list(row) for row in game.grid]
+
+
+class TestMoveJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "game.journal")
+
+    def _record_game(self, keyframe_interval: int) -> list:
+        game = AbandonedSpaceStation(12, 10, 8, seed=2, verbose=False)
+        rng = random.Random(3)
+        states = [_grid(game)]
+        with MoveJournal(game, self.path, keyframe_interval) as journal:
+            while not (game.is_defeated or game.is_victorious):
+                x, y = rng.randrange(12), rng.randrange(10)
+                if (x, y) in game.scanned_areas or (
+                    (x, y) in game.hazard_locations and rng.random() < 0.95
+                ):
+                    continue
+                if rng.random() < 0.5:
+                    game.scan_area(x, y)
+                else:
+                    game.reveal_area(x, y)
+                states.append(_grid(game))
+            self.assertEqual(journal.moves, len(states) - 1)
+        self.assertEqual(game.move_listeners, [])
+        return states
+
+    def test_seek_every_move(self) -> None:
+        states = self._record_game(keyframe_interval=4)
+        with JournalReader(self.path) as reader:
+            self.assertEqual(reader.move_count, len(states) - 1)
+            for move, state in enumerate(states):
+                self.assertEqual(_grid(reader.seek(move)), state)
+            self.assertEqual(_grid(reader.seek()), states[-1])
+
+    def test_moves(self) -> None:
+        states = self._record_game(keyframe_interval=3)
+        with JournalReader(self.path) as reader:
+            moves = list(reader.moves())
+            self.assertEqual(
+                [move.number for move in moves], list(range(1, len(states)))
+            )
+            self.assertEqual(list(reader.moves(5)), moves[4:])
+            self.assertFalse(moves[-1].safe and not reader.seek().is_victorious)
+
+    def test_buffered_writes(self) -> None:
+        game = AbandonedSpaceStation(5, 5, 0, verbose=False)
+        journal = MoveJournal(game, self.path, buffer_size=1 << 20)
+        game.scan_area(1, 1)
+        self.assertEqual(os.path.getsize(self.path), 0)
+        journal.close()
+        with JournalReader(self.path) as reader:
+            self.assertEqual(reader.move_count, 1)
+
+    def test_no_undo_while_recording(self) -> None:
+        game = AbandonedSpaceStation(5, 5, 0, verbose=False)
+        game.hazard_locations = {(4, 4)}
+        with MoveJournal(game, self.path) as journal:
+            game.scan_area(0, 0)
+            game.scan_area(1, 0)
+            for method in (game.undo, game.redo):
+                with self.assertRaises(RuntimeError):
+                    method()
+            self.assertEqual(journal.moves, 2)
+        with JournalReader(self.path) as reader:
+            self.assertEqual(_grid(reader.seek()), _grid(game))
+        # Without a journal the actions can be taken back again.
+        self.assertTrue(game.undo())
+        self.assertTrue(game.redo())
+
+    def test_truncated_journal(self) -> None:
+        states = self._record_game(keyframe_interval=2)
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 5)
+        with JournalReader(self.path) as reader:
+            count = reader.move_count
+            # Either the last move or the keyframe after it was cut off.
+            self.assertIn(count, (len(states) - 2, len(states) - 1))
+            self.assertEqual(_grid(reader.seek(count)), states[count])
+
+    def test_invalid_journal(self) -> None:
+        with open(self.path, "wb") as file:
+            file.write(b"nonsense")
+        with self.assertRaises(ValueError):
+            JournalReader(self.path)
+        with self.assertRaises(ValueError):
+            MoveJournal(AbandonedSpaceStation(), self.path, keyframe_interval=0)
+
+    def test_main(self) -> None:
+        self._record_game(keyframe_interval=5)
+        with patch("builtins.print") as mock_print:
+            main([self.path, "3"])
+        self.assertTrue(mock_print.call_args_list[0][0][0].startswith("Move 3 of"))
+
+
+if __name__ == "__main__":
+    unittest.main()
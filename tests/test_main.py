@@ -3,18 +3,31 @@ Unit tests for the main functions in main.py.
 
 Tests game initialization and setup functionality.
 """
+
 # pylint: disable=C
 
 import unittest
 from unittest.mock import patch, MagicMock
 import io
 from contextlib import redirect_stdout
+import json
 import os
+import shutil
 import sys
+import tempfile
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from exam.source.main import _get_custom_settings, main, handle_game_interrupt
+from exam.source.game import AbandonedSpaceStation
+from exam.source.instrumentation import Instrumentation
+from exam.source.main import (
+    _get_custom_settings,
+    batch_main,
+    cli,
+    main,
+    handle_game_interrupt,
+    run_batch,
+)
 
 
 class TestGetCustomSettings(unittest.TestCase):
@@ -114,6 +127,39 @@ class TestMain(unittest.TestCase):
         mock_game_class.assert_called_once_with(10, 12, 20)
         mock_game_instance.play.assert_called_once()
 
+    @patch("exam.source.main.clear_terminal")
+    @patch("builtins.input")
+    @patch("exam.source.main.AbandonedSpaceStation")
+    def test_game_from_pool(self, mock_game_class, mock_input, _):
+        mock_input.return_value = "n"
+        pool = MagicMock()
+        pool_game = MagicMock()
+        pool.take.return_value = pool_game
+
+        main(pool)
+
+        pool.take.assert_called_once_with(5, 5, 5)
+        mock_game_class.assert_not_called()
+        pool_game.play.assert_called_once()
+
+    @patch("exam.source.main.clear_terminal")
+    @patch("exam.source.main._get_custom_settings")
+    @patch("builtins.input")
+    @patch("exam.source.main.AbandonedSpaceStation")
+    def test_pool_without_ready_game(
+        self, mock_game_class, mock_input, mock_get_settings, _
+    ):
+        mock_input.return_value = "y"
+        mock_get_settings.return_value = (10, 12, 20)
+        pool = MagicMock()
+        pool.take.return_value = None
+
+        main(pool)
+
+        pool.take.assert_called_once_with(10, 12, 20)
+        mock_game_class.assert_called_once_with(10, 12, 20)
+        mock_game_class.return_value.play.assert_called_once()
+
     @patch("exam.source.main.clear_terminal")
     @patch("builtins.input")
     @patch("builtins.print")
@@ -127,6 +173,108 @@ class TestMain(unittest.TestCase):
 
         mock_print.assert_any_call("Please enter 'y' or 'n'.")
 
+    @patch("exam.source.main.clear_terminal")
+    @patch("builtins.input")
+    def test_instrumented_game(self, mock_input, _):
+        # Scanning every area ends the game by a hazard or a victory.
+        moves = [f"{x} {y}" for y in range(5) for x in range(5)]
+        mock_input.side_effect = ["n"] + moves
+        pool = MagicMock()
+
+        with redirect_stdout(io.StringIO()) as f:
+            main(pool, instrumentation=Instrumentation())
+
+        pool.take.assert_not_called()
+        performance = f.getvalue().split("PERFORMANCE\n", 1)[1]
+        self.assertRegex(performance, r"scan_area: \d+ calls")
+        self.assertIn("render: ", performance)
+
+
+class TestBatchMode(unittest.TestCase):
+    def setUp(self):
+        hazards = AbandonedSpaceStation(5, 5, 3, seed=7, verbose=False).hazard_locations
+        self.hazard = min(hazards)
+        self.safe = [
+            (x, y) for y in range(5) for x in range(5) if (x, y) not in hazards
+        ]
+
+    def test_lost_game_with_log(self):
+        (x, y), (hx, hy) = self.safe[0], self.hazard
+        lines = ["# comment", "", "9 9", f"{x} {y}", f"{x} {y}", f"{hx} {hy}", "0 0"]
+        log = io.StringIO()
+        summary = run_batch(5, 5, 3, lines, seed=7, log=log)
+        self.assertEqual(summary["result"], "lost")
+        self.assertEqual(summary["moves_read"], 4)
+        self.assertEqual(summary["moves_rejected"], 1)
+        self.assertEqual(summary["moves_ignored"], 1)
+        self.assertEqual(summary["actions"], 2)
+        entries = [json.loads(line) for line in log.getvalue().splitlines()]
+        self.assertEqual(
+            [entry["result"] for entry in entries],
+            ["invalid", "safe", "repeated", "hazard"],
+        )
+        self.assertIn("adjacent", entries[1])
+
+    def test_won_game(self):
+        lines = [f"{x} {y}" for x, y in self.safe] + ["q"]
+        summary = run_batch(5, 5, 3, lines, seed=7)
+        self.assertEqual(summary["result"], "won")
+        self.assertEqual(summary["completion_percent"], 100)
+
+    def test_quit_leaves_game_unfinished(self):
+        summary = run_batch(5, 5, 3, ["q", "0 0"], seed=7)
+        self.assertEqual(summary["result"], "unfinished")
+        self.assertEqual(summary["actions"], 0)
+
+    def test_batch_main_reads_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "moves.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(f"{x} {y}" for x, y in self.safe))
+        argv = ["--moves", path, "--hazards", "3", "--seed", "7", "--json"]
+        with redirect_stdout(io.StringIO()) as f:
+            self.assertEqual(batch_main(argv), 0)
+        self.assertEqual(json.loads(f.getvalue())["result"], "won")
+
+    def test_batch_main_with_instrumentation(self):
+        moves = io.StringIO("\n".join(f"{x} {y}" for x, y in self.safe[:3]))
+        argv = ["--hazards", "3", "--seed", "7", "--trace-allocations"]
+        with patch("sys.stdin", moves), redirect_stdout(io.StringIO()) as f:
+            batch_main(argv)
+        output = f.getvalue()
+        self.assertIn("\nperformance:\n  scan_area: 3 calls", output)
+        self.assertIn("allocations per move", output)
+        self.assertNotIn("instrumentation:", output)
+
+
+class TestCli(unittest.TestCase):
+    @patch("exam.source.main.batch_main")
+    def test_arguments_start_batch_mode(self, mock_batch_main):
+        mock_batch_main.return_value = 1
+        with self.assertRaises(SystemExit) as context:
+            cli(["--moves", "moves.txt"])
+        self.assertEqual(context.exception.code, 1)
+        mock_batch_main.assert_called_once_with(["--moves", "moves.txt"])
+
+    @patch("exam.source.pool.BoardPool")
+    @patch("exam.source.main.main")
+    def test_interactive_game_uses_pool(self, mock_main, mock_pool_class):
+        cli([])
+        mock_pool_class.assert_called_once_with([(5, 5, 5)], size=1)
+        mock_main.assert_called_once_with(
+            mock_pool_class.return_value.__enter__.return_value
+        )
+
+    @patch.dict(os.environ, {"STATION_INSTRUMENTATION": "1"})
+    @patch("exam.source.pool.BoardPool")
+    @patch("exam.source.main.main")
+    def test_instrumentation_from_environment(self, mock_main, _):
+        cli([])
+        instrumentation = mock_main.call_args[0][3]
+        self.assertIsInstance(instrumentation, Instrumentation)
+        self.assertFalse(instrumentation.trace_allocations)
+
 
 class TestHandleGameInterrupt(unittest.TestCase):
     @patch("builtins.print")
@@ -0,0 +1,99 @@
+"""
+Unit tests for the save files in persistence.py.
+
+Tests saving and loading games with and without memory mapping.
+"""
+
+# pylint: disable=C
+
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.persistence import MAGIC, load_game, save_game
+
+
+class TestPersistence(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "game.sav")
+
+    def _played_game(self, compact: bool = False) -> AbandonedSpaceStation:
+        game = AbandonedSpaceStation(30, 20, 60, seed=4, compact=compact, verbose=False)
+        for x in range(30):
+            if (x, 10) not in game.hazard_locations:
+                game.reveal_area(x, 10)
+        return game
+
+    def _assert_same_game(
+        self, loaded: AbandonedSpaceStation, game: AbandonedSpaceStation
+    ) -> None:
+        self.assertEqual(
+            (loaded.grid_width, loaded.grid_height), (game.grid_width, game.grid_height)
+        )
+        self.assertEqual(
+            [list(row) for row in loaded.grid], [list(row) for row in game.grid]
+        )
+        self.assertEqual(set(loaded.hazard_locations), set(game.hazard_locations))
+        self.assertEqual(set(loaded.scanned_areas), set(game.scanned_areas))
+        self.assertEqual(loaded.scanned_count, game.scanned_count)
+        self.assertEqual(loaded.action_count, game.action_count)
+        self.assertEqual(loaded.is_defeated, game.is_defeated)
+        self.assertEqual(loaded.is_victorious, game.is_victorious)
+
+    def test_round_trip(self) -> None:
+        for compact in (False, True):
+            game = self._played_game(compact)
+            save_game(game, self.path)
+            with open(self.path, "rb") as file:
+                self.assertEqual(file.read(4), MAGIC)
+            for mapped in (False, True):
+                loaded = load_game(self.path, mapped=mapped, verbose=False)
+                self.assertTrue(loaded.compact)
+                self.assertEqual(isinstance(loaded.tables()[0], mmap.mmap), mapped)
+                self._assert_same_game(loaded, game)
+
+    def test_continue_loaded_game(self) -> None:
+        game = AbandonedSpaceStation(4, 4, 0, seed=1, verbose=False)
+        game.hazard_locations = {(3, 3)}
+        save_game(game, self.path)
+        loaded = load_game(self.path, mapped=True, verbose=False)
+        self.assertEqual(len(loaded.reveal_area(0, 0)), 15)
+        self.assertTrue(loaded.is_victorious)
+        self.assertFalse(loaded.scan_area(3, 3))
+        self.assertEqual(loaded.grid[3][3], "H")
+
+        # The save file is not changed by the loaded game.
+        again = load_game(self.path, mapped=True, verbose=False)
+        self.assertEqual(again.scanned_count, 0)
+        self.assertFalse(again.is_defeated)
+
+    def test_invalid_files(self) -> None:
+        with open(self.path, "wb") as file:
+            file.write(b"not a save file at all, definitely not")
+        with self.assertRaises(ValueError):
+            load_game(self.path)
+
+        save_game(self._played_game(), self.path)
+        with open(self.path, "r+b") as file:
+            file.seek(4)
+            file.write(b"\xff\x00")
+        with self.assertRaises(ValueError):
+            load_game(self.path)
+
+        save_game(self._played_game(), self.path)
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 10)
+        with self.assertRaises(ValueError):
+            load_game(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
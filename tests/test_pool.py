@@ -0,0 +1,109 @@
+"""
+Unit tests for the board pool in pool.py.
+
+Tests filling, taking and replacing games in the background thread.
+"""
+
+# pylint: disable=C
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.pool import BoardPool
+
+
+class TestBoardPool(unittest.TestCase):
+    def make_pool(self, *args, **kwargs) -> BoardPool:
+        pool = BoardPool(*args, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_take_ready_game(self) -> None:
+        pool = self.make_pool([(6, 5, 4)], size=2)
+        self.assertTrue(pool.wait_full(10))
+        self.assertEqual(pool.ready(6, 5, 4), 2)
+        game = pool.take(6, 5, 4)
+        assert game is not None
+        self.assertEqual((game.grid_width, game.grid_height), (6, 5))
+        self.assertEqual(len(game.hazard_locations), 4)
+        self.assertEqual(game.action_count, 0)
+        self.assertEqual(pool.hits, 1)
+        self.assertTrue(pool.wait_full(10))
+        self.assertEqual(pool.ready(6, 5, 4), 2)
+        self.assertIsNot(pool.take(6, 5, 4), game)
+
+    def test_miss_registers_configuration(self) -> None:
+        pool = self.make_pool(size=1)
+        self.assertIsNone(pool.take(7, 7, 3, register=True))
+        self.assertEqual(pool.misses, 1)
+        self.assertTrue(pool.wait_full(10))
+        self.assertEqual(pool.ready(7, 7, 3), 1)
+
+    def test_miss_starts_no_build(self) -> None:
+        built = []
+
+        def factory(width: int, height: int, hazards: int) -> AbandonedSpaceStation:
+            built.append((width, height, hazards))
+            return AbandonedSpaceStation(width, height, hazards)
+
+        pool = self.make_pool([(5, 5, 5)], size=1, factory=factory)
+        self.assertTrue(pool.wait_full(10))
+        self.assertIsNone(pool.take(7, 7, 3))
+        self.assertEqual(pool.misses, 1)
+        self.assertTrue(pool.wait_full(10))
+        self.assertEqual(pool.ready(7, 7, 3), 0)
+        self.assertEqual(built, [(5, 5, 5)])
+
+    def test_bounded_configurations(self) -> None:
+        pool = self.make_pool([(5, 5, 5)], size=1, max_configurations=1)
+        self.assertTrue(pool.wait_full(10))
+        pool.take(6, 6, 6, register=True)
+        self.assertTrue(pool.wait_full(10))
+        self.assertEqual(pool.ready(5, 5, 5), 0)
+        self.assertEqual(pool.ready(6, 6, 6), 1)
+
+    def test_rejected_configuration_is_dropped(self) -> None:
+        pool = self.make_pool(size=1)
+        self.assertIsNone(pool.take(5, 5, 30, register=True))
+        self.assertTrue(pool.wait_full(10))
+        self.assertEqual(pool.ready(5, 5, 30), 0)
+
+    def test_custom_factory(self) -> None:
+        def factory(width: int, height: int, hazards: int) -> AbandonedSpaceStation:
+            return AbandonedSpaceStation(
+                width, height, hazards, compact=True, verbose=False
+            )
+
+        pool = self.make_pool([(8, 8, 10)], size=1, factory=factory)
+        self.assertTrue(pool.wait_full(10))
+        game = pool.take(8, 8, 10)
+        assert game is not None
+        self.assertTrue(game.compact)
+
+    def test_factory_error(self) -> None:
+        def factory(width: int, height: int, hazards: int) -> AbandonedSpaceStation:
+            raise MemoryError("no memory for the board")
+
+        pool = self.make_pool([(8, 8, 10)], size=1, factory=factory)
+        with self.assertRaises(MemoryError):
+            pool.wait_full(None)
+        with self.assertRaises(MemoryError):
+            pool.take(8, 8, 10)
+
+    def test_closed_pool(self) -> None:
+        pool = self.make_pool([(5, 5, 5)])
+        pool.close()
+        self.assertIsNone(pool.take(5, 5, 5))
+        self.assertFalse(pool.wait_full(0))
+
+    def test_invalid_size(self) -> None:
+        with self.assertRaises(ValueError):
+            BoardPool(size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Unit tests for the probability engine in probability.py.
+
+Tests component enumeration and the combined probabilities against a brute
+force count over all hazard arrangements.
+"""
+
+# pylint: disable=C
+
+import itertools
+import os
+import random
+import sys
+import unittest
+from typing import Dict, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.probability import (
+    ProbabilityEngine,
+    enumerate_component,
+    probability_policy,
+)
+from exam.source.simulation import run_simulations
+from exam.source.solver import UNKNOWN, ConstraintSolver
+
+
+def brute_force(game: AbandonedSpaceStation) -> Dict[Tuple[int, int], float]:
+    width, height = game.grid_width, game.grid_height
+    revealed = {
+        (x, y): int(game.grid[y][x])
+        for y in range(height)
+        for x in range(width)
+        if game.grid[y][x].isdigit()
+    }
+    hidden = [
+        (x, y) for y in range(height) for x in range(width) if (x, y) not in revealed
+    ]
+    hazard_total = len(game.hazard_locations)
+    totals = dict.fromkeys(hidden, 0)
+    solutions = 0
+    for hazards in itertools.combinations(hidden, hazard_total):
+        hazard_set = set(hazards)
+        if all(
+            sum(
+                (x + dx, y + dy) in hazard_set for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+            )
+            == value
+            for (x, y), value in revealed.items()
+        ):
+            solutions += 1
+            for position in hazards:
+                totals[position] += 1
+    return {position: count / solutions for position, count in totals.items()}
+
+
+class TestEnumerateComponent(unittest.TestCase):
+    def test_counts(self) -> None:
+        # Two areas share one hazard, the second also touches a third area.
+        counts = enumerate_component(frozenset({((1, 2), 1), ((2, 3), 1)}))
+        self.assertEqual(counts.cells, (1, 2, 3))
+        self.assertEqual(counts.solutions, {1: 1, 2: 1})
+        self.assertEqual(counts.hazard_counts[1], [0, 1, 0])
+        self.assertEqual(counts.hazard_counts[2], [1, 0, 1])
+
+
+class TestProbabilityEngine(unittest.TestCase):
+    def test_matches_brute_force(self) -> None:
+        for seed in range(12):
+            game = AbandonedSpaceStation(5, 4, 4, seed=seed, verbose=False)
+            rng = random.Random(seed)
+            safe = [
+                (x, y)
+                for y in range(4)
+                for x in range(5)
+                if (x, y) not in game.hazard_locations
+            ]
+            for x, y in rng.sample(safe, 5):
+                game.scan_area(x, y)
+            solver = ConstraintSolver(game)
+            engine = ProbabilityEngine(solver)
+            probabilities = engine.probabilities()
+            expected = brute_force(game)
+            for (x, y), probability in expected.items():
+                state = solver.state[y * 5 + x]
+                if state != UNKNOWN:
+                    self.assertIn(probability, (0.0, 1.0))
+                elif (x, y) in probabilities:
+                    self.assertAlmostEqual(probabilities[(x, y)], probability)
+                else:
+                    self.assertAlmostEqual(engine.interior_probability, probability)
+
+    def test_cache_keeps_unchanged_components(self) -> None:
+        game = AbandonedSpaceStation(12, 3, 0, verbose=False)
+        game.hazard_locations = {(1, 0), (10, 0), (5, 2)}
+        game.scan_area(1, 1)
+        game.scan_area(10, 1)
+        solver = ConstraintSolver(game)
+        engine = ProbabilityEngine(solver)
+        engine.probabilities()
+        cached = dict(engine.component_cache)
+        self.assertEqual(len(cached), 2)
+        game.scan_area(0, 2)
+        solver.update([(0, 2)])
+        engine.probabilities()
+        kept = [key for key in engine.component_cache if key in cached]
+        self.assertEqual(len(kept), 1)
+        self.assertIs(engine.component_cache[kept[0]], cached[kept[0]])
+
+    def test_safest_area(self) -> None:
+        game = AbandonedSpaceStation(5, 5, 0, verbose=False)
+        game.hazard_locations = {(0, 1)}
+        game.scan_area(0, 0)
+        engine = ProbabilityEngine(ConstraintSolver(game))
+        safest = engine.safest_area(random.Random(1))
+        assert safest is not None
+        position, probability = safest
+        self.assertNotIn(position, {(0, 1), (1, 0), (1, 1)})
+        self.assertAlmostEqual(probability, 0.0)
+
+    def test_safest_area_without_undecided_areas(self) -> None:
+        game = AbandonedSpaceStation(3, 1, 0, verbose=False)
+        game.hazard_locations = {(2, 0)}
+        game.scan_area(0, 0)
+        solver = ConstraintSolver(game)
+        engine = ProbabilityEngine(solver)
+        # The count of (1, 0) reveals the last area as a hazard.
+        game.scan_area(1, 0)
+        solver.update([(1, 0)])
+        self.assertEqual(solver.undecided, 0)
+        self.assertIsNone(engine.safest_area(random.Random(1)))
+
+    def test_probability_policy(self) -> None:
+        result = run_simulations(
+            20, 9, 9, 10, policy=probability_policy, workers=1, seed=4
+        )
+        self.assertEqual(result.games, 20)
+        self.assertEqual(result.unfinished, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
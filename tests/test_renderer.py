@@ -0,0 +1,283 @@
+"""
+Unit tests for the terminal renderer in renderer.py.
+
+Tests frame formatting, diff updates, the plain fallback and the viewport.
+"""
+
+# pylint: disable=C
+
+import io
+import os
+import re
+import sys
+import unittest
+from typing import List, Optional
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import _INTRO, _VIEWPORT_INTRO, AbandonedSpaceStation
+from exam.source.renderer import (
+    TerminalRenderer,
+    Viewport,
+    fit_screen,
+    format_grid,
+    scroll_steps,
+    supports_ansi,
+    terminal_size,
+)
+
+
+class Screen:
+    """
+    Terminal of a fixed size that understands the escape sequences of the
+    renderer and scrolls like a real terminal.
+    """
+
+    def __init__(self, columns: int, lines: int) -> None:
+        self.columns = columns
+        self.lines = lines
+        self.rows = [""] * lines
+        self.row = self.column = 0
+        # The screen each time the player was asked for input.
+        self.prompts: List[List[str]] = []
+
+    def write(self, text: str) -> None:
+        for token in re.split(r"(\x1b\[[0-9;]*[HJ]|\n)", text):
+            if token == "\n":
+                self.row += 1
+                self.column = 0
+                if self.row == self.lines:
+                    self.rows = self.rows[1:] + [""]
+                    self.row -= 1
+            elif token == "\x1b[2J":
+                self.rows = [""] * self.lines
+            elif token == "\x1b[J":
+                self.rows[self.row] = self.rows[self.row][: self.column]
+                self.rows[self.row + 1 :] = [""] * (self.lines - self.row - 1)
+            elif token.startswith("\x1b["):
+                row, _, column = token[2:-1].partition(";")
+                self.row, self.column = int(row or 1) - 1, int(column or 1) - 1
+                assert self.row < self.lines, "cursor below the screen"
+            elif token:
+                line = self.rows[self.row].ljust(self.column)
+                end = self.column + len(token)
+                self.rows[self.row] = line[: self.column] + token + line[end:]
+                self.column = end
+
+    def flush(self) -> None:
+        pass
+
+    def play(self, game: AbandonedSpaceStation, inputs: List[str]) -> None:
+        def typed(prompt: str) -> str:
+            # The player's Enter moves the cursor to the next line.
+            self.prompts.append(list(self.rows))
+            value = inputs.pop(0)
+            self.write(prompt + value + "\n")
+            return value
+
+        size = (self.columns, self.lines)
+        with patch("exam.source.game.terminal_size", return_value=size), patch(
+            "exam.source.renderer.terminal_size", return_value=size
+        ), patch("exam.source.renderer.supports_ansi", return_value=True), patch(
+            "builtins.input", side_effect=typed
+        ), patch(
+            "sys.stdout", self
+        ):
+            game.play()
+
+    def shows_grid(
+        self, game: AbandonedSpaceStation, rows: Optional[List[str]] = None
+    ) -> bool:
+        lines = format_grid(["".join(row) for row in game.grid])[:-1]
+        screen = [row.rstrip() for row in (self.rows if rows is None else rows)]
+        expected = [line.rstrip() for line in lines]
+        return any(
+            screen[first : first + len(expected)] == expected
+            for first in range(self.lines - len(expected) + 1)
+        )
+
+
+class TestFormatGrid(unittest.TestCase):
+    def test_format_grid(self) -> None:
+        lines = format_grid(["0?", "1H"])
+        self.assertEqual(
+            lines, ["    0  1 ", "   ------", "0 | 0  ? ", "1 | 1  H ", ""]
+        )
+
+    def test_multi_digit_labels(self) -> None:
+        lines = format_grid(["???", "???", "???"], left=8, top=9)
+        self.assertEqual(
+            lines,
+            [
+                "           1 ",
+                "     8  9  0 ",
+                "    ---------",
+                " 9 | ?  ?  ? ",
+                "10 | ?  ?  ? ",
+                "11 | ?  ?  ? ",
+                "",
+            ],
+        )
+
+
+class TestTerminalRenderer(unittest.TestCase):
+    def test_plain_fallback_prints_full_frames(self) -> None:
+        stream = io.StringIO()
+        renderer = TerminalRenderer(header="Title\n", stream=stream, ansi=False)
+        renderer.render(["??", "??"])
+        renderer.render(["0?", "??"])
+        output = stream.getvalue()
+        self.assertNotIn("\x1b", output)
+        self.assertEqual(output.count("Title"), 1)
+        self.assertIn("0 | 0  ? ", output)
+
+    def test_ansi_redraws_only_changed_cells(self) -> None:
+        stream = io.StringIO()
+        renderer = TerminalRenderer(header="Title\n", stream=stream, ansi=True)
+        renderer.render(["???", "???"])
+        self.assertTrue(stream.getvalue().startswith("\x1b[H\x1b[2JTitle\n"))
+
+        stream.seek(0)
+        stream.truncate()
+        renderer.render(["???", "?1?"])
+        self.assertEqual(stream.getvalue(), "\x1b[5;8H1\x1b[7;1H\x1b[J")
+
+        renderer.invalidate()
+        stream.seek(0)
+        stream.truncate()
+        renderer.render(["???", "?1?"])
+        self.assertIn("1 | ?  1  ? ", stream.getvalue())
+
+    def test_diff_inside_viewport(self) -> None:
+        stream = io.StringIO()
+        renderer = TerminalRenderer(header="Title\n", stream=stream, ansi=True)
+        renderer.render(["???", "???", "???"], 8, 9)
+        stream.seek(0)
+        stream.truncate()
+        renderer.render(["???", "?1?", "???"], 8, 9)
+        self.assertEqual(stream.getvalue(), "\x1b[6;9H1\x1b[9;1H\x1b[J")
+
+        # Moving the viewport redraws the whole frame.
+        stream.seek(0)
+        stream.truncate()
+        renderer.render(["???", "?1?", "???"], 9, 9)
+        self.assertIn("\x1b[2J", stream.getvalue())
+        self.assertIn("     9  0  1 ", stream.getvalue())
+
+    def test_single_write_per_frame(self) -> None:
+        stream = MagicMock()
+        renderer = TerminalRenderer(stream=stream, ansi=True)
+        renderer.render(["??"])
+        renderer.render(["?0"])
+        self.assertEqual(stream.write.call_count, 2)
+        self.assertEqual(stream.flush.call_count, 2)
+
+    def test_supports_ansi(self) -> None:
+        self.assertFalse(supports_ansi(io.StringIO()))
+        stream = MagicMock()
+        stream.isatty.return_value = True
+        with patch("os.name", "posix"), patch.dict(os.environ, {"TERM": "dumb"}):
+            self.assertFalse(supports_ansi(stream))
+        with patch("os.name", "posix"), patch.dict(os.environ, {"TERM": "xterm"}):
+            self.assertTrue(supports_ansi(stream))
+
+    def test_frames_taller_than_the_terminal(self) -> None:
+        stream = io.StringIO()
+        renderer = TerminalRenderer(header="Title\n" * 18, stream=stream, ansi=True)
+        with patch("exam.source.renderer.terminal_size", return_value=(80, 24)):
+            renderer.render(["?????"] * 5)
+            stream.seek(0)
+            stream.truncate()
+            renderer.render(["0????"] + ["?????"] * 4)
+        # The frame scrolls the screen, so its rows have no fixed position.
+        self.assertTrue(stream.getvalue().startswith("\x1b[H\x1b[2J"))
+        self.assertIn("0 | 0  ?  ?  ?  ? ", stream.getvalue())
+
+    def test_default_game_at_80x24(self) -> None:
+        game = AbandonedSpaceStation(5, 5, 5, seed=3, verbose=False)
+        safe = [
+            f"{x} {y}"
+            for y in range(5)
+            for x in range(5)
+            if (x, y) not in game.hazard_locations
+        ]
+        screen = Screen(80, 24)
+        screen.play(game, safe[:2] + ["q"])
+        self.assertEqual(game.action_count, 2)
+        self.assertTrue(screen.shows_grid(game))
+
+    def test_terminal_size_without_terminal(self) -> None:
+        self.assertIsNone(terminal_size(io.StringIO()))
+
+
+class TestViewport(unittest.TestCase):
+    def test_fit(self) -> None:
+        self.assertIsNone(Viewport.fit(10, 10, (80, 24)))
+        viewport = Viewport.fit(200, 100, (80, 24), header_lines=2)
+        assert viewport is not None
+        # 80 columns minus the row labels and 24 lines minus the header,
+        # three column label lines, the separator and the prompt.
+        self.assertEqual((viewport.width, viewport.height), (24, 14))
+        self.assertEqual((viewport.left, viewport.top), (0, 0))
+
+    def test_play_grid_near_terminal_height(self) -> None:
+        # The grid only fits below the short header.
+        headers = _INTRO, _VIEWPORT_INTRO
+        header, viewport = fit_screen(10, 15, (80, 24), headers)
+        self.assertIs(header, _VIEWPORT_INTRO)
+        self.assertEqual((viewport.width, viewport.height), (10, 15))
+        self.assertIs(fit_screen(10, 15, (80, 40), headers)[0], _INTRO)
+        self.assertIs(fit_screen(10, 15, None, headers)[0], _INTRO)
+        game = AbandonedSpaceStation(10, 15, 0, verbose=False)
+        game.hazard_locations = {(9, 14)}
+        screen = Screen(80, 24)
+        screen.play(game, ["0 0", "5 7", "q"])
+        # The header is still at the top, so the screen never scrolled.
+        last = screen.prompts[-1]
+        self.assertEqual(last[0], _VIEWPORT_INTRO.split("\n", maxsplit=1)[0])
+        self.assertTrue(screen.shows_grid(game, last))
+
+    def test_play_shows_instructions_that_fit(self) -> None:
+        game = AbandonedSpaceStation(5, 5, 0, verbose=False)
+        game.hazard_locations = {(4, 4)}
+        screen = Screen(80, 40)
+        screen.play(game, ["0 0", "q"])
+        self.assertEqual(screen.prompts[-1][:3], _INTRO.split("\n")[:3])
+        self.assertTrue(screen.shows_grid(game, screen.prompts[-1]))
+
+    def test_scroll_and_clamp(self) -> None:
+        viewport = Viewport(100, 50, 20, 10)
+        viewport.scroll(1, 2)
+        self.assertEqual((viewport.left, viewport.top), (10, 10))
+        viewport.scroll(-5, 0)
+        self.assertEqual(viewport.left, 0)
+        viewport.scroll(20, 20)
+        self.assertEqual((viewport.left, viewport.top), (80, 40))
+
+    def test_center_and_contains(self) -> None:
+        viewport = Viewport(100, 50, 20, 10)
+        viewport.center(50, 25)
+        self.assertEqual((viewport.left, viewport.top), (40, 20))
+        self.assertTrue(viewport.contains(59, 29))
+        self.assertFalse(viewport.contains(60, 25))
+        viewport.center(99, 0)
+        self.assertEqual((viewport.left, viewport.top), (80, 0))
+
+    def test_smaller_grid(self) -> None:
+        viewport = Viewport(5, 5, 20, 10)
+        self.assertEqual((viewport.width, viewport.height), (5, 5))
+        viewport.scroll(1, 1)
+        self.assertEqual((viewport.left, viewport.top), (0, 0))
+
+    def test_scroll_steps(self) -> None:
+        self.assertEqual(scroll_steps("d"), (1, 0))
+        self.assertEqual(scroll_steps("WWa"), (-1, -2))
+        self.assertEqual(scroll_steps("\x1b[B\x1b[C"), (1, 1))
+        self.assertIsNone(scroll_steps(""))
+        self.assertIsNone(scroll_steps("2 3"))
+        self.assertIsNone(scroll_steps("q"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+Unit tests for the results store in results.py.
+
+Tests the batched writes, the aggregate queries and the recording of
+simulated, scripted and interactive games.
+"""
+
+# pylint: disable=C
+
+import io
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.main import batch_main
+from exam.source.main import main as play_main
+from exam.source.results import ResultStore, main, outcome
+from exam.source.simulation import run_simulations
+
+# Unix time of 2024-03-01 12:00 UTC.
+MARCH = 1709294400.0
+
+
+def finished_game(width: int, height: int, actions: int, won: bool):
+    game = AbandonedSpaceStation(width, height, 1, seed=actions, verbose=False)
+    game.action_count = actions
+    game.is_victorious = won
+    game.is_defeated = not won
+    return game
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "results.db")
+
+    def stored_rows(self) -> int:
+        with sqlite3.connect(self.path) as connection:
+            return connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def test_batched_writes(self) -> None:
+        store = ResultStore(self.path, batch_size=3)
+        for actions in range(1, 5):
+            store.record(finished_game(5, 5, actions, True), 0.5)
+        # The fourth game waits for the next batch.
+        self.assertEqual(self.stored_rows(), 3)
+        store.close()
+        self.assertEqual(self.stored_rows(), 4)
+        with ResultStore(self.path) as reopened:
+            self.assertEqual(reopened.count(), 4)
+
+    def test_record_fields(self) -> None:
+        game = AbandonedSpaceStation(6, 4, 3, seed=2**64 - 1, verbose=False)
+        x, y = next(
+            (x, y)
+            for y in range(4)
+            for x in range(6)
+            if (x, y) not in game.hazard_locations
+        )
+        game.scan_area(x, y)
+        with ResultStore(self.path) as store:
+            store.record(game, 1.5, finished_at=MARCH)
+        with sqlite3.connect(self.path) as connection:
+            row = connection.execute(
+                "SELECT finished_at, grid_width, grid_height, hazards, seed, "
+                "outcome, actions, scanned_areas, safe_areas, duration, "
+                "instrumentation FROM games"
+            ).fetchone()
+        self.assertEqual(
+            row,
+            (MARCH, 6, 4, 3, str(2**64 - 1), outcome(game), 1, 1, 21, 1.5, None),
+        )
+
+    def test_summary_percentiles(self) -> None:
+        with ResultStore(self.path, batch_size=7) as store:
+            for actions in range(1, 101):
+                store.record(finished_game(5, 5, actions, actions % 4 == 0), 0.25)
+            store.record(finished_game(9, 9, 3, False), 1.0)
+            summaries = store.summary()
+            selected = store.summary((9, 9, 1))
+        self.assertEqual(len(summaries), 2)
+        small = summaries[0]
+        self.assertEqual((small.grid_width, small.games), (5, 100))
+        self.assertEqual((small.wins, small.losses), (25, 75))
+        self.assertAlmostEqual(small.win_rate, 0.25)
+        self.assertEqual(
+            (small.p50_actions, small.p90_actions, small.p99_actions), (50, 90, 99)
+        )
+        self.assertAlmostEqual(small.mean_duration, 0.25)
+        self.assertEqual(len(selected), 1)
+        self.assertEqual((selected[0].games, selected[0].p99_actions), (1, 3))
+
+    def test_trend(self) -> None:
+        with ResultStore(self.path) as store:
+            store.record(finished_game(5, 5, 4, True), 0.1, finished_at=MARCH)
+            store.record(finished_game(5, 5, 6, False), 0.1, finished_at=MARCH + 60)
+            store.record(
+                finished_game(5, 5, 8, True), 0.1, finished_at=MARCH + 86400 * 31
+            )
+            days = store.trend()
+            months = store.trend((5, 5, 1), period="month")
+        self.assertEqual([point.period for point in days], ["2024-03-01", "2024-04-01"])
+        self.assertEqual((days[0].games, days[0].wins), (2, 1))
+        self.assertAlmostEqual(days[0].mean_actions, 5.0)
+        self.assertEqual([point.period for point in months], ["2024-03", "2024-04"])
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            ResultStore(self.path, batch_size=0)
+        with ResultStore(self.path) as store:
+            with self.assertRaises(ValueError):
+                store.trend(period="year")
+
+    def test_query_command(self) -> None:
+        with ResultStore(self.path) as store:
+            store.record(finished_game(5, 5, 4, True), 0.1)
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            main([self.path, "--json"])
+        row = json.loads(stdout.getvalue())
+        self.assertEqual((row["games"], row["win_rate"]), (1, 1.0))
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            main(
+                [self.path, "trend", "--width", "5", "--height", "5", "--hazards", "1"]
+            )
+        self.assertIn("5x5/1  1 games  win rate 100.0%", stdout.getvalue())
+        with patch("sys.stderr", new_callable=io.StringIO):
+            with self.assertRaises(SystemExit):
+                main([self.path, "--width", "5"])
+
+
+class TestRecording(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "results.db")
+
+    def test_simulation(self) -> None:
+        result = run_simulations(
+            30, 6, 6, 5, workers=1, seed=3, batch_size=8, results=self.path
+        )
+        with ResultStore(self.path) as store:
+            (summary,) = store.summary()
+        self.assertEqual(summary.games, 30)
+        self.assertEqual((summary.wins, summary.losses), (result.wins, result.losses))
+
+    def test_batch_mode(self) -> None:
+        moves = os.path.join(os.path.dirname(self.path), "moves.txt")
+        with open(moves, "w", encoding="utf-8") as file:
+            file.write("0 0\n")
+        with patch("sys.stdout", new_callable=io.StringIO):
+            batch_main(
+                ["--moves", moves, "--width", "1", "--height", "1", "--hazards", "0"]
+                + ["--results", self.path, "--json"]
+            )
+        with ResultStore(self.path) as store:
+            (summary,) = store.summary()
+        self.assertEqual((summary.games, summary.wins, summary.p50_actions), (1, 1, 1))
+
+    def test_interactive_game(self) -> None:
+        def lose(game: AbandonedSpaceStation) -> None:
+            game.scan_area(*next(iter(game.hazard_locations)))
+
+        with ResultStore(self.path) as store:
+            with patch("builtins.input", return_value="n"), patch(
+                "exam.source.main.clear_terminal"
+            ), patch("builtins.print"), patch.object(
+                AbandonedSpaceStation, "play", autospec=True, side_effect=lose
+            ):
+                play_main(results=store)
+            (summary,) = store.summary()
+        self.assertEqual((summary.grid_width, summary.games), (5, 1))
+        self.assertEqual((summary.losses, summary.p50_actions), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Unit tests for the game server in server.py.
+
+Tests the line protocol over real connections on a free local port.
+"""
+
+# pylint: disable=C
+
+import asyncio
+import os
+import sys
+import unittest
+from typing import List
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.server import GameServer
+
+
+class TestGameServer(unittest.TestCase):
+    def converse(self, server: GameServer, lines: List[str]) -> List[str]:
+        async def run() -> List[str]:
+            listener = await server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            answers = [(await reader.readline()).decode()]
+            for line in lines:
+                writer.write(f"{line}\n".encode())
+                answers.append((await reader.readline()).decode())
+            writer.close()
+            await writer.wait_closed()
+            listener.close()
+            await listener.wait_closed()
+            return answers
+
+        return asyncio.run(run())
+
+    def test_win_without_hazards(self) -> None:
+        server = GameServer(3, 2, 0)
+        answers = self.converse(server, ["0 0", "1 1", "new", "q"])
+        self.assertEqual(answers[0], "NEW 3 2 0\n")
+        status, *cells = answers[1].split()
+        self.assertEqual(status, "WIN")
+        self.assertEqual(len(cells), 6)
+        self.assertIn("2,1,0", cells)
+        self.assertTrue(answers[2].startswith("ERR The game is over"))
+        self.assertEqual(answers[3], "NEW 3 2 0\n")
+        self.assertEqual(answers[4], "BYE\n")
+        self.assertEqual(server.moves, 2)
+        self.assertEqual(server.total_sessions, 1)
+        self.assertEqual(server.latency.count, 3)
+
+    def test_connection_closed_by_client(self) -> None:
+        server = GameServer(3, 3, 1)
+        reader = MagicMock()
+        reader.readline = AsyncMock(return_value=b"q\n")
+        writer = MagicMock()
+        writer.drain = AsyncMock()
+        writer.wait_closed = AsyncMock(side_effect=ConnectionResetError)
+        asyncio.run(server.handle(reader, writer))
+        writer.close.assert_called_once_with()
+        writer.wait_closed.assert_awaited_once_with()
+        self.assertEqual(server.active_sessions, 0)
+
+    def test_lose_and_invalid_input(self) -> None:
+        server = GameServer(2, 2, 4, auto_reveal=False)
+        answers = self.converse(server, ["a b", "5 5", "1 0", "q"])
+        self.assertTrue(answers[1].startswith("ERR "))
+        self.assertTrue(answers[2].startswith("ERR "))
+        self.assertEqual(answers[3], "LOSE 1,0,H\n")
+        self.assertEqual(answers[4], "BYE\n")
+
+    def test_move_deltas(self) -> None:
+        server = GameServer(3, 3, 0, auto_reveal=False)
+        game = AbandonedSpaceStation(3, 3, 0, compact=True, verbose=False)
+        game.hazard_locations = {(2, 2)}
+        self.assertEqual(server.answer(game, "0 0"), "OK 0,0,0\n")
+        self.assertEqual(server.answer(game, "1 1"), "OK 1,1,1\n")
+        self.assertEqual(
+            server.answer(game, "0 0"), "ERR This area has already been scanned.\n"
+        )
+        self.assertIsNone(server.answer(game, "q"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Unit tests for the headless simulation engine in simulation.py.
+
+Tests headless play, result aggregation and the worker pool.
+"""
+
+# pylint: disable=C
+
+import io
+import os
+import random
+import sys
+import unittest
+from contextlib import redirect_stdout
+from typing import Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.simulation import (
+    SimulationResult,
+    play_headless,
+    random_policy,
+    run_simulations,
+)
+
+
+def corner_policy(_game: AbandonedSpaceStation, _rng: random.Random) -> Tuple[int, int]:
+    return 0, 0
+
+
+def compact_policy(game: AbandonedSpaceStation, rng: random.Random) -> Tuple[int, int]:
+    assert game.compact and not game.verbose
+    return random_policy(game, rng)
+
+
+class TestPlayHeadless(unittest.TestCase):
+    def test_game_finishes_without_output(self) -> None:
+        game = AbandonedSpaceStation(8, 8, 10, seed=1)
+        with redirect_stdout(io.StringIO()) as output:
+            play_headless(game, random_policy, random.Random(2))
+        self.assertEqual(output.getvalue(), "")
+        self.assertTrue(game.is_defeated or game.is_victorious)
+
+    def test_stuck_policy_stops(self) -> None:
+        game = AbandonedSpaceStation(5, 5, 0)
+        game.hazard_locations = {(4, 4), (3, 4)}
+        with redirect_stdout(io.StringIO()) as output:
+            play_headless(game, corner_policy, random.Random(), auto_reveal=False)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(game.action_count, 1)
+        self.assertFalse(game.is_defeated or game.is_victorious)
+
+
+class TestRunSimulations(unittest.TestCase):
+    def test_aggregates_results(self) -> None:
+        result = run_simulations(40, 6, 6, 5, workers=1, seed=3)
+        self.assertEqual(result.games, 40)
+        self.assertEqual(result.wins + result.losses + result.unfinished, 40)
+        self.assertEqual(result.unfinished, 0)
+        self.assertGreaterEqual(result.total_actions, 40)
+        self.assertLessEqual(result.min_actions, result.mean_actions)
+        self.assertLessEqual(result.mean_actions, result.max_actions)
+        self.assertGreater(result.wall_time, 0)
+        self.assertGreater(result.games_per_second, 0)
+
+    def test_reproducible_across_workers(self) -> None:
+        inline = run_simulations(30, 6, 6, 6, workers=1, seed=5, batch_size=8)
+        pooled = run_simulations(30, 6, 6, 6, workers=2, seed=5, batch_size=8)
+        self.assertEqual(
+            (inline.wins, inline.losses, inline.total_actions),
+            (pooled.wins, pooled.losses, pooled.total_actions),
+        )
+
+    def test_compact_games(self) -> None:
+        checked = run_simulations(10, 6, 6, 5, compact_policy, workers=1, seed=3)
+        plain = run_simulations(10, 6, 6, 5, workers=1, seed=3)
+        self.assertEqual(
+            (checked.wins, checked.losses, checked.total_actions),
+            (plain.wins, plain.losses, plain.total_actions),
+        )
+
+    def test_empty_result(self) -> None:
+        result = SimulationResult()
+        result.merge(SimulationResult())
+        self.assertEqual(result.win_rate, 0.0)
+        self.assertEqual(result.mean_actions, 0.0)
+        self.assertEqual(result.games_per_second, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
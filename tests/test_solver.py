@@ -0,0 +1,118 @@
+"""
+Unit tests for the constraint solver in solver.py.
+
+Tests the deduction rules, incremental updates and the simulation policy.
+"""
+
+# pylint: disable=C
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.simulation import run_simulations
+from exam.source.solver import HAZARD, SAFE, ConstraintSolver, solver_policy
+
+
+def _zero_area(game: AbandonedSpaceStation) -> tuple:
+    for y in range(game.grid_height):
+        for x in range(game.grid_width):
+            if (x, y) not in game.hazard_locations and game.count_adjacent_hazards(
+                x, y
+            ) == 0:
+                return x, y
+    raise AssertionError("board has no area without adjacent hazards")
+
+
+class TestConstraintSolver(unittest.TestCase):
+    def test_single_area_rule(self) -> None:
+        game = AbandonedSpaceStation(3, 3, 0)
+        game.hazard_locations = {(2, 2)}
+        game.scan_area(1, 1)
+        solver = ConstraintSolver(game)
+        self.assertIsNone(solver.next_safe_move())
+        game.scan_area(0, 0)
+        solver.update([(0, 0)])
+        self.assertEqual(solver.state[1 * 3 + 0], SAFE)
+        self.assertEqual(solver.state[0 * 3 + 1], SAFE)
+
+    def test_subset_rule(self) -> None:
+        game = AbandonedSpaceStation(3, 2, 0)
+        game.hazard_locations = {(0, 0), (2, 0)}
+        for x in range(3):
+            game.scan_area(x, 1)
+        solver = ConstraintSolver(game)
+        self.assertEqual(solver.known_hazards, {0, 2})
+        self.assertEqual(solver.state[1], SAFE)
+        self.assertEqual(solver.state[2], HAZARD)
+        self.assertEqual(solver.next_safe_move(), (1, 0))
+        solver.solve()
+        self.assertTrue(game.is_victorious)
+
+    def test_observe_reads_revealed_region(self) -> None:
+        game = AbandonedSpaceStation(6, 6, 0)
+        game.hazard_locations = {(5, 5)}
+        solver = ConstraintSolver(game)
+        game.reveal_area(0, 0)
+        solver.observe(0, 0)
+        self.assertIsNone(solver.next_safe_move())
+        self.assertEqual(solver.known_hazards, {35})
+
+    def test_deductions_are_sound(self) -> None:
+        for seed in range(20):
+            game = AbandonedSpaceStation(16, 16, 40, seed=seed, verbose=False)
+            game.reveal_area(*_zero_area(game))
+            solver = ConstraintSolver(game)
+            solver.solve()
+            self.assertFalse(game.is_defeated)
+            for index in solver.known_hazards:
+                self.assertIn((index % 16, index // 16), game.hazard_locations)
+
+    def test_restore(self) -> None:
+        game = AbandonedSpaceStation(16, 16, 40, seed=1, verbose=False)
+        solver = ConstraintSolver(game)
+        solver.update(game.reveal_area(*_zero_area(game)))
+
+        def state() -> tuple:
+            safe_moves = {
+                index
+                for index in solver.safe_moves
+                if not game.grid[index // 16][index % 16].isdigit()
+            }
+            return (
+                bytes(solver.state),
+                set(solver.known_hazards),
+                set(solver.active),
+                solver.undecided,
+                safe_moves,
+            )
+
+        before = state()
+        snapshot, game_snapshot = solver.snapshot(), game.snapshot()
+        self.assertGreater(solver.solve(), 0)
+        game.restore(game_snapshot)
+        solver.restore(snapshot)
+        self.assertEqual(state(), before)
+        solver.solve()
+        self.assertFalse(game.is_defeated)
+        with self.assertRaises(ValueError):
+            solver.restore(solver.snapshot() + 1)
+
+    def test_solver_policy(self) -> None:
+        result = run_simulations(20, 9, 9, 10, policy=solver_policy, workers=1, seed=4)
+        self.assertEqual(result.games, 20)
+        self.assertEqual(result.unfinished, 0)
+        self.assertGreater(result.wins, 0)
+
+    def test_solver_policy_guesses_undecided_area(self) -> None:
+        game = AbandonedSpaceStation(4, 4, 3, seed=2)
+        x, y = solver_policy(game, random.Random(0))
+        self.assertTrue(0 <= x < 4 and 0 <= y < 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
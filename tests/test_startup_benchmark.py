@@ -0,0 +1,38 @@
+"""
+Unit tests for the startup benchmark in benchmarks/startup_benchmark.py.
+
+Tests the import report and that the game path stays free of test tools.
+"""
+
+# pylint: disable=C
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.benchmarks.startup_benchmark import (
+    ENTRY_POINT,
+    FORBIDDEN_MODULES,
+    import_times,
+    loaded_modules,
+)
+
+
+class TestStartupBenchmark(unittest.TestCase):
+    def test_import_times(self) -> None:
+        times = import_times("exam.source.helpers")
+        names = [name for name, _, _ in times]
+        self.assertEqual(names[-1], "exam.source.helpers")
+        self.assertTrue(all(cumulative >= own for _, own, cumulative in times))
+
+    def test_game_path_is_lean(self) -> None:
+        modules = loaded_modules(ENTRY_POINT)
+        self.assertIn("exam.source.game", modules)
+        for name in FORBIDDEN_MODULES + ["argparse", "json", "tracemalloc"]:
+            self.assertNotIn(name, modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
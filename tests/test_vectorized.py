@@ -0,0 +1,106 @@
+"""
+Unit tests for the vectorized multi-board engine in vectorized.py.
+
+Compares the vectorized boards with regular games. Skipped if NumPy is not
+installed.
+"""
+
+# pylint: disable=C
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+try:
+    import numpy as np
+
+    from exam.source.vectorized import (
+        BoardBatch,
+        adjacent_counts,
+        place_hazards,
+        simulate_random,
+    )
+except ImportError:  # NumPy is optional
+    np = None  # type: ignore[assignment]
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestAdjacentCounts(unittest.TestCase):
+    def assert_counts_match(self, batch: "BoardBatch") -> None:
+        for index in range(len(batch)):
+            game = batch.game(index)
+            expected = [
+                [game.count_adjacent_hazards(x, y) for x in range(batch.grid_width)]
+                for y in range(batch.grid_height)
+            ]
+            self.assertEqual(batch.counts[index].tolist(), expected)
+
+    def test_matches_game(self) -> None:
+        for width, height, hazards in [(7, 6, 9), (1, 5, 2), (5, 5, 24), (4, 4, 0)]:
+            batch = BoardBatch(50, width, height, hazards, seed=width * height)
+            self.assertEqual(batch.hazards.sum(axis=(1, 2)).tolist(), [hazards] * 50)
+            self.assert_counts_match(batch)
+
+    def test_full_board(self) -> None:
+        hazards = place_hazards(np.random.default_rng(0), 3, 4, 2, 8)
+        self.assertTrue(hazards.all())
+        self.assertFalse(adjacent_counts(hazards).any())
+
+    def test_too_many_hazards(self) -> None:
+        with self.assertRaises(ValueError):
+            BoardBatch(1, 3, 3, 10)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBoardBatch(unittest.TestCase):
+    def test_scans_match_game(self) -> None:
+        batch = BoardBatch(40, 5, 4, 3, seed=1)
+        games = [batch.game(index) for index in range(len(batch))]
+        rng = random.Random(2)
+        for _ in range(40):
+            moves = [(rng.randrange(-1, 6), rng.randrange(-1, 5)) for _ in games]
+            counted = batch.scan(
+                np.array([x for x, _ in moves]), np.array([y for _, y in moves])
+            )
+            for index, (game, (x, y)) in enumerate(zip(games, moves)):
+                actions = game.action_count
+                if not (game.is_defeated or game.is_victorious):
+                    game.scan_area(x, y)
+                self.assertEqual(counted[index], game.action_count > actions)
+        for index, game in enumerate(games):
+            self.assertEqual(batch.is_defeated[index], game.is_defeated)
+            self.assertEqual(batch.is_victorious[index], game.is_victorious)
+            self.assertEqual(batch.action_count[index], game.action_count)
+            ys, xs = np.nonzero(batch.scanned[index])
+            self.assertEqual(set(zip(xs.tolist(), ys.tolist())), game.scanned_areas)
+        self.assertTrue(batch.is_finished.any())
+
+    def test_random_moves_are_unscanned(self) -> None:
+        batch = BoardBatch(20, 3, 3, 0, seed=4)
+        for _ in range(9):
+            xs, ys = batch.random_moves()
+            self.assertFalse(batch.scanned[np.arange(20), ys, xs].any())
+            self.assertTrue(batch.scan(xs, ys).all())
+        self.assertTrue(batch.is_victorious.all())
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestSimulateRandom(unittest.TestCase):
+    def test_results(self) -> None:
+        result = simulate_random(300, 5, 5, 5, seed=3)
+        self.assertEqual(result.games, 300)
+        self.assertEqual(result.wins + result.losses, 300)
+        self.assertGreaterEqual(result.mean_actions, 1)
+        self.assertEqual(result, simulate_random(300, 5, 5, 5, seed=3))
+
+    def test_without_hazards(self) -> None:
+        result = simulate_random(10, 3, 3, 0, seed=0)
+        self.assertEqual(result.win_rate, 1.0)
+        self.assertEqual(result.mean_actions, 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Unit tests for the lazy board views in views.py.
+
+Tests the compact table views against the regular grid and sets.
+"""
+
+# pylint: disable=C
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from exam.source.game import AbandonedSpaceStation
+from exam.source.views import count_bits, is_bit_set
+
+
+class TestBitHelpers(unittest.TestCase):
+    def test_bits(self) -> None:
+        bits = bytearray(3)
+        bits[0] = 0b10000001
+        bits[2] = 0b00000100
+        self.assertTrue(is_bit_set(bits, 0))
+        self.assertTrue(is_bit_set(bits, 7))
+        self.assertTrue(is_bit_set(bits, 18))
+        self.assertFalse(is_bit_set(bits, 1))
+        self.assertEqual(count_bits(bits), 3)
+
+
+class TestCompactViews(unittest.TestCase):
+    def setUp(self) -> None:
+        self.regular = AbandonedSpaceStation(
+            grid_width=9, grid_height=7, hazard_count=10, seed=3
+        )
+        self.compact = AbandonedSpaceStation(
+            grid_width=9, grid_height=7, hazard_count=10, seed=3, compact=True
+        )
+
+    def _scan_all_safe(self, game: AbandonedSpaceStation) -> None:
+        for y in range(game.grid_height):
+            for x in range(game.grid_width):
+                if (x, y) not in game.hazard_locations and x % 2 == 0:
+                    game.scan_area(x, y)
+
+    def test_hazards_match_regular_board(self) -> None:
+        self.assertEqual(
+            set(self.compact.hazard_locations), self.regular.hazard_locations
+        )
+        self.assertEqual(len(self.compact.hazard_locations), 10)
+        self.assertNotIn((-1, 0), self.compact.hazard_locations)
+        self.assertNotIn("0 0", self.compact.hazard_locations)
+
+    def test_grid_and_scans_match_regular_board(self) -> None:
+        self._scan_all_safe(self.regular)
+        self._scan_all_safe(self.compact)
+        self.assertEqual([list(row) for row in self.compact.grid], self.regular.grid)
+        self.assertEqual(set(self.compact.scanned_areas), self.regular.scanned_areas)
+        self.assertEqual(
+            len(self.compact.scanned_areas), len(self.regular.scanned_areas)
+        )
+        self.assertEqual(self.compact.grid[-1][-1], self.regular.grid[-1][-1])
+        self.assertEqual(self.compact.grid[0][1:3], self.regular.grid[0][1:3])
+        with self.assertRaises(IndexError):
+            _ = self.compact.grid[7]
+        with self.assertRaises(IndexError):
+            _ = self.compact.grid[0][9]
+
+    def test_triggered_hazard_shown(self) -> None:
+        x, y = next(iter(self.compact.hazard_locations))
+        self.assertFalse(self.compact.scan_area(x, y))
+        self.assertEqual(self.compact.grid[y][x], "H")
+        self.assertTrue(self.compact.is_defeated)
+
+
+if __name__ == "__main__":
+    unittest.main()